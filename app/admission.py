@@ -0,0 +1,161 @@
+# app/admission.py
+
+"""
+Admission control (bulkheads) for expensive endpoints.
+
+Every expensive route class gets its own bulkhead: at most N requests run at
+once, at most Q more wait in a bounded queue for up to T seconds, anything
+beyond is rejected immediately with 503 + Retry-After. Admission happens in
+an async dependency, i.e. on the event loop *before* a threadpool thread or a
+Neo4j session is taken, so a burst of heavy calls can no longer starve
+/health or /api/search (keep the sum of the limits below the threadpool size,
+40 threads by default).
+
+Configuration per bulkhead (environment variables, NAME upper-cased):
+- ADMISSION_<NAME>_CONCURRENCY (default from DEFAULT_LIMITS)
+- ADMISSION_<NAME>_QUEUE
+- ADMISSION_<NAME>_QUEUE_TIMEOUT (seconds)
+- ADMISSION_MAX_ESTIMATED_ROWS: optional cost guard, see `cost_guard`.
+
+Metrics: admission.<name>.admitted / rejected_queue_full / rejected_timeout /
+rejected_cost counters, admission.<name>.queue_time timing, and
+admission.<name>.active / queued gauges.
+"""
+
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Callable, Dict
+
+from fastapi import HTTPException
+from neo4j import Session
+
+from app.metrics import metrics
+
+# name: (concurrency, queue size, queue timeout seconds)
+DEFAULT_LIMITS = {
+    "related": (8, 16, 2.0),
+    "related_batch": (4, 8, 2.0),
+    "topic_graph": (8, 16, 2.0),
+}
+
+RETRY_AFTER_SECONDS = 1
+
+
+class Bulkhead:
+    """Concurrency limit with a bounded, time-limited waiting queue."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._active = 0
+        self._queued = 0
+
+        metrics.gauge(f"admission.{name}.active", lambda: self._active)
+        metrics.gauge(f"admission.{name}.queued", lambda: self._queued)
+
+    @classmethod
+    def from_env(cls, name: str) -> "Bulkhead":
+        concurrency, queue, timeout = DEFAULT_LIMITS.get(name, (8, 16, 2.0))
+        prefix = f"ADMISSION_{name.upper()}_"
+        return cls(
+            name,
+            max_concurrent=int(os.getenv(prefix + "CONCURRENCY", str(concurrency))),
+            max_queue=int(os.getenv(prefix + "QUEUE", str(queue))),
+            queue_timeout=float(os.getenv(prefix + "QUEUE_TIMEOUT", str(timeout))),
+        )
+
+    def _reject(self, reason: str) -> HTTPException:
+        metrics.incr(f"admission.{self.name}.rejected_{reason}")
+        return HTTPException(
+            status_code=503,
+            detail="Server busy, retry later.",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+
+    async def acquire(self) -> None:
+        if self._slots.locked():
+            if self._queued >= self.max_queue:
+                raise self._reject("queue_full")
+
+            self._queued += 1
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError as exc:
+                raise self._reject("timeout") from exc
+            finally:
+                self._queued -= 1
+                metrics.observe(f"admission.{self.name}.queue_time", time.perf_counter() - start)
+        else:
+            await self._slots.acquire()
+
+        self._active += 1
+        metrics.incr(f"admission.{self.name}.admitted")
+
+    def release(self) -> None:
+        self._active -= 1
+        self._slots.release()
+
+
+_bulkheads: Dict[str, Bulkhead] = {}
+
+
+def get_bulkhead(name: str) -> Bulkhead:
+    if name not in _bulkheads:
+        _bulkheads[name] = Bulkhead.from_env(name)
+    return _bulkheads[name]
+
+
+def admit(name: str) -> Callable[[], AsyncIterator[None]]:
+    """
+    FastAPI dependency holding a slot of the `name` bulkhead for the request.
+
+    Usage: @router.get(..., dependencies=[Depends(admit("related"))])
+    """
+    bulkhead = get_bulkhead(name)
+
+    async def _admission() -> AsyncIterator[None]:
+        await bulkhead.acquire()
+        try:
+            yield
+        finally:
+            bulkhead.release()
+
+    return _admission
+
+
+def _max_estimated_rows(plan: dict) -> float:
+    rows = float(plan.get("args", {}).get("EstimatedRows", 0.0))
+    return max([rows] + [_max_estimated_rows(child) for child in plan.get("children", [])])
+
+
+def estimated_rows(db: Session, cypher: str, params: dict) -> float:
+    """Largest operator row estimate of the query plan (EXPLAIN: planned, not run)."""
+    summary = db.run("EXPLAIN " + cypher, params).consume()
+    return _max_estimated_rows(summary.plan or {})
+
+
+def cost_guard(route: str, db: Session, cypher: str, params: dict) -> None:
+    """
+    Reject the query with 503 when its estimated cost exceeds
+    ADMISSION_MAX_ESTIMATED_ROWS (no-op when unset).
+
+    `params` are the query parameters, passed as one dict: they may use any
+    name (`name`, `route`...) without clashing with this function's arguments.
+    """
+    threshold = os.getenv("ADMISSION_MAX_ESTIMATED_ROWS")
+    if not threshold:
+        return
+
+    estimate = estimated_rows(db, cypher, params)
+    if estimate > float(threshold):
+        metrics.incr(f"admission.{route}.rejected_cost")
+        raise HTTPException(
+            status_code=503,
+            detail="Query too expensive to run right now, retry later or narrow it.",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
@@ -0,0 +1,181 @@
+# app/cache.py
+
+"""
+Versioned in-process response cache.
+
+Payloads are cached per normalized request (route template + params) and
+tagged with the graph version they were computed for: a new import makes
+every entry stale at once, so nothing is served past a graph change and no
+explicit invalidation is needed.
+
+The cache also counts requests per key. The most frequent keys are saved on
+shutdown (WARMUP_KEYS_FILE) and replayed at the next startup through the
+loaders registered by the routers, so the first users after a deploy hit a
+warm cache. The entries themselves are also snapshotted (app/snapshots.py):
+when the graph version did not change, a restart reloads them from disk
+instead of querying Neo4j again.
+
+Configuration: RESPONSE_CACHE_SIZE (entries, default 2048, 0 disables),
+WARMUP_KEYS_FILE (default var/hot_keys.json).
+
+Metrics: response_cache.hits / misses / evictions counters,
+response_cache.size gauge.
+"""
+
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from app.graph_version import graph_version
+from app.metrics import metrics
+from app.singleflight import flight_key
+from app.snapshots import Snapshot, Snapshottable, pickled, register
+
+# Hit counters are trimmed to this many keys (x the cache size) to stay bounded.
+_FREQUENCY_FACTOR = 4
+
+
+class ResponseCache:
+    """LRU of payloads keyed by normalized request, valid for one graph version."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._frequency: Counter = Counter()
+        self._loaders: Dict[str, Callable[..., Any]] = {}
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        return cls(max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", "2048")))
+
+    # -------------------------
+    # Loaders (used by warm-up)
+    # -------------------------
+    def register_loader(self, route: str, loader: Callable[..., Any]) -> None:
+        """`loader(db, **params)` computes the payload of `route` for `params`."""
+        self._loaders[route] = loader
+
+    def loader(self, route: str) -> Optional[Callable[..., Any]]:
+        return self._loaders.get(route)
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+    def _count(self, key: Hashable) -> None:
+        self._frequency[key] += 1
+        if len(self._frequency) > self.max_entries * _FREQUENCY_FACTOR:
+            self._frequency = Counter(dict(self._frequency.most_common(self.max_entries)))
+
+    def get(self, key: Hashable, version: int) -> tuple:
+        """(hit, payload) for `key` at `version`."""
+        with self._lock:
+            self._count(key)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                metrics.incr("response_cache.misses")
+                return False, None
+            self._entries.move_to_end(key)
+        metrics.incr("response_cache.hits")
+        return True, entry[1]
+
+    def put(self, key: Hashable, version: int, payload: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                metrics.incr("response_cache.evictions")
+
+    def get_or_load(self, route: str, params: dict, load: Callable[[], Any]) -> Any:
+        """
+        Cached payload of `route` for `params`, computed with `load()` on miss.
+
+        Payloads are shared between requests: callers must not mutate them.
+        Uncached when the graph has no version marker.
+        """
+        version = graph_version.get()
+        if version is None or self.max_entries <= 0:
+            return load()
+
+        key = flight_key(route, **params)
+        hit, payload = self.get(key, version)
+        if hit:
+            return payload
+        payload = load()
+        self.put(key, version, payload)
+        return payload
+
+    def contains(self, key: Hashable, version: int) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] == version
+
+    def entries(self, version: int) -> List[tuple]:
+        """(key, payload) pairs valid for `version`, least recently used first."""
+        with self._lock:
+            return [(key, entry[1]) for key, entry in self._entries.items() if entry[0] == version]
+
+    def restore(self, version: int, entries: List[tuple]) -> int:
+        for key, payload in entries:
+            self.put(key, version, payload)
+        return len(entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -------------------------
+    # Hot keys
+    # -------------------------
+    def hot_keys(self, limit: int) -> List[dict]:
+        """Most requested keys as `{"route", "params"}` entries."""
+        with self._lock:
+            top = self._frequency.most_common(limit)
+        return [{"route": key[0], "params": dict(key[1:])} for key, _ in top]
+
+    def save_hot_keys(self, path: Path, limit: Optional[int] = None) -> int:
+        keys = self.hot_keys(limit or self.max_entries)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # pid suffix: every gunicorn worker saves its keys on shutdown
+        tmp = path.with_suffix(f"{path.suffix}.tmp{os.getpid()}")
+        tmp.write_text(json.dumps(keys, indent=1), encoding="utf-8")
+        tmp.replace(path)
+        return len(keys)
+
+
+def load_hot_keys(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+
+
+def hot_keys_path() -> Path:
+    return Path(os.getenv("WARMUP_KEYS_FILE", "var/hot_keys.json"))
+
+
+response_cache = ResponseCache.from_env()
+metrics.gauge("response_cache.size", lambda: len(response_cache))
+
+
+def _dump_entries(version: int) -> Optional[dict]:
+    entries = response_cache.entries(version)
+    return {"entries": pickled(entries)} if entries else None
+
+
+def _restore_entries(snapshot: Snapshot) -> int:
+    return response_cache.restore(snapshot.graph_version, snapshot.load("entries"))
+
+
+register(Snapshottable("response_cache", _dump_entries, _restore_entries))
@@ -0,0 +1,180 @@
+# app/database/transactions.py
+
+"""
+Bounded read transactions.
+
+Router queries go through `run_read`, i.e. a managed `execute_read`
+transaction with:
+- a per-route timeout enforced by Neo4j (the server aborts the transaction,
+  no thread is left waiting on an endless query),
+- transaction metadata `{route, request_id}`, visible in SHOW TRANSACTIONS
+  and in the query log.
+
+The `query_context(route)` dependency also watches the HTTP connection while
+the handler runs: when the client goes away, the transactions tagged with its
+request id are terminated server-side instead of running to completion for
+nobody.
+
+Configuration (seconds, environment variables):
+- NEO4J_TX_TIMEOUT: default timeout (DEFAULT_TIMEOUT),
+- NEO4J_TX_TIMEOUT_<ROUTE>: per route, e.g. NEO4J_TX_TIMEOUT_TOPIC_GRAPH.
+
+Metrics: neo4j.tx.<route> timing, neo4j.tx.<route>.timeouts and
+neo4j.tx.<route>.cancelled counters, neo4j.tx.terminated /
+neo4j.tx.terminate_errors.
+"""
+
+import asyncio
+import os
+import uuid
+from typing import AsyncIterator, Callable, List, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from neo4j import Record, Session, unit_of_work
+from neo4j.exceptions import ClientError
+
+from app.database.neo4j import get_driver
+from app.metrics import metrics
+
+DEFAULT_TIMEOUT = 10.0
+
+# Per-route defaults, overridable with NEO4J_TX_TIMEOUT_<ROUTE>.
+ROUTE_TIMEOUTS = {
+    "search": 5.0,
+    "authors": 5.0,
+    "related": 5.0,
+    "related_batch": 15.0,
+    "topic_graph": 10.0,
+    "topic_clusters": 5.0,
+    "top_directors": 5.0,
+    "stats": 10.0,
+    "films": 5.0,
+    "timelines": 5.0,
+    "llm": 10.0,
+}
+
+DISCONNECT_POLL_SECONDS = 0.25
+
+# Status 499 (nginx convention): the client closed the request.
+CLIENT_CLOSED_REQUEST = 499
+
+_TIMEOUT_CODES = (
+    "Neo.ClientError.Transaction.TransactionTimedOut",
+    "Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration",
+)
+_TERMINATED_CODES = (
+    "Neo.ClientError.Transaction.Terminated",
+    "Neo.TransientError.Transaction.Terminated",
+)
+
+
+def tx_timeout(route: str) -> float:
+    default = os.getenv("NEO4J_TX_TIMEOUT")
+    fallback = float(default) if default else ROUTE_TIMEOUTS.get(route, DEFAULT_TIMEOUT)
+    return float(os.getenv(f"NEO4J_TX_TIMEOUT_{route.upper()}", str(fallback)))
+
+
+class QueryContext:
+    """Route, request id and timeout of the queries run for one request."""
+
+    def __init__(self, route: str, timeout: Optional[float] = None):
+        self.route = route
+        # Always generated here: a client-supplied id could target other requests.
+        self.request_id = uuid.uuid4().hex
+        self.timeout = tx_timeout(route) if timeout is None else timeout
+        self.disconnected = False
+        # Coalesced executions (single-flight) also serve other requests:
+        # handlers set this so a leaving leader does not kill shared work.
+        self.cancellable: Callable[[], bool] = lambda: True
+
+    @property
+    def metadata(self) -> dict:
+        return {"route": self.route, "request_id": self.request_id}
+
+
+def run_read(
+    db: Session,
+    cypher: str,
+    ctx: Optional[QueryContext] = None,
+    **params,
+) -> List[Record]:
+    """
+    Run a read query in a managed transaction bounded by the route timeout.
+
+    Timeouts become 504, queries cancelled because the client left become 499.
+    """
+    ctx = ctx or QueryContext("default")
+    if ctx.disconnected and ctx.cancellable():
+        metrics.incr(f"neo4j.tx.{ctx.route}.cancelled")
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request.")
+
+    @unit_of_work(timeout=ctx.timeout, metadata=ctx.metadata)
+    def _work(tx):
+        return list(tx.run(cypher, **params))
+
+    try:
+        with metrics.timer(f"neo4j.tx.{ctx.route}"):
+            return db.execute_read(_work)
+    except ClientError as exc:
+        if exc.code in _TIMEOUT_CODES:
+            metrics.incr(f"neo4j.tx.{ctx.route}.timeouts")
+            raise HTTPException(status_code=504, detail="Query timed out.") from exc
+        if exc.code in _TERMINATED_CODES and ctx.disconnected:
+            metrics.incr(f"neo4j.tx.{ctx.route}.cancelled")
+            raise HTTPException(
+                status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request."
+            ) from exc
+        raise
+
+
+def terminate_transactions(request_id: str) -> int:
+    """Terminate the running transactions tagged with `request_id` (best effort)."""
+    try:
+        with get_driver().session() as session:
+            ids = [
+                record["transactionId"]
+                for record in session.run(
+                    "SHOW TRANSACTIONS YIELD transactionId, metaData "
+                    "WHERE metaData.request_id = $request_id "
+                    "RETURN transactionId",
+                    request_id=request_id,
+                )
+            ]
+            if ids:
+                session.run("TERMINATE TRANSACTIONS $ids", ids=ids).consume()
+    except Exception:  # pylint: disable=broad-except
+        metrics.incr("neo4j.tx.terminate_errors")
+        return 0
+
+    metrics.incr("neo4j.tx.terminated", len(ids))
+    return len(ids)
+
+
+async def _watch_disconnect(request: Request, ctx: QueryContext) -> None:
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+    ctx.disconnected = True
+    metrics.incr(f"neo4j.tx.{ctx.route}.client_disconnects")
+    if ctx.cancellable():
+        await run_in_threadpool(terminate_transactions, ctx.request_id)
+
+
+def query_context(route: str) -> Callable[[Request], AsyncIterator[QueryContext]]:
+    """
+    FastAPI dependency providing the QueryContext of `route` for the request,
+    with client disconnect detection for as long as the handler runs.
+
+    Usage: ctx: QueryContext = Depends(query_context("related"))
+    """
+
+    async def _query_context(request: Request) -> AsyncIterator[QueryContext]:
+        ctx = QueryContext(route)
+        watcher = asyncio.ensure_future(_watch_disconnect(request, ctx))
+        try:
+            yield ctx
+        finally:
+            watcher.cancel()
+
+    return _query_context
@@ -0,0 +1,92 @@
+# app/etag.py
+
+"""
+Conditional GET with graph-version ETags.
+
+A read response is fully determined by the graph version and the request
+(route template, path and query parameters), so its ETag is computed from
+those alone, before any query runs:
+
+    ETag: W/"v<graph_version>-<sha1 of the normalized request>"
+
+`If-None-Match` matching the current tag is answered with 304 straight from
+the dependency: no admission slot, no Neo4j query, no body. Once the graph is
+re-imported the version changes and every tag is invalidated at once.
+
+Cache-Control: `public, max-age=HTTP_CACHE_MAX_AGE` (default 60 seconds),
+`private` for routes behind the API key. When the graph has no version marker
+yet, responses carry no ETag.
+
+Metrics: http.etag.<route>.not_modified / .modified counters.
+"""
+
+import hashlib
+import os
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException, Request
+
+from app.graph_version import graph_version
+from app.metrics import metrics
+
+
+def _max_age() -> int:
+    return int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+
+
+def normalized_request(request: Request) -> str:
+    """Route template + sorted path and query parameters."""
+    route = request.scope.get("route")
+    template = getattr(route, "path", request.url.path)
+    path_params = sorted(request.path_params.items())
+    query_params = sorted(request.query_params.multi_items())
+    return repr((template, path_params, query_params))
+
+
+def compute_etag(version: int, normalized: str) -> str:
+    digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:20]
+    return f'W/"v{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison against an If-None-Match header value.
+
+    `*` never matches: it only applies when a current representation exists,
+    which the dependency cannot know before the handler looked the resource
+    up (an unknown topic must stay a 404).
+    """
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    opaque = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == opaque for tag in candidates)
+
+
+def conditional_get(route: str, private: bool = False) -> Callable[[Request], Dict[str, str]]:
+    """
+    FastAPI dependency answering If-None-Match with 304 and returning the
+    validator headers to set on the full response (`render(..., headers=...)`).
+
+    Sync on purpose: reading the version may need Neo4j once per TTL, so it
+    runs in the threadpool rather than on the event loop.
+    """
+    visibility = "private" if private else "public"
+
+    def _conditional_get(request: Request) -> Dict[str, str]:
+        version = graph_version.get()
+        if version is None:
+            return {}
+
+        headers = {
+            "ETag": compute_etag(version, normalized_request(request)),
+            "Cache-Control": f"{visibility}, max-age={_max_age()}",
+        }
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            metrics.incr(f"http.etag.{route}.not_modified")
+            raise HTTPException(status_code=304, headers=headers)
+
+        metrics.incr(f"http.etag.{route}.modified")
+        return headers
+
+    return _conditional_get
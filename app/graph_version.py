@@ -0,0 +1,66 @@
+# app/graph_version.py
+
+"""
+Graph version marker.
+
+Read responses only change when the graph is rewritten: the importer and the
+seed script bump `version` on the single (:GraphMeta {key: "graph"}) node at
+the end of each run. The API reads that one property and keeps it in memory
+for GRAPH_VERSION_TTL seconds (default 5), so checking freshness costs nothing
+on the request path.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+from app.database.neo4j import get_driver
+from app.metrics import metrics
+
+GRAPH_VERSION_CYPHER = 'MATCH (m:GraphMeta {key: "graph"}) RETURN m.version AS version'
+
+
+class GraphVersion:
+    """In-memory copy of the graph version, refreshed at most every `ttl` seconds."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._expires_at = 0.0
+
+    @classmethod
+    def from_env(cls) -> "GraphVersion":
+        return cls(ttl=float(os.getenv("GRAPH_VERSION_TTL", "5")))
+
+    def _read(self) -> Optional[int]:
+        with get_driver().session() as session:
+            record = session.run(GRAPH_VERSION_CYPHER).single()
+        return record["version"] if record else None
+
+    def get(self) -> Optional[int]:
+        """Current graph version (None if the graph was never versioned)."""
+        with self._lock:
+            if time.monotonic() < self._expires_at:
+                return self._version
+            try:
+                self._version = self._read()
+            except Exception:  # pylint: disable=broad-except
+                # Neo4j unreachable: keep serving the last known version.
+                metrics.incr("graph_version.read_errors")
+            self._expires_at = time.monotonic() + self.ttl
+            return self._version
+
+    @property
+    def cached(self) -> Optional[int]:
+        """Last version read, without touching Neo4j."""
+        return self._version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._expires_at = 0.0
+
+
+graph_version = GraphVersion.from_env()
+metrics.gauge("graph_version.current", lambda: graph_version.cached or 0)
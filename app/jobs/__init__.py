@@ -0,0 +1,51 @@
+# app/jobs/__init__.py
+
+"""
+Background jobs run by the scheduler (app/scheduler.py).
+"""
+
+from app.jobs.centrality import rank_directors
+from app.jobs.communities import detect_genre_communities
+from app.jobs.cooccurrence import rebuild_genre_cooccurrence
+from app.jobs.similar_directors import rebuild_similar_directors
+from app.jobs.timelines import rebuild_timelines
+from app.scheduler import Job, Scheduler
+
+
+def rebuild_genre_graph() -> dict:
+    """CO_OCCURS_WITH edges, then the genre communities computed from them."""
+    return {**rebuild_genre_cooccurrence(), **detect_genre_communities()}
+
+
+def register_jobs(scheduler: Scheduler) -> None:
+    """Register every background job on `scheduler`."""
+    scheduler.register(
+        Job(
+            name="genre_cooccurrence",
+            fn=rebuild_genre_graph,
+            on_graph_change=True,
+        )
+    )
+    scheduler.register(
+        Job(
+            name="similar_directors",
+            fn=rebuild_similar_directors,
+            on_graph_change=True,
+            heavy=True,
+        )
+    )
+    scheduler.register(
+        Job(
+            name="director_centrality",
+            fn=rank_directors,
+            on_graph_change=True,
+            heavy=True,
+        )
+    )
+    scheduler.register(
+        Job(
+            name="timelines",
+            fn=rebuild_timelines,
+            on_graph_change=True,
+        )
+    )
@@ -0,0 +1,65 @@
+# app/jobs/communities.py
+
+"""
+Genre communities computed from the CO_OCCURS_WITH edges.
+
+Louvain (app/services/communities.py) over the co-occurrence graph, taken as
+undirected and weighted by `score`. Every Topic gets
+- `community`: community id (0 = largest community),
+- `modularity`: its share of the partition modularity,
+so `/api/topics/clusters` and `/api/topics/{topic}/cluster` are plain
+property lookups (Topic.community is indexed) instead of graph crawls.
+Genres without co-occurrence edges form singleton communities.
+
+Runs right after the CO_OCCURS_WITH rebuild (see app/jobs/__init__.py).
+
+Configuration: COMMUNITY_RESOLUTION (default 1.0; higher = smaller
+communities).
+"""
+
+import os
+
+from app.database.neo4j import get_driver
+from app.services.communities import louvain, modularity_contributions
+
+_TOPICS_CYPHER = "MATCH (t:Topic) RETURN t.name AS name"
+
+_EDGES_CYPHER = """
+MATCH (t1:Topic)-[r:CO_OCCURS_WITH]->(t2:Topic)
+RETURN t1.name AS source, t2.name AS target, toFloat(r.score) AS weight
+"""
+
+_WRITE_CYPHER = """
+UNWIND $rows AS row
+MATCH (t:Topic {name: row.name})
+SET t.community = row.community,
+    t.modularity = row.modularity
+"""
+
+
+def _write(tx, rows) -> None:
+    tx.run(_WRITE_CYPHER, rows=rows).consume()
+
+
+def detect_genre_communities() -> dict:
+    """Recompute and store the community of every Topic (one transaction)."""
+    resolution = float(os.getenv("COMMUNITY_RESOLUTION", "1.0"))
+
+    with get_driver().session() as session:
+        topics = [record["name"] for record in session.run(_TOPICS_CYPHER)]
+        edges = [
+            (record["source"], record["target"], record["weight"])
+            for record in session.run(_EDGES_CYPHER)
+        ]
+        communities = louvain(topics, edges, resolution)
+        contributions = modularity_contributions(edges, communities, resolution)
+        rows = [
+            {"name": name, "community": community, "modularity": contributions[name]}
+            for name, community in communities.items()
+        ]
+        session.execute_write(_write, rows)
+
+    return {
+        "communities": len(set(communities.values())),
+        "modularity": round(sum(contributions.values()), 4),
+    }
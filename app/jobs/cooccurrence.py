@@ -0,0 +1,44 @@
+# app/jobs/cooccurrence.py
+
+"""
+Rebuild of the derived (:Topic)-[:CO_OCCURS_WITH {score}]->(:Topic) edges.
+
+Same query and parameters as `build_genre_cooccurrence` in
+scripts/seed_data.py (the scripts are standalone and cannot be imported from
+the app). Scheduled on graph version change, so the edges follow every import
+without a manual `make seed`.
+"""
+
+from app.database.neo4j import get_driver
+
+TOP_K = 10
+MIN_SHARED_FILMS = 2
+
+_DELETE_CYPHER = "MATCH (:Topic)-[r:CO_OCCURS_WITH]->(:Topic) DELETE r"
+
+_BUILD_CYPHER = """
+MATCH (t1:Topic)<-[:HAS_TOPIC]-(f:Article)-[:HAS_TOPIC]->(t2:Topic)
+WHERE t1 <> t2
+WITH t1, t2, count(DISTINCT f) AS score
+WHERE score >= $min_shared
+ORDER BY t1.name, score DESC, t2.name
+WITH t1, collect({topic: t2, score: score})[0..$top_k] AS top
+UNWIND top AS row
+WITH t1, row.topic AS t2, row.score AS score
+MERGE (t1)-[r:CO_OCCURS_WITH]->(t2)
+SET r.score = score
+RETURN count(r) AS edges
+"""
+
+
+def _rebuild(tx) -> int:
+    tx.run(_DELETE_CYPHER).consume()
+    record = tx.run(_BUILD_CYPHER, top_k=TOP_K, min_shared=MIN_SHARED_FILMS).single()
+    return record["edges"] if record else 0
+
+
+def rebuild_genre_cooccurrence() -> dict:
+    """Delete and rebuild every CO_OCCURS_WITH edge in one transaction."""
+    with get_driver().session() as session:
+        edges = session.execute_write(_rebuild)
+    return {"edges": edges}
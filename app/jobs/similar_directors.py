@@ -0,0 +1,117 @@
+# app/jobs/similar_directors.py
+
+"""
+Build of the derived (:Author)-[:SIMILAR_TO {score}]->(:Author) edges.
+
+A director's profile is the set of tokens
+- `g:<genre>#n` for the genres of their films, as a multiset (a director of
+  three dramas and one comedy is closer to another drama director than to a
+  comedy one),
+- `f:<film id>` for the films they directed (co-directors).
+
+Profiles are MinHash-signed and bucketed with LSH banding
+(app/services/minhash.py); only the candidate pairs (directors sharing a
+band) are scored, by exact Jaccard, and the top-K of every director is
+written as SIMILAR_TO edges, so `/api/authors/{id}/similar` is a bounded
+lookup. Recall@K against a brute-force exact top-K on a sample of directors
+is reported as the job result (/api/admin/jobs); raise LSH_BANDS or lower
+LSH_ROWS if it is too low, at the cost of more candidates.
+
+CPU-bound: registered as a heavy job (process pool).
+
+Configuration: LSH_BANDS (default 32), LSH_ROWS (default 2), LSH_TOP_K
+(default 20), LSH_MIN_SIMILARITY (default 0.05), LSH_MAX_BUCKET (default
+1000), LSH_VALIDATION_SAMPLE (default 200, 0 disables).
+"""
+
+import os
+from typing import Dict, List, Set, Tuple
+
+from app.database.neo4j import get_driver
+from app.services.minhash import LSHIndex, MinHasher, evaluate, multiset_tokens
+
+_PROFILES_CYPHER = """
+MATCH (d:Author)-[:DIRECTED]->(f:Article)
+OPTIONAL MATCH (f)-[:HAS_TOPIC]->(g:Topic)
+RETURN d.wikidata_id AS id,
+       collect(DISTINCT f.wikidata_id) AS films,
+       collect(g.name) AS genres
+"""
+
+_DELETE_CYPHER = "MATCH (:Author)-[r:SIMILAR_TO]->(:Author) DELETE r"
+
+_WRITE_CYPHER = """
+UNWIND $rows AS row
+MATCH (d:Author {wikidata_id: row.id})
+MATCH (o:Author {wikidata_id: row.other})
+CREATE (d)-[:SIMILAR_TO {score: row.score}]->(o)
+"""
+
+WRITE_BATCH_SIZE = 5000
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def director_profile(films: List[str], genres: List[str]) -> Set[str]:
+    """Token set of a director (see module docstring)."""
+    return set(multiset_tokens(genres, "g")) | {f"f:{film}" for film in films}
+
+
+def build_similar_directors(
+    profiles: Dict[str, Set[str]],
+    bands: int,
+    rows: int,
+    top_k: int,
+    min_score: float,
+    max_bucket: int = 1000,
+) -> Tuple[Dict[str, List[Tuple[str, float]]], LSHIndex]:
+    """Approximate top-`top_k` similar directors of every profile."""
+    index = LSHIndex(MinHasher(bands, rows), max_bucket=max_bucket)
+    for director_id, tokens in profiles.items():
+        if tokens:
+            index.add(director_id, tokens)
+    return index.all_top_k(top_k, min_score, sets=profiles), index
+
+
+def _write(tx, neighbours: Dict[str, List[Tuple[str, float]]]) -> int:
+    tx.run(_DELETE_CYPHER).consume()
+    rows = [
+        {"id": director_id, "other": other, "score": score}
+        for director_id, top in neighbours.items()
+        for other, score in top
+    ]
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        tx.run(_WRITE_CYPHER, rows=rows[start : start + WRITE_BATCH_SIZE]).consume()
+    return len(rows)
+
+
+def rebuild_similar_directors() -> dict:
+    """Recompute every SIMILAR_TO edge (replaced in one transaction)."""
+    bands = _env_int("LSH_BANDS", 32)
+    rows = _env_int("LSH_ROWS", 2)
+    top_k = _env_int("LSH_TOP_K", 20)
+    min_score = float(os.getenv("LSH_MIN_SIMILARITY", "0.05"))
+    sample = _env_int("LSH_VALIDATION_SAMPLE", 200)
+
+    with get_driver().session() as session:
+        profiles = {
+            record["id"]: director_profile(record["films"], record["genres"])
+            for record in session.run(_PROFILES_CYPHER)
+        }
+        neighbours, index = build_similar_directors(
+            profiles, bands, rows, top_k, min_score, _env_int("LSH_MAX_BUCKET", 1000)
+        )
+        edges = session.execute_write(_write, neighbours)
+
+    result = {
+        "directors": len(index),
+        "edges": edges,
+        "bands": bands,
+        "rows": rows,
+        "oversized_buckets": index.oversized_buckets(),
+    }
+    if sample > 0:
+        result.update(evaluate(profiles, neighbours, top_k, sample, min_score))
+    return result
@@ -0,0 +1,55 @@
+# app/jobs/timelines.py
+
+"""
+Per-genre and per-director decade histograms.
+
+Every Topic and Author gets its films counted by decade (1990 = 1990-1999),
+stored as two parallel lists (Neo4j properties cannot hold maps):
+  timeline_decades   [1980, 1990, ...]   (ascending)
+  timeline_counts    [12, 40, ...]
+  timeline_undated   films without a release year
+so `/api/topics/{topic}/timeline` and `/api/authors/{id}/timeline` read one
+node. Recomputed on graph version change, in the database (one pass over the
+DIRECTED / HAS_TOPIC relationships, batched transactions).
+"""
+
+from app.database.neo4j import get_driver
+
+# (label, pattern from n to its films f)
+TIMELINES = [
+    ("Topic", "(n)<-[:HAS_TOPIC]-(f:Article)"),
+    ("Author", "(n)-[:DIRECTED]->(f:Article)"),
+]
+
+BATCH_SIZE = 1000
+
+
+def _timeline_cypher(label: str, pattern: str) -> str:
+    # Films without year are grouped under decade -1, then split out.
+    return f"""
+    MATCH (n:{label})
+    CALL {{
+        WITH n
+        CALL {{
+            WITH n
+            MATCH {pattern}
+            WITH coalesce(f.year / 10 * 10, -1) AS decade, count(*) AS films
+            ORDER BY decade
+            RETURN collect({{decade: decade, films: films}}) AS rows
+        }}
+        SET n.timeline_decades = [r IN rows WHERE r.decade <> -1 | r.decade],
+            n.timeline_counts = [r IN rows WHERE r.decade <> -1 | r.films],
+            n.timeline_undated = coalesce(head([r IN rows WHERE r.decade = -1 | r.films]), 0)
+    }} IN TRANSACTIONS OF $batch_size ROWS
+    """
+
+
+def rebuild_timelines() -> dict:
+    """Recompute the decade histograms of every Topic and Author."""
+    counts = {}
+    with get_driver().session() as session:
+        for label, pattern in TIMELINES:
+            # CALL ... IN TRANSACTIONS needs an auto-commit transaction.
+            session.run(_timeline_cypher(label, pattern), batch_size=BATCH_SIZE).consume()
+            counts[label] = session.run(f"MATCH (n:{label}) RETURN count(n) AS n").single()["n"]
+    return counts
@@ -6,25 +6,77 @@ Exposes the public API endpoints and provides a health check endpoint
 to validate the Neo4j connection.
 """
 
-from fastapi import Depends, FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from neo4j import Session
 
+from app.cache import hot_keys_path, response_cache
 from app.database.neo4j import close_driver, get_db
+from app.jobs import register_jobs
+from app.profiling import ProfilerMiddleware, request_profiler
+from app.graph_version import graph_version
+from app.scheduler import scheduler, scheduler_enabled
+from app.snapshots import save_all, snapshots_enabled
+from app.warmup import warmup, warmup_enabled
 
 # Router imports (no need for app/routers/__init__.py exports)
 from app.routers.articles import router as articles_router
 from app.routers.authors import router as authors_router
+from app.routers.export import router as export_router
+from app.routers.films import router as films_router
 from app.routers.search import router as search_router
+from app.routers.stats import router as stats_router
 from app.routers.topics import router as topics_router
 from app.routers import llm
+from app.routers.admin import router as admin_router
+
+
+register_jobs(scheduler)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """
+    Startup: warm-up in the background (flips /ready) and background jobs.
+    Shutdown: stop jobs, record the hot keys and snapshots for the next warm-up,
+    close the driver.
+    """
+    warmup_task = None
+    if warmup_enabled():
+        warmup_task = asyncio.create_task(run_in_threadpool(warmup.run))
+    else:
+        warmup.mark_ready()
+    if scheduler_enabled():
+        scheduler.start()
+    try:
+        yield
+    finally:
+        warmup.stop()
+        if warmup_task is not None:
+            await asyncio.gather(warmup_task, return_exceptions=True)
+        await scheduler.stop()
+        try:
+            response_cache.save_hot_keys(hot_keys_path())
+        except OSError:
+            pass
+        if snapshots_enabled():
+            await run_in_threadpool(save_all, graph_version.cached)
+        close_driver()
 
 
 app = FastAPI(
     title="Knowledge Graph / Wiki API",
     description="API for a Wikidata-based Knowledge Graph (films, directors, genres).",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Opt-in: no-op unless PROFILER_SAMPLE_RATE > 0
+app.add_middleware(ProfilerMiddleware, profiler=request_profiler)
+
 
 @app.get("/health", tags=["health"])
 def health_check(db: Session = Depends(get_db)):
@@ -34,15 +86,21 @@ def health_check(db: Session = Depends(get_db)):
     return {"status": "ok", "neo4j": "up" if db_ok else "down"}
 
 
+@app.get("/ready", tags=["health"])
+def readiness_check():
+    """Readiness: 503 until the startup warm-up (connection, plans, hot keys) is done."""
+    if not warmup.ready:
+        raise HTTPException(status_code=503, detail="Warming up.")
+    return {"status": "ready", "warmup": warmup.steps}
+
+
 # Register routes
 app.include_router(search_router)
+app.include_router(films_router)
 app.include_router(articles_router)
 app.include_router(topics_router)
 app.include_router(authors_router)
+app.include_router(stats_router)
 app.include_router(llm.router)
-
-
-@app.on_event("shutdown")
-def on_shutdown():
-    """Close Neo4j driver on application shutdown."""
-    close_driver()
+app.include_router(export_router)
+app.include_router(admin_router)
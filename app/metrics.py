@@ -0,0 +1,89 @@
+# app/metrics.py
+
+"""
+In-process metrics registry.
+
+Counters, timing summaries and gauges keyed by dotted names, e.g.
+`singleflight.related.coalesced`. Thread-safe; exposed read-only on
+GET /api/admin/metrics.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+
+class _Timing:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class Metrics:
+    """Process-local counters and timing summaries (count / total / max seconds)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._timings: Dict[str, _Timing] = defaultdict(_Timing)
+        self._gauges: Dict[str, Callable[[], float]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            timing = self._timings[name]
+            timing.count += 1
+            timing.total += seconds
+            timing.max = max(timing.max, seconds)
+
+    def gauge(self, name: str, read: Callable[[], float]) -> None:
+        """Register a value computed when metrics are read (cache sizes, ratios...)."""
+        with self._lock:
+            self._gauges[name] = read
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0.0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            gauges = dict(self._gauges)
+            snapshot = {
+                "counters": dict(self._counters),
+                "timings": {
+                    name: {
+                        "count": t.count,
+                        "total_seconds": t.total,
+                        "max_seconds": t.max,
+                        "avg_seconds": t.total / t.count if t.count else 0.0,
+                    }
+                    for name, t in self._timings.items()
+                },
+            }
+        # Read gauges outside the lock: they may take their own locks.
+        snapshot["gauges"] = {name: float(read()) for name, read in gauges.items()}
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+
+metrics = Metrics()
@@ -2,7 +2,7 @@
 
 """Pydantic response schemas for the Wikidata Films API."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -40,6 +40,27 @@ class FilmSearchResponse(BaseModel):
 
     query: str
     results: List[FilmWithContext]
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page (null on the last page)",
+    )
+
+
+class FilmListResponse(BaseModel):
+    """Films filtered by year range, genre and director."""
+
+    films: List[FilmWithContext] = []
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page (null on the last page)",
+    )
+
+
+class DecadeCount(BaseModel):
+    """Number of films of one decade."""
+
+    decade: int = Field(..., description="First year of the decade (1990 = 1990-1999)")
+    films: int
 
 
 class RelatedGenre(BaseModel):
@@ -59,6 +80,61 @@ class GenreGraphResponse(BaseModel):
     related_topics: List[RelatedGenre] = []
     films: List[Film] = []
     directors: List[Director] = []
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page (null on the last page)",
+    )
+    estimated: bool = Field(
+        False,
+        description="related_topics scores extrapolated from a sample (very large genre)",
+    )
+    sampled_films: Optional[int] = Field(None, description="Films sample size when estimated")
+
+
+class GenreTimelineResponse(BaseModel):
+    """Films of a genre per decade."""
+
+    topic: Genre
+    decades: List[DecadeCount] = Field([], description="Decades with films, ascending")
+    undated: int = Field(0, description="Films without a release year")
+
+
+class GenreCommunity(BaseModel):
+    """Community of genres detected on the co-occurrence graph."""
+
+    community: int = Field(..., description="Community id (0 = largest)")
+    size: int
+    modularity: float = Field(..., description="Share of the partition modularity")
+    genres: List[Genre] = Field([], description="Members, most central first")
+
+
+class GenreClustersResponse(BaseModel):
+    """Genre communities, largest first."""
+
+    clusters: List[GenreCommunity] = []
+
+
+class GenreClusterResponse(BaseModel):
+    """Community of one genre."""
+
+    topic: Genre
+    cluster: GenreCommunity
+
+
+class RankedDirector(BaseModel):
+    """Director with centrality scores."""
+
+    director: Director
+    pagerank: float = Field(..., description="Weighted PageRank (1.0 = average node)")
+    films: Optional[int] = Field(None, description="Films directed (Author.film_count)")
+    genre_films: int = Field(..., description="Films directed in the requested genre")
+
+
+class TopDirectorsResponse(BaseModel):
+    """Most central directors of a genre."""
+
+    topic: Genre
+    directors: List[RankedDirector] = []
 
 
 class DirectorContributionsResponse(BaseModel):
@@ -67,6 +143,32 @@ class DirectorContributionsResponse(BaseModel):
     director: Director
     films: List[Film] = []
     genres: List[Genre] = []
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page (null on the last page)",
+    )
+
+
+class DirectorTimelineResponse(BaseModel):
+    """Films of a director per decade."""
+
+    director: Director
+    decades: List[DecadeCount] = Field([], description="Decades with films, ascending")
+    undated: int = Field(0, description="Films without a release year")
+
+
+class SimilarDirector(BaseModel):
+    """Director with a Jaccard similarity score."""
+
+    director: Director
+    score: float = Field(..., description="Jaccard similarity of the director profiles (0-1)")
+
+
+class SimilarDirectorsResponse(BaseModel):
+    """Directors with a similar genre / film profile."""
+
+    director: Director
+    similar: List[SimilarDirector] = []
 
 
 class RelatedFilm(BaseModel):
@@ -82,6 +184,64 @@ class RelatedFilmsResponse(BaseModel):
     film_id: str
     related: List[RelatedFilm]
 
+
+class RelatedFilmsBatchRequest(BaseModel):
+    """Batch of films to compute related films for."""
+
+    film_ids: List[str] = Field(..., min_length=1, max_length=100)
+    limit: int = Field(10, ge=1, le=50)
+
+
+class RelatedFilmsBatchItem(RelatedFilmsResponse):
+    """Related films of one film of the batch (`found` is false for unknown ids)."""
+
+    found: bool = True
+
+
+class RelatedFilmsBatchResponse(BaseModel):
+    """Per-film related films, in request order."""
+
+    results: List[RelatedFilmsBatchItem]
+    missing: List[str] = []
+
+class DegreeCount(BaseModel):
+    """Number of nodes having a given degree."""
+
+    degree: int
+    count: int
+
+
+class GenreFilmCount(BaseModel):
+    """Genre with its number of films."""
+
+    genre: Genre
+    films: int
+
+
+class DirectorFilmCount(BaseModel):
+    """Director with their number of films."""
+
+    director: Director
+    films: int
+
+
+class StatsResponse(BaseModel):
+    """Graph statistics."""
+
+    graph_version: Optional[int] = None
+    nodes: Dict[str, int] = Field(..., description="Node totals (total and per label)")
+    relationships: Dict[str, int] = Field(
+        ...,
+        description="Relationship totals (total and per type)",
+    )
+    distributions: Dict[str, List[DegreeCount]] = Field(
+        {},
+        description="Degree histograms (films_per_director, genres_per_film, ...)",
+    )
+    top_genres: List[GenreFilmCount] = []
+    top_directors: List[DirectorFilmCount] = []
+
+
 class LLMQueryRequest(BaseModel):
     question: str = Field(..., min_length=3)
     limit: int = Field(20, ge=1, le=100)
@@ -89,4 +249,74 @@ class LLMQueryRequest(BaseModel):
 class LLMQueryResponse(BaseModel):
     question: str
     cypher: str
+    params: dict = {}
     results: list[dict]
+
+
+class ProfiledRoute(BaseModel):
+    """Sampling profiler counters for one route template."""
+
+    requests: int
+    samples: int
+    distinct_stacks: int
+
+
+class ProfilerStatsResponse(BaseModel):
+    """Sampling profiler configuration, overhead and per-route counters."""
+
+    sample_rate: float
+    interval_ms: float
+    sampler_cpu_seconds: float
+    profiled_wall_seconds: float
+    overhead_ratio: float = Field(
+        ...,
+        description="Sampler CPU time / wall time of profiled requests",
+    )
+    amortized_overhead_ratio: float = Field(
+        ...,
+        description="overhead_ratio weighted by the sample rate (cost over all traffic)",
+    )
+    routes: Dict[str, ProfiledRoute] = {}
+
+
+class TimingSummary(BaseModel):
+    """Timing summary of a measured operation."""
+
+    count: int
+    total_seconds: float
+    max_seconds: float
+    avg_seconds: float
+
+
+class MetricsResponse(BaseModel):
+    """In-process counters and timings."""
+
+    counters: Dict[str, float] = {}
+    timings: Dict[str, TimingSummary] = {}
+    gauges: Dict[str, float] = {}
+
+
+class JobStatus(BaseModel):
+    """State of a background job (times are Unix timestamps)."""
+
+    name: str
+    interval_seconds: Optional[float] = None
+    on_graph_change: bool
+    heavy: bool
+    running: bool
+    runs: int
+    last_started_at: Optional[float] = None
+    last_finished_at: Optional[float] = None
+    last_duration_seconds: Optional[float] = None
+    last_status: Optional[str] = None
+    last_error: Optional[str] = None
+    last_graph_version: Optional[int] = None
+    last_result: Any = Field(None, description="Value returned by the last successful run")
+    next_run_at: Optional[float] = None
+
+
+class JobsResponse(BaseModel):
+    """Background scheduler state."""
+
+    enabled: bool
+    jobs: List[JobStatus] = []
@@ -0,0 +1,59 @@
+# app/pagination.py
+
+"""
+Opaque keyset cursors.
+
+A cursor is the sort key of the last row of a page (e.g. `[year, wikidata_id]`
+or `[relevance, wikidata_id]`), JSON encoded then base64url'd. Queries filter
+on `sort key > cursor` and fetch `limit + 1` rows: the extra row only tells
+whether a next page exists. There is no SKIP, so a deep page never costs more
+than the first one, but what a page costs depends on where the rows come from:
+- hub genres: ordered scan of the Article.year_key index from the cursor,
+  stopped once the page is full;
+- director films, other genres: expansion of every relationship of the node
+  (bounded by its degree, TOPIC_HUB_THRESHOLD for genres), then the cursor
+  filter on the stored year_key;
+- search: the CONTAINS matches are re-evaluated and ranked on every page.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, List, Optional
+
+from fastapi import HTTPException
+
+# Sort key used for films without a release year: they come last in
+# "most recent first" orderings. Must match Article.year_key, written by the
+# importer as coalesce(year, -1).
+MISSING_YEAR = -1
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], arity: int) -> Optional[List[Any]]:
+    """Decode a cursor into its sort key values (None for the first page).
+
+    Raises HTTP 400 if the cursor was not produced by `encode_cursor` for a
+    sort key of the same arity.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor.") from exc
+
+    if not isinstance(values, list) or len(values) != arity:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    return values
+
+
+def year_cursor(film: dict) -> str:
+    """Cursor after `film` in a (year DESC, wikidata_id ASC) ordering."""
+    year = film.get("year")
+    return encode_cursor(MISSING_YEAR if year is None else year, film["wikidata_id"])
@@ -0,0 +1,278 @@
+# app/profiling.py
+
+"""
+Opt-in statistical sampling profiler.
+
+A configurable fraction of requests is profiled by a background thread that
+snapshots, at a fixed interval, only the stacks executing that request: the
+event loop thread while the request's task is the running one, and the
+threadpool workers while they run its sync endpoint / dependencies. Samples are
+aggregated per route template as collapsed stacks (`frame;frame;frame count`),
+the input format of flamegraph.pl and speedscope.
+
+Overhead is bounded by design: at most one request is profiled at a time,
+the number of distinct stacks kept per route is capped, and the CPU time
+spent by the sampler thread is tracked so the cost can be read back from
+the admin endpoint.
+
+Configuration (environment variables):
+- PROFILER_SAMPLE_RATE: fraction of requests to profile (default 0 = disabled)
+- PROFILER_INTERVAL_MS: sampling interval in milliseconds (default 5)
+- PROFILER_MAX_STACKS: distinct stacks kept per route (default 5000)
+"""
+
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+
+import anyio.to_thread
+
+# Leaf frames in these files mean the thread is parked (threadpool workers
+# waiting for work, event loop waiting in select); those samples are noise.
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py")
+_MAX_DEPTH = 64
+_TRUNCATED = "[truncated]"
+
+# Sampler of the request being profiled, inherited by its tasks and by the
+# contexts anyio copies into threadpool workers.
+_current_sampler: ContextVar[Optional["_SamplerThread"]] = ContextVar(
+    "profiled_request", default=None
+)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.basename(code.co_filename).rsplit(".", 1)[0]
+    return f"{module}:{code.co_qualname}"
+
+
+def _collapse(frame) -> Optional[str]:
+    """Render a thread stack as `root;...;leaf`, or None if the thread is idle."""
+    if os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+        return None
+
+    labels = []
+    while frame is not None and len(labels) < _MAX_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+class _SamplerThread(threading.Thread):
+    """Samples the threads serving one request until stopped."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="sampling-profiler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.cpu_seconds = 0.0
+        self.started_at = time.perf_counter()
+        self._stop_event = threading.Event()
+        # Started from the request's task, on the event loop thread.
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._task = asyncio.current_task()
+        # Worker thread ident -> calls in progress, updated by several
+        # threadpool workers while the sampler reads it.
+        self._workers: Dict[int, int] = {}
+        self._workers_lock = threading.Lock()
+
+    def track(self, func: Callable) -> Callable:
+        """Wrap threadpool work of the request so its worker thread is sampled."""
+
+        def tracked(*args):
+            ident = threading.get_ident()
+            with self._workers_lock:
+                self._workers[ident] = self._workers.get(ident, 0) + 1
+            try:
+                return func(*args)
+            finally:
+                with self._workers_lock:
+                    self._workers[ident] -= 1
+                    if not self._workers[ident]:
+                        del self._workers[ident]
+
+        return tracked
+
+    def _threads(self) -> list:
+        with self._workers_lock:
+            threads = list(self._workers)
+        # Other requests' tasks also run on the loop thread: only sample it
+        # while the profiled task holds it.
+        if asyncio.current_task(self._loop) is self._task:
+            threads.append(self._loop_thread)
+        return threads
+
+    def run(self) -> None:
+        started = time.thread_time()
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()  # pylint: disable=protected-access
+            for ident in self._threads():
+                frame = frames.get(ident)
+                stack = _collapse(frame) if frame is not None else None
+                if stack:
+                    self.stacks[stack] += 1
+        self.cpu_seconds = time.thread_time() - started
+
+    def finish(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class SamplingProfiler:
+    """Aggregates sampled stacks per route template."""
+
+    def __init__(self, sample_rate: float = 0.0, interval_ms: float = 5.0, max_stacks: int = 5000):
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000.0
+        self.max_stacks = max_stacks
+
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+        self._stacks: Dict[str, Counter] = defaultdict(Counter)
+        self._requests: Counter = Counter()
+        self._sampler_cpu = 0.0
+        self._profiled_wall = 0.0
+
+    @classmethod
+    def from_env(cls) -> "SamplingProfiler":
+        return cls(
+            sample_rate=float(os.getenv("PROFILER_SAMPLE_RATE", "0")),
+            interval_ms=float(os.getenv("PROFILER_INTERVAL_MS", "5")),
+            max_stacks=int(os.getenv("PROFILER_MAX_STACKS", "5000")),
+        )
+
+    def should_profile(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self) -> Optional[_SamplerThread]:
+        """Start sampling, unless another request is already being profiled."""
+        if not self._busy.acquire(blocking=False):
+            return None
+        sampler = _SamplerThread(self.interval)
+        sampler.start()
+        return sampler
+
+    def stop(self, sampler: _SamplerThread, route: str) -> None:
+        sampler.finish()
+        wall = time.perf_counter() - sampler.started_at
+        try:
+            with self._lock:
+                self._requests[route] += 1
+                self._sampler_cpu += sampler.cpu_seconds
+                self._profiled_wall += wall
+                bucket = self._stacks[route]
+                for stack, count in sampler.stacks.items():
+                    if stack not in bucket and len(bucket) >= self.max_stacks:
+                        stack = _TRUNCATED
+                    bucket[stack] += count
+        finally:
+            self._busy.release()
+
+    def collapsed(self, route: Optional[str] = None) -> str:
+        """Collapsed-stack text, one `stack count` line per distinct stack.
+
+        When no route is given, every route is exported with the route
+        template as the root frame so a single flamegraph covers the service.
+        """
+        with self._lock:
+            if route is not None:
+                items = list(self._stacks.get(route, Counter()).items())
+            else:
+                items = [
+                    (f"{name};{stack}", count)
+                    for name, bucket in self._stacks.items()
+                    for stack, count in bucket.items()
+                ]
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(items))
+
+    def stats(self) -> dict:
+        with self._lock:
+            routes = {
+                name: {
+                    "requests": self._requests[name],
+                    "samples": sum(bucket.values()),
+                    "distinct_stacks": len(bucket),
+                }
+                for name, bucket in self._stacks.items()
+            }
+            overhead = self._sampler_cpu / self._profiled_wall if self._profiled_wall else 0.0
+            return {
+                "sample_rate": self.sample_rate,
+                "interval_ms": self.interval * 1000.0,
+                "sampler_cpu_seconds": self._sampler_cpu,
+                "profiled_wall_seconds": self._profiled_wall,
+                # CPU spent sampling relative to the wall time of profiled requests,
+                # then amortised over all traffic through the sample rate.
+                "overhead_ratio": overhead,
+                "amortized_overhead_ratio": overhead * self.sample_rate,
+                "routes": routes,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks.clear()
+            self._requests.clear()
+            self._sampler_cpu = 0.0
+            self._profiled_wall = 0.0
+
+
+def _install_threadpool_hook() -> None:
+    """
+    Route threadpool calls of profiled requests through `_SamplerThread.track`.
+
+    Sync endpoints and dependencies reach the workers through
+    anyio.to_thread.run_sync (Starlette's run_in_threadpool); outside a
+    profiled request the hook costs one ContextVar lookup.
+    """
+    run_sync = anyio.to_thread.run_sync
+    if getattr(run_sync, "profiler_hook", False):
+        return
+
+    async def profiled_run_sync(func, *args, **kwargs):
+        sampler = _current_sampler.get()
+        if sampler is not None:
+            func = sampler.track(func)
+        return await run_sync(func, *args, **kwargs)
+
+    profiled_run_sync.profiler_hook = True
+    anyio.to_thread.run_sync = profiled_run_sync
+
+
+class ProfilerMiddleware:
+    """Pure ASGI middleware profiling a sampled fraction of HTTP requests."""
+
+    def __init__(self, app, profiler: SamplingProfiler):
+        self.app = app
+        self.profiler = profiler
+        _install_threadpool_hook()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.profiler.should_profile():
+            await self.app(scope, receive, send)
+            return
+
+        sampler = self.profiler.start()
+        if sampler is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = _current_sampler.set(sampler)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_sampler.reset(token)
+            # The router stores the matched route on the scope; use its template
+            # so /api/articles/Q1/related and /api/articles/Q2/related aggregate.
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            self.profiler.stop(sampler, route)
+
+
+request_profiler = SamplingProfiler.from_env()
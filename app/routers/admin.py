@@ -0,0 +1,75 @@
+# app/routers/admin.py
+
+"""
+Operational endpoints (API key protected).
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.metrics import metrics
+from app.models.schemas import JobsResponse, MetricsResponse, ProfilerStatsResponse
+from app.profiling import request_profiler
+from app.scheduler import scheduler, scheduler_enabled
+from app.security import require_api_key
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_api_key)],
+)
+
+
+@router.get("/metrics", response_model=MetricsResponse)
+def get_metrics():
+    """In-process counters and timings (coalesced requests, ...)."""
+    return MetricsResponse(**metrics.snapshot())
+
+
+@router.get("/profiles", response_model=ProfilerStatsResponse)
+def get_profiler_stats():
+    """Sampling profiler configuration, measured overhead and per-route counters."""
+    return ProfilerStatsResponse(**request_profiler.stats())
+
+
+@router.get("/profiles/collapsed", response_class=PlainTextResponse)
+def download_collapsed_stacks(
+    route: Optional[str] = Query(
+        None,
+        description="Route template (e.g. /api/search); all routes when omitted",
+    ),
+):
+    """
+    Download aggregated samples in collapsed-stack format.
+
+    Feed the file to flamegraph.pl or drop it into speedscope.app.
+    """
+    return PlainTextResponse(
+        request_profiler.collapsed(route),
+        headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'},
+    )
+
+
+@router.delete("/profiles", status_code=204)
+def reset_profiles():
+    """Drop every aggregated sample."""
+    request_profiler.reset()
+
+
+@router.get("/jobs", response_model=JobsResponse)
+def get_jobs():
+    """Background jobs: last run, duration, status and next run."""
+    return JobsResponse(
+        enabled=scheduler_enabled(),
+        jobs=[job.status() for job in scheduler.jobs()],
+    )
+
+
+@router.post("/jobs/{name}/run", status_code=202)
+def run_job(name: str):
+    """Schedule a job for the next scheduler tick (even if it is not due)."""
+    if not scheduler.request_run(name):
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return {"name": name, "requested": True}
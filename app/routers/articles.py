@@ -1,36 +1,63 @@
 # app/routers/articles.py
-from typing import List
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from neo4j import Session
 
+from app.admission import admit
+from app.cache import response_cache
 from app.database.neo4j import get_db
+from app.database.transactions import QueryContext, query_context
+from app.etag import conditional_get
 from app.security import require_api_key
 from app.models.schemas import (
-    Film,
-    RelatedFilm,
+    RelatedFilmsBatchRequest,
+    RelatedFilmsBatchResponse,
     RelatedFilmsResponse,
 )
+from app.serialization import render
+from app.services.related import fetch_related_films
+from app.singleflight import SingleFlight, flight_key
 
 router = APIRouter(prefix="/api", tags=["articles"])
 
+_related_flight = SingleFlight("related")
+
+# Behind the API key: cacheable by the client only.
+_cache_headers = conditional_get("related", private=True)
+
+RELATED_ROUTE = "/api/articles/{film_id}/related"
+
+
+def _related_payload(
+    db: Session,
+    film_id: str,
+    limit: int,
+    ctx: Optional[QueryContext] = None,
+) -> Optional[list]:
+    return fetch_related_films(db, [film_id], limit, ctx)[film_id]
 
-def _node_to_film(node) -> Film:
-    return Film(
-        wikidata_id=node.get("wikidata_id"),
-        title=node.get("title"),
-        year=node.get("year"),
-    )
+
+response_cache.register_loader(RELATED_ROUTE, _related_payload)
 
 
 @router.get(
     "/articles/{film_id}/related",
     response_model=RelatedFilmsResponse,
+    # Key check, then validators before admission so a 304 never takes a slot
+    # (each dependency is resolved once per request).
+    dependencies=[
+        Depends(require_api_key),
+        Depends(_cache_headers),
+        Depends(admit("related")),
+    ],
 )
 def get_related_films(
     film_id: str = Path(..., description="Film Wikidata id (e.g., Q19303)"),
     limit: int = Query(10, ge=1, le=50),
+    cache_headers: dict = Depends(_cache_headers),
     db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("related")),
     _api_key: bool = Depends(require_api_key),
 ):
     """
@@ -42,66 +69,53 @@ def get_related_films(
     - optionally similar year (weak signal)
     Score is computed from these shared signals.
     """
-
-    # Check film exists
-    exists_cypher = "MATCH (f:Article {wikidata_id: $id}) RETURN f LIMIT 1"
-    rec = db.run(exists_cypher, id=film_id).single()
-    if rec is None:
+    # Cached per graph version; identical concurrent misses share one execution.
+    params = {"film_id": film_id, "limit": limit}
+    key = flight_key(RELATED_ROUTE, **params)
+    ctx.cancellable = lambda: not _related_flight.waiting(key)
+    related = response_cache.get_or_load(
+        RELATED_ROUTE,
+        params,
+        lambda: _related_flight.do(key, lambda: _related_payload(db, ctx=ctx, **params)),
+    )
+    if related is None:
         raise HTTPException(status_code=404, detail="Film not found.")
 
-    cypher = """
-    MATCH (f:Article {wikidata_id: $id})
-
-    OPTIONAL MATCH (fd:Author)-[:DIRECTED]->(f)
-    WITH f, collect(DISTINCT fd) AS f_directors
-    OPTIONAL MATCH (f)-[:HAS_TOPIC]->(fg:Topic)
-    WITH f, f_directors, collect(DISTINCT fg) AS f_genres
-
-    MATCH (other:Article)
-    WHERE other <> f
-
-    // directors shared
-    OPTIONAL MATCH (od:Author)-[:DIRECTED]->(other)
-    WITH f, other, f_directors, f_genres, collect(DISTINCT od) AS o_directors
-
-    // genres shared
-    OPTIONAL MATCH (other)-[:HAS_TOPIC]->(og:Topic)
-    WITH f, other, f_directors, f_genres, o_directors, collect(DISTINCT og) AS o_genres
-
-    WITH f, other,
-        size([d IN o_directors WHERE d IN f_directors]) AS shared_directors,
-        size([g IN o_genres WHERE g IN f_genres]) AS shared_genres
-
-    WITH f, other,
-        (shared_directors * 2.0 + shared_genres * 1.0) AS base_score,
-        CASE
-            WHEN other.year IS NULL OR f.year IS NULL THEN 0.0
-            WHEN abs(other.year - f.year) <= 1 THEN 0.5
-            WHEN abs(other.year - f.year) <= 3 THEN 0.2
-            ELSE 0.0
-        END AS year_bonus
-
-    WITH other, (base_score + year_bonus) AS score
-    WHERE score > 0
-    RETURN other, score
-    ORDER BY score DESC, other.year DESC
-    LIMIT $limit
-    """
-
+    return render(
+        {"film_id": film_id, "related": related},
+        RelatedFilmsResponse,
+        "articles",
+        headers=cache_headers,
+    )
 
-    records = db.run(cypher, id=film_id, limit=limit)
 
-    related: List[RelatedFilm] = []
-    for r in records:
-        other_node = r["other"]
-        if other_node is None:
-            continue
-        score = r["score"] if r["score"] is not None else 0.0
-        related.append(
-            RelatedFilm(
-                film=_node_to_film(other_node),
-                score=float(score),
-            )
-        )
+@router.post(
+    "/articles/related:batch",
+    response_model=RelatedFilmsBatchResponse,
+    dependencies=[Depends(admit("related_batch"))],
+)
+def get_related_films_batch(
+    payload: RelatedFilmsBatchRequest,
+    db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("related_batch")),
+    _api_key: bool = Depends(require_api_key),
+):
+    """
+    Related films for up to 100 films in a single Neo4j round trip.
 
-    return RelatedFilmsResponse(film_id=film_id, related=related)
+    Unknown ids do not fail the batch: they are returned with `found: false`
+    and listed in `missing`.
+    """
+    by_id = fetch_related_films(db, payload.film_ids, payload.limit, ctx)
+
+    results = [
+        {"film_id": film_id, "found": related is not None, "related": related or []}
+        for film_id, related in by_id.items()
+    ]
+    missing = [film_id for film_id, related in by_id.items() if related is None]
+
+    return render(
+        {"results": results, "missing": missing},
+        RelatedFilmsBatchResponse,
+        "articles",
+    )
@@ -1,37 +1,54 @@
 # app/routers/authors.py
-from typing import List
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from neo4j import Session
 
 from app.database.neo4j import get_db
+from app.database.transactions import QueryContext, query_context, run_read
+from app.etag import conditional_get
 from app.models.schemas import (
-    Director,
-    Film,
-    Genre,
     DirectorContributionsResponse,
+    DirectorTimelineResponse,
+    SimilarDirectorsResponse,
 )
+from app.pagination import decode_cursor, year_cursor
+from app.serialization import render
 
 router = APIRouter(prefix="/api", tags=["authors"])
 
-
-def _node_to_director(node) -> Director:
-    return Director(
-        wikidata_id=node.get("wikidata_id"),
-        name=node.get("name"),
-    )
-
-
-def _node_to_film(node) -> Film:
-    return Film(
-        wikidata_id=node.get("wikidata_id"),
-        title=node.get("title"),
-        year=node.get("year"),
-    )
-
-
-def _node_to_genre(node) -> Genre:
-    return Genre(name=node.get("name"))
+_cache_headers = conditional_get("authors")
+
+
+# One round trip: no row means the director does not exist.
+# Keyset pagination on (Article.year_key DESC, wikidata_id ASC), films without
+# year last. Every page expands all the films of the director (a director has
+# few): there is no index on the films of one node.
+CONTRIBUTIONS_CYPHER = """
+MATCH (d:Author {wikidata_id: $id})
+CALL {
+    WITH d
+    MATCH (d)-[:DIRECTED]->(f:Article)
+    WHERE $after IS NULL
+       OR f.year_key < $after[0]
+       OR (f.year_key = $after[0] AND f.wikidata_id > $after[1])
+    WITH f
+    ORDER BY f.year_key DESC, f.wikidata_id
+    LIMIT $page_size
+    RETURN collect(f) AS page
+}
+WITH d, page[0..$limit] AS films, size(page) > $limit AS has_more
+CALL {
+    WITH films
+    UNWIND films AS f
+    MATCH (f)-[:HAS_TOPIC]->(g:Topic)
+    RETURN collect(DISTINCT g {.name}) AS genres
+}
+RETURN d {.wikidata_id, .name} AS director,
+       [f IN films | f {.wikidata_id, .title, .year}] AS films,
+       genres,
+       has_more
+"""
 
 
 @router.get(
@@ -41,45 +58,95 @@ def _node_to_genre(node) -> Genre:
 def get_director_contributions(
     director_id: str = Path(..., description="Director Wikidata id (e.g., Q12345)"),
     limit: int = Query(50, ge=1, le=200, description="Max number of films returned"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    cache_headers: dict = Depends(_cache_headers),
     db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("authors")),
 ):
     """
     Wikidata Films KG:
     Returns a director's contributions:
-    - films they directed (Article nodes)
-    - genres (Topic) of these films
+    - films they directed (Article nodes), most recent first
+    - genres (Topic) of the films of the page
     """
+    after = decode_cursor(cursor, 2)
 
-    # Check director exists
-    rec = db.run(
-        "MATCH (d:Author {wikidata_id: $id}) RETURN d LIMIT 1",
-        id=director_id,
-    ).single()
-    if rec is None:
+    records = run_read(
+        db, CONTRIBUTIONS_CYPHER, ctx, id=director_id, after=after, limit=limit, page_size=limit + 1
+    )
+    if not records:
         raise HTTPException(status_code=404, detail="Director not found.")
 
-    director = _node_to_director(rec["d"])
+    payload = records[0].data()
+    has_more = payload.pop("has_more")
+    payload["next_cursor"] = year_cursor(payload["films"][-1]) if has_more else None
 
-    cypher = """
-    MATCH (d:Author {wikidata_id: $id})
-    OPTIONAL MATCH (d)-[:DIRECTED]->(f:Article)
-    WITH d, collect(DISTINCT f)[0..$limit] AS films
-    UNWIND films AS f
-    OPTIONAL MATCH (f)-[:HAS_TOPIC]->(g:Topic)
-    WITH films, collect(DISTINCT g) AS genres
-    RETURN films, genres
+    return render(payload, DirectorContributionsResponse, "authors", headers=cache_headers)
+
+
+# Precomputed by the `similar_directors` job (app/jobs/similar_directors.py):
+# at most LSH_TOP_K edges per director, read in index order.
+SIMILAR_CYPHER = """
+MATCH (d:Author {wikidata_id: $id})
+CALL {
+    WITH d
+    MATCH (d)-[r:SIMILAR_TO]->(o:Author)
+    WITH o, r.score AS score
+    ORDER BY score DESC, o.wikidata_id
+    LIMIT $limit
+    RETURN collect({director: o {.wikidata_id, .name}, score: score}) AS similar
+}
+RETURN d {.wikidata_id, .name} AS director, similar
+"""
+
+
+@router.get("/authors/{director_id}/similar", response_model=SimilarDirectorsResponse)
+def get_similar_directors(
+    director_id: str = Path(..., description="Director Wikidata id (e.g., Q12345)"),
+    limit: int = Query(10, ge=1, le=50, description="Max number of directors returned"),
+    db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("authors")),
+):
+    """
+    Wikidata Films KG:
+    Directors with a similar profile (genres of their films, shared films),
+    ranked by Jaccard similarity. Candidates come from MinHash / LSH, so the
+    list is approximate; it is rebuilt after each import and empty until the
+    first build.
     """
+    records = run_read(db, SIMILAR_CYPHER, ctx, id=director_id, limit=limit)
+    if not records:
+        raise HTTPException(status_code=404, detail="Director not found.")
 
-    record = db.run(cypher, id=director_id, limit=limit).single()
+    return render(records[0].data(), SimilarDirectorsResponse, "authors")
 
-    films_nodes = record["films"] or []
-    genre_nodes = record["genres"] or []
 
-    films: List[Film] = [_node_to_film(f) for f in films_nodes if f is not None]
-    genres: List[Genre] = [_node_to_genre(g) for g in genre_nodes if g is not None]
+# Decade histogram precomputed on the Author by the timelines job
+# (app/jobs/timelines.py); timeline_undated is null until its first run.
+DIRECTOR_TIMELINE_CYPHER = """
+MATCH (d:Author {wikidata_id: $id})
+RETURN d {.wikidata_id, .name} AS director,
+       [i IN range(0, size(coalesce(d.timeline_decades, [])) - 1) |
+        {decade: d.timeline_decades[i], films: d.timeline_counts[i]}] AS decades,
+       d.timeline_undated AS undated
+"""
 
-    return DirectorContributionsResponse(
-        director=director,
-        films=films,
-        genres=genres,
-    )
+
+@router.get("/authors/{director_id}/timeline", response_model=DirectorTimelineResponse)
+def get_director_timeline(
+    director_id: str = Path(..., description="Director Wikidata id (e.g., Q12345)"),
+    db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("timelines")),
+):
+    """
+    Wikidata Films KG:
+    Films of a director per decade (recomputed after each import).
+    """
+    records = run_read(db, DIRECTOR_TIMELINE_CYPHER, ctx, id=director_id)
+    if not records:
+        raise HTTPException(status_code=404, detail="Director not found.")
+
+    payload = records[0].data()
+    if payload["undated"] is None:
+        raise HTTPException(status_code=503, detail="Director timelines not computed yet.")
+    return render(payload, DirectorTimelineResponse, "authors")
@@ -0,0 +1,168 @@
+# app/routers/export.py
+
+"""
+Streaming NDJSON export endpoints for analytics consumers.
+
+Rows are pulled lazily from the Neo4j result cursor (the driver fetches them
+in batches of `fetch_size`) and written as one JSON document per line. The
+response body is produced by a generator, so the server never holds more
+than one chunk in memory and slow clients naturally throttle the reads
+(the ASGI server only asks for the next chunk once the previous one is sent).
+
+`gzip=true` compresses the stream on the fly (`Content-Encoding: gzip`).
+"""
+
+import zlib
+from typing import Iterable, Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
+from neo4j import Session
+
+from app.database.neo4j import get_db, get_driver
+from app.security import require_api_key
+from app.serialization import dumps
+
+router = APIRouter(
+    prefix="/api/export",
+    tags=["export"],
+    dependencies=[Depends(require_api_key)],
+)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CHUNK_SIZE = 64 * 1024
+FETCH_SIZE = 1000
+
+_TOPIC_EXPORT_CYPHER = """
+MATCH (t:Topic {name: $name})<-[:HAS_TOPIC]-(f:Article)
+RETURN f {
+    .wikidata_id, .title, .year,
+    directors: [(d:Author)-[:DIRECTED]->(f) | d.wikidata_id],
+    genres: [(f)-[:HAS_TOPIC]->(g:Topic) | g.name]
+} AS row
+"""
+
+_AUTHOR_EXPORT_CYPHER = """
+MATCH (:Author {wikidata_id: $id})-[:DIRECTED]->(f:Article)
+RETURN f {
+    .wikidata_id, .title, .year,
+    directors: [(d:Author)-[:DIRECTED]->(f) | d.wikidata_id],
+    genres: [(f)-[:HAS_TOPIC]->(g:Topic) | g.name]
+} AS row
+"""
+
+# Nodes first, then edges; UNION ALL branches are streamed one after the other.
+_GRAPH_EXPORT_CYPHER = """
+CALL {
+    MATCH (f:Article)
+    RETURN {type: 'node', label: 'Article',
+            wikidata_id: f.wikidata_id, title: f.title, year: f.year} AS row
+    UNION ALL
+    MATCH (a:Author)
+    RETURN {type: 'node', label: 'Author', wikidata_id: a.wikidata_id, name: a.name} AS row
+    UNION ALL
+    MATCH (t:Topic)
+    RETURN {type: 'node', label: 'Topic', name: t.name} AS row
+    UNION ALL
+    MATCH (a:Author)-[:DIRECTED]->(f:Article)
+    RETURN {type: 'edge', rel: 'DIRECTED',
+            source: a.wikidata_id, target: f.wikidata_id} AS row
+    UNION ALL
+    MATCH (f:Article)-[:HAS_TOPIC]->(t:Topic)
+    RETURN {type: 'edge', rel: 'HAS_TOPIC', source: f.wikidata_id, target: t.name} AS row
+    UNION ALL
+    MATCH (t1:Topic)-[r:CO_OCCURS_WITH]->(t2:Topic)
+    RETURN {type: 'edge', rel: 'CO_OCCURS_WITH',
+            source: t1.name, target: t2.name, score: r.score} AS row
+}
+RETURN row
+"""
+
+
+def ndjson_chunks(rows: Iterable[dict], gzip: bool = False) -> Iterator[bytes]:
+    """Encode rows as NDJSON, yielding ~CHUNK_SIZE byte chunks (optionally gzipped)."""
+    compressor = zlib.compressobj(wbits=31) if gzip else None
+    buffer = bytearray()
+
+    def _emit(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    for row in rows:
+        buffer += dumps(row)
+        buffer += b"\n"
+        if len(buffer) >= CHUNK_SIZE:
+            chunk = _emit(bytes(buffer))
+            buffer.clear()
+            if chunk:
+                yield chunk
+
+    tail = _emit(bytes(buffer))
+    if compressor:
+        tail += compressor.flush()
+    if tail:
+        yield tail
+
+
+def _stream_rows(cypher: str, **params) -> Iterator[dict]:
+    """Iterate the `row` column lazily, in a session owned by the generator.
+
+    The request-scoped session from `get_db` may be closed before the body is
+    fully sent, so the stream opens (and always closes) its own.
+    """
+    with get_driver().session(fetch_size=FETCH_SIZE) as session:
+        for record in session.run(cypher, **params):
+            yield record["row"]
+
+
+def _ndjson_response(rows: Iterable[dict], gzip: bool, filename: str) -> StreamingResponse:
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        ndjson_chunks(rows, gzip=gzip),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers,
+    )
+
+
+def _safe_filename(name: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in name) or "export"
+
+
+@router.get("/topics/{topic_name}")
+def export_topic(
+    topic_name: str = Path(..., description="Genre name (Topic.name)"),
+    gzip: bool = Query(False, description="Compress the stream (Content-Encoding: gzip)"),
+    db: Session = Depends(get_db),
+):
+    """Every film of a genre with its DIRECTED / HAS_TOPIC edges, one per line."""
+    exists = db.run("MATCH (t:Topic {name: $name}) RETURN 1 LIMIT 1", name=topic_name)
+    if exists.single() is None:
+        raise HTTPException(status_code=404, detail="Topic (genre) not found.")
+
+    rows = _stream_rows(_TOPIC_EXPORT_CYPHER, name=topic_name)
+    return _ndjson_response(rows, gzip, f"topic_{_safe_filename(topic_name)}.ndjson")
+
+
+@router.get("/authors/{director_id}")
+def export_author(
+    director_id: str = Path(..., description="Director Wikidata id (e.g., Q12345)"),
+    gzip: bool = Query(False, description="Compress the stream (Content-Encoding: gzip)"),
+    db: Session = Depends(get_db),
+):
+    """Every film of a director with its DIRECTED / HAS_TOPIC edges, one per line."""
+    exists = db.run("MATCH (d:Author {wikidata_id: $id}) RETURN 1 LIMIT 1", id=director_id)
+    if exists.single() is None:
+        raise HTTPException(status_code=404, detail="Director not found.")
+
+    rows = _stream_rows(_AUTHOR_EXPORT_CYPHER, id=director_id)
+    return _ndjson_response(rows, gzip, f"author_{_safe_filename(director_id)}.ndjson")
+
+
+@router.get("/graph")
+def export_graph(
+    gzip: bool = Query(False, description="Compress the stream (Content-Encoding: gzip)"),
+):
+    """The whole graph: node lines (`type: node`) then edge lines (`type: edge`)."""
+    rows = _stream_rows(_GRAPH_EXPORT_CYPHER)
+    return _ndjson_response(rows, gzip, "graph.ndjson")
@@ -0,0 +1,110 @@
+# app/routers/films.py
+
+"""
+Film listing filtered by release year, genre and director.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from neo4j import Session
+
+from app.database.neo4j import get_db
+from app.database.transactions import QueryContext, query_context, run_read
+from app.etag import conditional_get
+from app.models.schemas import FilmListResponse
+from app.pagination import decode_cursor, encode_cursor
+from app.serialization import render
+
+router = APIRouter(prefix="/api", tags=["films"])
+
+_cache_headers = conditional_get("films")
+
+# Bounds used when year_from / year_to are omitted.
+MIN_YEAR = 0
+MAX_YEAR = 9999
+
+_FILM_PROJECTION = """
+RETURN f {
+    .wikidata_id, .title, .year,
+    directors: [(f)<-[:DIRECTED]-(d:Author) | d {.wikidata_id, .name}],
+    genres: [(f)-[:HAS_TOPIC]->(g:Topic) | g {.name}]
+} AS film
+"""
+
+# Keyset pagination on (year ASC, wikidata_id ASC). The range seek on the
+# Article.year index starts at the cursor year ($year_from is raised to it),
+# and a film is kept if it has the requested genre (adjacency check): the
+# scan stops as soon as the page is full.
+FILMS_BY_YEAR_CYPHER = """
+MATCH (f:Article)
+USING INDEX f:Article(year)
+WHERE f.year >= $year_from AND f.year <= $year_to
+  AND ($after IS NULL OR f.year > $after[0] OR f.wikidata_id > $after[1])
+  AND ($genre IS NULL OR EXISTS { (f)-[:HAS_TOPIC]->(:Topic {name: $genre}) })
+WITH f
+ORDER BY f.year, f.wikidata_id
+LIMIT $page_size
+""" + _FILM_PROJECTION
+
+# With a director the films are reached from the director (a few dozen at
+# most) and filtered on year and genre.
+DIRECTOR_FILMS_BY_YEAR_CYPHER = """
+MATCH (:Author {wikidata_id: $director})-[:DIRECTED]->(f:Article)
+WHERE f.year >= $year_from AND f.year <= $year_to
+  AND ($after IS NULL OR f.year > $after[0] OR f.wikidata_id > $after[1])
+  AND ($genre IS NULL OR EXISTS { (f)-[:HAS_TOPIC]->(:Topic {name: $genre}) })
+WITH f
+ORDER BY f.year, f.wikidata_id
+LIMIT $page_size
+""" + _FILM_PROJECTION
+
+
+@router.get("/films", response_model=FilmListResponse)
+def list_films(
+    year_from: Optional[int] = Query(None, ge=MIN_YEAR, le=MAX_YEAR, description="First year"),
+    year_to: Optional[int] = Query(None, ge=MIN_YEAR, le=MAX_YEAR, description="Last year"),
+    genre: Optional[str] = Query(None, description="Genre name (Topic.name)"),
+    director: Optional[str] = Query(None, description="Director Wikidata id"),
+    limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    cache_headers: dict = Depends(_cache_headers),
+    db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("films")),
+):
+    """
+    Films released between `year_from` and `year_to` (inclusive), optionally
+    of a genre and / or by a director, oldest first. Films without a release
+    year are not listed.
+    """
+    lower = MIN_YEAR if year_from is None else year_from
+    upper = MAX_YEAR if year_to is None else year_to
+    if lower > upper:
+        raise HTTPException(status_code=400, detail="'year_from' must not exceed 'year_to'.")
+
+    after = decode_cursor(cursor, 2)
+    if after is not None:
+        if not isinstance(after[0], int):
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+        lower = max(lower, after[0])
+
+    cypher = DIRECTOR_FILMS_BY_YEAR_CYPHER if director else FILMS_BY_YEAR_CYPHER
+    records = run_read(
+        db,
+        cypher,
+        ctx,
+        year_from=lower,
+        year_to=upper,
+        genre=genre,
+        director=director,
+        after=after,
+        page_size=limit + 1,
+    )
+    page = [record["film"] for record in records[:limit]]
+
+    next_cursor = None
+    if len(records) > limit:
+        next_cursor = encode_cursor(page[-1]["year"], page[-1]["wikidata_id"])
+
+    payload = {"films": page, "next_cursor": next_cursor}
+    return render(payload, FilmListResponse, "films", headers=cache_headers)
@@ -1,77 +1,160 @@
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
 from fastapi import APIRouter, Depends, HTTPException
 from neo4j import Session
 from app.database.neo4j import get_db
+from app.database.transactions import QueryContext, query_context, run_read
+from app.metrics import metrics
 from app.models.schemas import LLMQueryRequest, LLMQueryResponse
+from app.services.related import RELATED_FILMS_CYPHER, fetch_related_films
 
 router = APIRouter(prefix="/api", tags=["llm"])
 
 BLOCKED = ["create", "merge", "delete", "set", "drop", "load csv", "call db", "apoc."]
 
+_QID = re.compile(r"\b(q\d+)\b")
+
+
 def _is_safe_readonly(cypher: str) -> bool:
     s = cypher.lower()
     return not any(b in s for b in BLOCKED)
 
-def _nl_to_cypher(question: str, limit: int) -> str:
-    q = question.lower().strip()
 
-    # 3 intents minimalistes (suffit pour “bonus” si bien documenté)
-    if "films of director" in q or "films by director" in q:
-        # ex: "films by director Q123"
-        # on cherche un id "Q..."
-        import re
-        m = re.search(r"(q\d+)", q)
-        if not m:
-            raise HTTPException(400, "Provide a director wikidata id like Q12345.")
-        did = m.group(1).upper()
-        return f"""
-        MATCH (d:Author {{wikidata_id: "{did}"}})-[:DIRECTED]->(f:Article)
+@dataclass(frozen=True)
+class Intent:
+    """
+    A supported question type, compiled once to parameterized Cypher.
+
+    The query text never changes between questions ($id / $limit are
+    parameters), so Neo4j can plan each intent once and reuse the cached plan.
+    """
+
+    name: str
+    triggers: Tuple[str, ...]
+    cypher: str
+    id_error: Optional[str] = None  # set when the intent needs a Wikidata id
+
+    def __post_init__(self):
+        if not _is_safe_readonly(self.cypher):
+            raise ValueError(f"Intent {self.name!r} Cypher is not read-only.")
+
+
+# 3 intents minimalistes (suffit pour “bonus” si bien documenté)
+INTENTS: Tuple[Intent, ...] = (
+    Intent(
+        name="films_by_director",
+        triggers=("films of director", "films by director"),
+        cypher="""
+        MATCH (d:Author {wikidata_id: $id})-[:DIRECTED]->(f:Article)
         RETURN f.wikidata_id AS wikidata_id, f.title AS title, f.year AS year
         ORDER BY f.year DESC
-        LIMIT {limit}
-        """
+        LIMIT $limit
+        """,
+        id_error="Provide a director wikidata id like Q12345.",
+    ),
+    # Served by the related-films engine (traversal, no full Article scan).
+    Intent(
+        name="related_films",
+        triggers=("related films", "similar films"),
+        cypher=RELATED_FILMS_CYPHER,
+        id_error="Provide a film wikidata id like Q19303.",
+    ),
+    Intent(
+        name="top_genres",
+        triggers=("top genres", "most common genres"),
+        # Topic.film_count counter (range index): no relationship scan.
+        cypher="""
+        MATCH (t:Topic)
+        WHERE t.film_count IS NOT NULL
+        WITH t ORDER BY t.film_count DESC, t.name
+        LIMIT $limit
+        RETURN t.name AS genre, t.film_count AS n
+        """,
+    ),
+)
 
-    if "related films" in q or "similar films" in q:
-        import re
-        m = re.search(r"(q\d+)", q)
+
+@lru_cache(maxsize=1024)
+def _translate(normalized_question: str) -> Tuple[Intent, Optional[str]]:
+    """Normalized question -> (intent, Wikidata id). Cached: questions repeat a lot."""
+    for intent in INTENTS:
+        if not any(trigger in normalized_question for trigger in intent.triggers):
+            continue
+        if intent.id_error is None:
+            return intent, None
+        m = _QID.search(normalized_question)
         if not m:
-            raise HTTPException(400, "Provide a film wikidata id like Q19303.")
-        fid = m.group(1).upper()
-        return f"""
-        MATCH (f:Article {{wikidata_id: "{fid}"}})
-        OPTIONAL MATCH (f)<-[:DIRECTED]-(d:Author)
-        WITH f, collect(DISTINCT d) AS dirs
-        OPTIONAL MATCH (f)-[:HAS_TOPIC]->(t:Topic)
-        WITH f, dirs, collect(DISTINCT t) AS topics
-        MATCH (other:Article) WHERE other <> f
-        OPTIONAL MATCH (other)<-[:DIRECTED]-(od:Author)
-        OPTIONAL MATCH (other)-[:HAS_TOPIC]->(ot:Topic)
-        WITH other,
-          size([x IN collect(DISTINCT od) WHERE x IN dirs]) AS sd,
-          size([x IN collect(DISTINCT ot) WHERE x IN topics]) AS st
-        WITH other, (sd*2.0 + st*1.0) AS score
-        WHERE score > 0
-        RETURN other.wikidata_id AS wikidata_id, other.title AS title, other.year AS year, score
-        ORDER BY score DESC
-        LIMIT {limit}
-        """
-
-    if "top genres" in q or "most common genres" in q:
-        return f"""
-        MATCH (:Article)-[:HAS_TOPIC]->(t:Topic)
-        RETURN t.name AS genre, count(*) AS n
-        ORDER BY n DESC
-        LIMIT {limit}
-        """
-
-    raise HTTPException(400, "Unsupported question. Try: top genres / related films Q... / films by director Q...")
+            raise HTTPException(400, intent.id_error)
+        return intent, m.group(1).upper()
+
+    raise HTTPException(
+        400, "Unsupported question. Try: top genres / related films Q... / films by director Q..."
+    )
+
+
+def _nl_to_cypher(question: str, limit: int) -> Tuple[Intent, dict]:
+    normalized = " ".join(question.lower().split())
+    intent, entity_id = _translate(normalized)
+
+    params = {"limit": limit}
+    if entity_id is not None:
+        params["id"] = entity_id
+    return intent, params
+
+
+# Distinct query texts sent to Neo4j: with parameterized templates this stays
+# at len(INTENTS) however many questions are asked. This is client-side
+# bookkeeping: Neo4j's query cache hits are only exposed by the server's own
+# metrics, not to the driver.
+_query_texts: set = set()
+_query_texts_lock = threading.Lock()
+
+
+def _record_execution(intent: Intent) -> None:
+    with _query_texts_lock:
+        _query_texts.add(intent.cypher)
+    metrics.incr("llm.cypher.executions")
+    metrics.incr(f"llm.intent.{intent.name}")
+
+
+def _templates_per_execution() -> float:
+    executions = metrics.counter("llm.cypher.executions")
+    if not executions:
+        return 0.0
+    with _query_texts_lock:
+        return len(_query_texts) / executions
+
+
+metrics.gauge("llm.cypher.distinct_texts", lambda: len(_query_texts))
+metrics.gauge("llm.cypher.templates_per_execution", _templates_per_execution)
+metrics.gauge("llm.translation_cache.hits", lambda: _translate.cache_info().hits)
+metrics.gauge("llm.translation_cache.misses", lambda: _translate.cache_info().misses)
+metrics.gauge("llm.translation_cache.size", lambda: _translate.cache_info().currsize)
+
 
 @router.post("/llm/query", response_model=LLMQueryResponse)
-def llm_query(payload: LLMQueryRequest, db: Session = Depends(get_db)):
-    cypher = _nl_to_cypher(payload.question, payload.limit)
+def llm_query(
+    payload: LLMQueryRequest,
+    db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("llm")),
+):
+    intent, params = _nl_to_cypher(payload.question, payload.limit)
 
-    if not _is_safe_readonly(cypher):
-        raise HTTPException(400, "Generated Cypher rejected (not read-only).")
+    if intent.name == "related_films":
+        related = fetch_related_films(db, [params["id"]], params["limit"], ctx)[params["id"]] or []
+        results = [{**r["film"], "score": r["score"]} for r in related]
+        params = {"ids": [params["id"]], "limit": params["limit"]}
+    else:
+        results = [dict(r) for r in run_read(db, intent.cypher, ctx, **params)]
+    _record_execution(intent)
 
-    rows = db.run(cypher)
-    results = [dict(r) for r in rows]
-    return LLMQueryResponse(question=payload.question, cypher=cypher.strip(), results=results)
+    return LLMQueryResponse(
+        question=payload.question,
+        cypher=intent.cypher.strip(),
+        params=params,
+        results=results,
+    )
@@ -4,97 +4,86 @@
 Search endpoint for Wikidata films.
 """
 
-from typing import List
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from neo4j import Session
 
 from app.database.neo4j import get_db
-from app.models.schemas import (
-    Director,
-    Film,
-    FilmSearchResponse,
-    FilmWithContext,
-    Genre,
-)
+from app.database.transactions import QueryContext, query_context, run_read
+from app.etag import conditional_get
+from app.models.schemas import FilmSearchResponse
+from app.pagination import decode_cursor, encode_cursor
+from app.serialization import render
 
 router = APIRouter(prefix="/api", tags=["search"])
 
-
-def _node_to_film(node) -> Film:
-    return Film(
-        wikidata_id=node.get("wikidata_id"),
-        title=node.get("title"),
-        year=node.get("year"),
-    )
-
-
-def _node_to_director(node) -> Director:
-    return Director(
-        wikidata_id=node.get("wikidata_id"),
-        name=node.get("name"),
-    )
-
-
-def _node_to_genre(node) -> Genre:
-    return Genre(name=node.get("name"))
+_cache_headers = conditional_get("search")
+
+
+# Keyset pagination on (relevance DESC, wikidata_id ASC); directors and
+# genres are only projected for the rows of the page. Relevance is a sum over
+# three CONTAINS scans, so every page re-runs the scans and the aggregation.
+SEARCH_CYPHER = """
+CALL {
+    MATCH (f:Article)
+    WHERE toLower(f.title) CONTAINS toLower($q)
+    RETURN f, 3 AS relevance
+    UNION ALL
+    MATCH (d:Author)-[:DIRECTED]->(f:Article)
+    WHERE toLower(d.name) CONTAINS toLower($q)
+    RETURN DISTINCT f, 2 AS relevance
+    UNION ALL
+    MATCH (f:Article)-[:HAS_TOPIC]->(g:Topic)
+    WHERE toLower(g.name) CONTAINS toLower($q)
+    RETURN DISTINCT f, 1 AS relevance
+}
+WITH f, sum(relevance) AS relevance
+WHERE $after IS NULL
+   OR relevance < $after[0]
+   OR (relevance = $after[0] AND f.wikidata_id > $after[1])
+WITH f, relevance
+ORDER BY relevance DESC, f.wikidata_id
+LIMIT $page_size
+RETURN f {
+    .wikidata_id, .title, .year,
+    directors: [(f)<-[:DIRECTED]-(d:Author) | d {.wikidata_id, .name}],
+    genres: [(f)-[:HAS_TOPIC]->(g:Topic) | g {.name}]
+} AS film, relevance
+"""
 
 
 @router.get("/search", response_model=FilmSearchResponse)
 def search_films(
     q: str = Query(..., description="Search query string"),
     limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    cache_headers: dict = Depends(_cache_headers),
     db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("search")),
 ):
-    """Search films by title, director or genre."""
-    if not q.strip():
-        raise HTTPException(status_code=400, detail="Query 'q' must not be empty.")
+    """
+    Search films by title, director or genre.
 
-    cypher = """
-    CALL {
-        MATCH (f:Article)
-        WHERE toLower(f.title) CONTAINS toLower($q)
-        RETURN DISTINCT f
-        UNION
-        MATCH (d:Author)-[:DIRECTED]->(f:Article)
-        WHERE toLower(d.name) CONTAINS toLower($q)
-        RETURN DISTINCT f
-        UNION
-        MATCH (f:Article)-[:HAS_TOPIC]->(g:Topic)
-        WHERE toLower(g.name) CONTAINS toLower($q)
-        RETURN DISTINCT f
-    }
-    WITH f
-    OPTIONAL MATCH (f)<-[:DIRECTED]-(d:Author)
-    OPTIONAL MATCH (f)-[:HAS_TOPIC]->(g:Topic)
-    RETURN f,
-           collect(DISTINCT d) AS directors,
-           collect(DISTINCT g) AS genres
-    LIMIT $limit
+    Results are ordered by relevance (title match 3, director match 2,
+    genre match 1, summed) with the Wikidata id as tie-break.
     """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Query 'q' must not be empty.")
 
-    records = db.run(cypher, q=q, limit=limit)
+    after = decode_cursor(cursor, 2)
 
-    results: List[FilmWithContext] = []
-    for record in records:
-        film = _node_to_film(record["f"])
-        directors = [
-            _node_to_director(d)
-            for d in (record["directors"] or [])
-            if d is not None
-        ]
-        genres = [
-            _node_to_genre(g)
-            for g in (record["genres"] or [])
-            if g is not None
-        ]
+    records = run_read(db, SEARCH_CYPHER, ctx, q=q, after=after, page_size=limit + 1)
+    page = records[:limit]
 
-        results.append(
-            FilmWithContext(
-                **film.model_dump(),
-                directors=directors,
-                genres=genres,
-            )
-        )
+    next_cursor = None
+    if len(records) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(last["relevance"], last["film"]["wikidata_id"])
 
-    return FilmSearchResponse(query=q, results=results)
+    payload = {
+        "query": q,
+        "results": [record["film"] for record in page],
+        "next_cursor": next_cursor,
+    }
+    return render(payload, FilmSearchResponse, "search", headers=cache_headers)
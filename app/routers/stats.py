@@ -0,0 +1,154 @@
+# app/routers/stats.py
+
+"""
+Graph statistics endpoint.
+
+Two parts with different costs:
+- totals: one `count()` per label / relationship type, written without
+  any other label or property so Neo4j answers each from its count store
+  (constant time, no scan). Read on every request.
+- distributions and top lists: read from the degree counters kept on the
+  nodes by the importer (film_count, genre_count...); the histograms are a
+  pass over the nodes. Computed once per graph version and kept in the
+  response cache (shared by concurrent misses), so polling `/api/stats`
+  every few seconds costs a count-store lookup.
+"""
+
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends
+from neo4j import Session
+
+from app.cache import response_cache
+from app.database.neo4j import get_db
+from app.database.transactions import QueryContext, query_context, run_read
+from app.graph_version import graph_version
+from app.models.schemas import StatsResponse
+from app.serialization import render
+from app.singleflight import SingleFlight, flight_key
+
+router = APIRouter(prefix="/api", tags=["stats"])
+
+_stats_flight = SingleFlight("stats")
+
+STATS_ROUTE = "/api/stats"
+TOP_LIMIT = 10
+
+# Every subquery is a single-label node count or a single-type relationship
+# count with unlabelled ends: the shapes the count store can answer.
+TOTALS_CYPHER = """
+CALL { MATCH (n) RETURN count(n) AS nodes }
+CALL { MATCH (n:Article) RETURN count(n) AS articles }
+CALL { MATCH (n:Author) RETURN count(n) AS authors }
+CALL { MATCH (n:Topic) RETURN count(n) AS topics }
+CALL { MATCH ()-[r]->() RETURN count(r) AS relationships }
+CALL { MATCH ()-[r:DIRECTED]->() RETURN count(r) AS directed }
+CALL { MATCH ()-[r:HAS_TOPIC]->() RETURN count(r) AS has_topic }
+CALL { MATCH ()-[r:CO_OCCURS_WITH]->() RETURN count(r) AS co_occurs_with }
+RETURN nodes, articles, authors, topics, relationships, directed, has_topic, co_occurs_with
+"""
+
+# Degree histograms from the counters maintained by the importer (live node
+# degree for nodes written before the counters existed).
+DISTRIBUTIONS_CYPHER = """
+CALL {
+    MATCH (d:Author)
+    WITH coalesce(d.film_count, COUNT { (d)-[:DIRECTED]->() }) AS degree
+    RETURN degree, count(*) AS nodes ORDER BY degree
+}
+RETURN "films_per_director" AS name, collect({degree: degree, count: nodes}) AS histogram
+UNION ALL
+CALL {
+    MATCH (f:Article)
+    WITH coalesce(f.director_count, COUNT { (f)<-[:DIRECTED]-() }) AS degree
+    RETURN degree, count(*) AS nodes ORDER BY degree
+}
+RETURN "directors_per_film" AS name, collect({degree: degree, count: nodes}) AS histogram
+UNION ALL
+CALL {
+    MATCH (f:Article)
+    WITH coalesce(f.genre_count, COUNT { (f)-[:HAS_TOPIC]->() }) AS degree
+    RETURN degree, count(*) AS nodes ORDER BY degree
+}
+RETURN "genres_per_film" AS name, collect({degree: degree, count: nodes}) AS histogram
+UNION ALL
+CALL {
+    MATCH (t:Topic)
+    WITH coalesce(t.film_count, COUNT { (t)<-[:HAS_TOPIC]-() }) AS degree
+    RETURN degree, count(*) AS nodes ORDER BY degree
+}
+RETURN "films_per_genre" AS name, collect({degree: degree, count: nodes}) AS histogram
+"""
+
+# Index-ordered scans of the film_count range indexes, stopped at $limit.
+TOP_GENRES_CYPHER = """
+MATCH (t:Topic)
+WHERE t.film_count IS NOT NULL
+WITH t ORDER BY t.film_count DESC, t.name
+LIMIT $limit
+RETURN t {.name} AS genre, t.film_count AS films
+"""
+
+TOP_DIRECTORS_CYPHER = """
+MATCH (d:Author)
+WHERE d.film_count IS NOT NULL
+WITH d ORDER BY d.film_count DESC, d.wikidata_id
+LIMIT $limit
+RETURN d {.wikidata_id, .name} AS director, d.film_count AS films
+"""
+
+
+def _distribution_payload(
+    db: Session, limit: int = TOP_LIMIT, ctx: Optional[QueryContext] = None
+) -> dict:
+    """Degree histograms and top lists (cached per graph version)."""
+    distributions: Dict[str, List[dict]] = {
+        record["name"]: record["histogram"]
+        for record in run_read(db, DISTRIBUTIONS_CYPHER, ctx)
+    }
+    return {
+        "distributions": distributions,
+        "top_genres": [r.data() for r in run_read(db, TOP_GENRES_CYPHER, ctx, limit=limit)],
+        "top_directors": [r.data() for r in run_read(db, TOP_DIRECTORS_CYPHER, ctx, limit=limit)],
+    }
+
+
+response_cache.register_loader(STATS_ROUTE, _distribution_payload)
+
+
+@router.get("/stats", response_model=StatsResponse)
+def get_stats(
+    db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("stats")),
+):
+    """
+    Node / relationship totals (live, from the count store), degree
+    distributions, top genres and top directors (per graph version).
+    """
+    totals = run_read(db, TOTALS_CYPHER, ctx)[0].data()
+
+    params = {"limit": TOP_LIMIT}
+    key = flight_key(STATS_ROUTE, **params)
+    cached = response_cache.get_or_load(
+        STATS_ROUTE,
+        params,
+        lambda: _stats_flight.do(key, lambda: _distribution_payload(db, ctx=ctx, **params)),
+    )
+
+    payload = {
+        "graph_version": graph_version.get(),
+        "nodes": {
+            "total": totals["nodes"],
+            "Article": totals["articles"],
+            "Author": totals["authors"],
+            "Topic": totals["topics"],
+        },
+        "relationships": {
+            "total": totals["relationships"],
+            "DIRECTED": totals["directed"],
+            "HAS_TOPIC": totals["has_topic"],
+            "CO_OCCURS_WITH": totals["co_occurs_with"],
+        },
+        **cached,
+    }
+    return render(payload, StatsResponse, "stats")
@@ -2,42 +2,205 @@
 
 """
 Topic (Genre) graph exploration endpoints.
+
+Hub genres: above TOPIC_HUB_THRESHOLD films (Topic.film_count, default
+5000) the genre graph switches to a bounded plan: only a walk over the
+genre's HAS_TOPIC relationships still grows with the genre, the expansions
+behind it do not:
+- films are read from the Article.year_key index, most recent first, and
+  kept while they have the genre, until the page is full (early limit);
+- related genres are counted on a sample of about TOPIC_HUB_SAMPLE films
+  (default 1000) and scaled up to the genre size; the response is flagged
+  `estimated` with the sample size. The sample keeps one film in `stride`
+  (genre films / sample, rounded up) by Wikidata id number: ids follow
+  creation order, not genres, so it is deterministic (same sample, same
+  ETag) yet spread over the whole genre rather than its store-order prefix.
+  Only the sample is expanded to its other genres.
 """
 
-from typing import List
+import os
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from neo4j import Session
 
+from app.admission import admit, cost_guard
+from app.cache import response_cache
 from app.database.neo4j import get_db
+from app.database.transactions import QueryContext, query_context, run_read
+from app.etag import conditional_get
+from app.metrics import metrics
 from app.models.schemas import (
-    Director,
-    Film,
-    Genre,
+    GenreClusterResponse,
+    GenreClustersResponse,
     GenreGraphResponse,
-    RelatedGenre,
+    GenreTimelineResponse,
+    TopDirectorsResponse,
 )
+from app.pagination import decode_cursor, year_cursor
+from app.serialization import render
+from app.singleflight import SingleFlight, flight_key
 
 router = APIRouter(prefix="/api", tags=["topics"])
 
+_graph_flight = SingleFlight("topic_graph")
 
-def _node_to_genre(node) -> Genre:
-    return Genre(name=node.get("name"))
+_cache_headers = conditional_get("topic_graph")
 
 
-def _node_to_film(node) -> Film:
-    return Film(
-        wikidata_id=node.get("wikidata_id"),
-        title=node.get("title"),
-        year=node.get("year"),
-    )
+# One page of films of the genre, keyset-paginated on (Article.year_key DESC,
+# wikidata_id ASC), and the directors of those films, as map projections.
+# Expands every film of the genre: only used below the hub threshold.
+_PAGE_SUBQUERY = """
+    CALL {
+        WITH t
+        MATCH (f:Article)-[:HAS_TOPIC]->(t)
+        WHERE $after IS NULL
+           OR f.year_key < $after[0]
+           OR (f.year_key = $after[0] AND f.wikidata_id > $after[1])
+        WITH f
+        ORDER BY f.year_key DESC, f.wikidata_id
+        LIMIT $page_size
+        RETURN collect(f) AS page
+    }
+"""
 
+# Hub genres: same ordering, read from the Article.year_key index
+# (= coalesce(year, -1), written by the importer) downwards from the cursor,
+# filtering on the genre of each film: stops as soon as the page is full.
+_HUB_PAGE_SUBQUERY = """
+    CALL {
+        WITH t
+        MATCH (f:Article)
+        USING INDEX f:Article(year_key)
+        WHERE f.year_key <= $max_year_key
+          AND ($after IS NULL OR f.year_key < $after[0] OR f.wikidata_id > $after[1])
+          AND EXISTS { (f)-[:HAS_TOPIC]->(t) }
+        WITH f
+        ORDER BY f.year_key DESC, f.wikidata_id
+        LIMIT $page_size
+        RETURN collect(f) AS page
+    }
+"""
 
-def _node_to_director(node) -> Director:
-    return Director(
-        wikidata_id=node.get("wikidata_id"),
-        name=node.get("name"),
-    )
+_FILMS_SUBQUERY = """
+    WITH t, related_topics, page[0..$limit] AS films, size(page) > $limit AS has_more
+    CALL {
+        WITH films
+        UNWIND films AS f
+        MATCH (d:Author)-[:DIRECTED]->(f)
+        RETURN collect(DISTINCT d {.wikidata_id, .name}) AS directors
+    }
+    RETURN t {.name} AS topic,
+           related_topics,
+           [f IN films | f {.wikidata_id, .title, .year}] AS films,
+           directors,
+           has_more
+"""
+
+
+TOPIC_GRAPH_DEPTH_1_CYPHER = """
+MATCH (t:Topic {name: $name})
+CALL {
+    WITH t
+    MATCH (t)<-[:HAS_TOPIC]-(f2:Article)-[:HAS_TOPIC]->(rt:Topic)
+    WHERE rt <> t
+    WITH rt, count(DISTINCT f2) AS shared_films
+    ORDER BY shared_films DESC, rt.name
+    LIMIT 10
+    RETURN collect({genre: rt {.name}, score: toFloat(shared_films)}) AS related_topics
+}
+""" + _PAGE_SUBQUERY + _FILMS_SUBQUERY
+
+TOPIC_GRAPH_DEPTH_2_CYPHER = """
+MATCH (t:Topic {name: $name})
+CALL {
+    WITH t
+    MATCH (t)<-[:HAS_TOPIC]-(f:Article)-[:HAS_TOPIC]->(rt1:Topic)
+    WHERE rt1 <> t
+    WITH t, rt1, count(DISTINCT f) AS s1
+    ORDER BY s1 DESC, rt1.name
+    LIMIT 10
+    MATCH (rt1)<-[:HAS_TOPIC]-(f2:Article)-[:HAS_TOPIC]->(rt2:Topic)
+    WHERE rt2 <> rt1 AND rt2 <> t
+    WITH rt1, s1, rt2, count(DISTINCT f2) AS s2
+    WITH rt2, max(s1 + s2) AS combined_score
+    ORDER BY combined_score DESC, rt2.name
+    LIMIT 10
+    RETURN collect({genre: rt2 {.name}, score: toFloat(combined_score)}) AS related_topics
+}
+""" + _PAGE_SUBQUERY + _FILMS_SUBQUERY
+
+# Hub variants: every genre expansion keeps the films whose Wikidata id
+# number is a multiple of the stride (at most $sample of them); counts are
+# scaled by the stride.
+HUB_TOPIC_GRAPH_DEPTH_1_CYPHER = """
+MATCH (t:Topic {name: $name})
+CALL {
+    WITH t
+    MATCH (t)<-[:HAS_TOPIC]-(f2:Article)
+    WHERE toInteger(substring(f2.wikidata_id, 1)) % $stride = 0
+    WITH t, f2
+    LIMIT $sample
+    MATCH (f2)-[:HAS_TOPIC]->(rt:Topic)
+    WHERE rt <> t
+    WITH rt, count(DISTINCT f2) AS sampled
+    ORDER BY sampled DESC, rt.name
+    LIMIT 10
+    RETURN collect({genre: rt {.name}, score: round(sampled * $stride)}) AS related_topics
+}
+""" + _HUB_PAGE_SUBQUERY + _FILMS_SUBQUERY
+
+HUB_TOPIC_GRAPH_DEPTH_2_CYPHER = """
+MATCH (t:Topic {name: $name})
+CALL {
+    WITH t
+    MATCH (t)<-[:HAS_TOPIC]-(f:Article)
+    WHERE toInteger(substring(f.wikidata_id, 1)) % $stride = 0
+    WITH t, f
+    LIMIT $sample
+    MATCH (f)-[:HAS_TOPIC]->(rt1:Topic)
+    WHERE rt1 <> t
+    WITH t, rt1, count(DISTINCT f) * $stride AS s1
+    ORDER BY s1 DESC, rt1.name
+    LIMIT 10
+    CALL {
+        WITH t, rt1
+        WITH t, rt1, CASE
+            WHEN coalesce(rt1.film_count, 0) > $sample
+            THEN toInteger(ceil(rt1.film_count / toFloat($sample)))
+            ELSE 1
+        END AS stride2
+        MATCH (rt1)<-[:HAS_TOPIC]-(f2:Article)
+        WHERE stride2 = 1 OR toInteger(substring(f2.wikidata_id, 1)) % stride2 = 0
+        WITH t, rt1, stride2, f2
+        LIMIT $sample
+        MATCH (f2)-[:HAS_TOPIC]->(rt2:Topic)
+        WHERE rt2 <> rt1 AND rt2 <> t
+        WITH rt2, stride2, count(DISTINCT f2) AS sampled
+        RETURN rt2, sampled * stride2 AS s2
+    }
+    WITH rt2, max(s1 + s2) AS combined_score
+    ORDER BY combined_score DESC, rt2.name
+    LIMIT 10
+    RETURN collect({genre: rt2 {.name}, score: round(combined_score)}) AS related_topics
+}
+""" + _HUB_PAGE_SUBQUERY + _FILMS_SUBQUERY
+
+TOPIC_FILM_COUNT_CYPHER = "MATCH (t:Topic {name: $name}) RETURN t.film_count AS films"
+
+TOPIC_GRAPH_ROUTE = "/api/topics/{topic_name}/graph"
+
+# Upper bound of Article.year_key for the first page of the hub plan.
+MAX_YEAR_KEY = 10_000
+
+
+def hub_threshold() -> int:
+    return int(os.getenv("TOPIC_HUB_THRESHOLD", "5000"))
+
+
+def hub_sample_size() -> int:
+    return int(os.getenv("TOPIC_HUB_SAMPLE", "1000"))
 
 
 def _run_topic_graph_query(
@@ -45,106 +208,235 @@ def _run_topic_graph_query(
     topic_name: str,
     depth: int,
     limit: int,
-):
-    """Run the Cypher query to retrieve the genre subgraph."""
-    cypher_depth_1 = """
-    MATCH (t:Topic {name: $name})
-
-    OPTIONAL MATCH (f:Article)-[:HAS_TOPIC]->(t)
-    WITH t, collect(DISTINCT f)[0..$limit] AS films
-
-    UNWIND films AS f
-    OPTIONAL MATCH (d:Author)-[:DIRECTED]->(f)
-    WITH t, films, collect(DISTINCT d) AS directors
-
-    OPTIONAL MATCH (f2:Article)-[:HAS_TOPIC]->(t)
-    OPTIONAL MATCH (f2)-[:HAS_TOPIC]->(rt:Topic)
-    WHERE rt.name <> t.name
-    WITH t, films, directors, rt, count(DISTINCT f2) AS shared_films
-    ORDER BY shared_films DESC
-    WITH t, films, directors,
-         collect(
-           CASE
-             WHEN rt IS NULL THEN NULL
-             ELSE { genre: rt, score: shared_films }
-           END
-         )[0..10] AS related_raw
-    RETURN t, films, directors, related_raw
-    """
+    after: Optional[list] = None,
+    ctx: Optional[QueryContext] = None,
+) -> Optional[dict]:
+    """Run the Cypher query to retrieve the genre subgraph (None if unknown genre)."""
+    counted = run_read(db, TOPIC_FILM_COUNT_CYPHER, ctx, name=topic_name)
+    if not counted:
+        return None
+    films = counted[0]["films"]
+    params = {"name": topic_name, "after": after, "limit": limit, "page_size": limit + 1}
 
-    cypher_depth_2 = """
-    MATCH (t:Topic {name: $name})
+    sample = hub_sample_size()
+    hub = films is not None and films > hub_threshold() and films > sample
+    if hub:
+        cypher = HUB_TOPIC_GRAPH_DEPTH_2_CYPHER if depth == 2 else HUB_TOPIC_GRAPH_DEPTH_1_CYPHER
+        params.update(
+            sample=sample,
+            stride=-(-films // sample),
+            max_year_key=after[0] if after else MAX_YEAR_KEY,
+        )
+        metrics.incr("topic_graph.hub_plans")
+    else:
+        cypher = TOPIC_GRAPH_DEPTH_2_CYPHER if depth == 2 else TOPIC_GRAPH_DEPTH_1_CYPHER
+
+    cost_guard("topic_graph", db, cypher, params)
+    records = run_read(db, cypher, ctx, **params)
+    if not records:
+        return None
+    payload = records[0].data()
+    payload["estimated"] = hub
+    payload["sampled_films"] = sample if hub else None
+    return payload
+
+
+def _topic_graph_payload(
+    db: Session,
+    topic_name: str,
+    depth: int,
+    limit: int,
+    cursor: Optional[str],
+    ctx: Optional[QueryContext] = None,
+) -> Optional[dict]:
+    """Response payload of the genre subgraph (None if unknown genre)."""
+    after = decode_cursor(cursor, 2)
+    payload = _run_topic_graph_query(db, topic_name, depth, limit, after, ctx)
+    if payload is None:
+        return None
+
+    has_more = payload.pop("has_more")
+    payload["next_cursor"] = year_cursor(payload["films"][-1]) if has_more else None
+    return payload
 
-    OPTIONAL MATCH (f:Article)-[:HAS_TOPIC]->(t)
-    OPTIONAL MATCH (f)-[:HAS_TOPIC]->(rt1:Topic)
-    WHERE rt1.name <> t.name
-    WITH t, rt1, count(DISTINCT f) AS s1
-    ORDER BY s1 DESC
-    WITH t, collect({rt: rt1, score: s1})[0..10] AS rt1s
-
-    UNWIND rt1s AS x
-    WITH t, x.rt AS rt1, x.score AS s1
-    OPTIONAL MATCH (f2:Article)-[:HAS_TOPIC]->(rt1)
-    OPTIONAL MATCH (f2)-[:HAS_TOPIC]->(rt2:Topic)
-    WHERE rt2.name <> rt1.name AND rt2.name <> t.name
-    WITH t, rt2, (s1 + count(DISTINCT f2)) AS combined_score
-    ORDER BY combined_score DESC
-    WITH t, collect({genre: rt2, score: combined_score})[0..10] AS related_raw
-
-    OPTIONAL MATCH (film:Article)-[:HAS_TOPIC]->(t)
-    WITH t, related_raw, collect(DISTINCT film)[0..$limit] AS films
-    UNWIND films AS f
-    OPTIONAL MATCH (d:Author)-[:DIRECTED]->(f)
-    WITH t, related_raw, films, collect(DISTINCT d) AS directors
-    RETURN t, films, directors, related_raw
-    """
 
-    cypher = cypher_depth_2 if depth == 2 else cypher_depth_1
-    return db.run(cypher, name=topic_name, limit=limit).single()
+response_cache.register_loader(TOPIC_GRAPH_ROUTE, _topic_graph_payload)
 
 
 @router.get(
     "/topics/{topic_name}/graph",
     response_model=GenreGraphResponse,
+    # Listed before admission so a 304 never takes a slot; resolved once per
+    # request (FastAPI caches it) and handed to the handler below.
+    dependencies=[Depends(_cache_headers), Depends(admit("topic_graph"))],
 )
 def get_topic_graph(
     topic_name: str = Path(..., description="Genre name (Topic.name)"),
     depth: int = Query(1, ge=1, le=2),
     limit: int = Query(25, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    cache_headers: dict = Depends(_cache_headers),
     db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("topic_graph")),
 ):
     """
     Explore a genre-centered subgraph:
-    - films
-    - directors
-    - related genres
+    - films (most recent first, paginated with `cursor`)
+    - directors of the films of the page
+    - related genres (scores estimated from a sample for very large genres,
+      see `estimated`)
     """
-    topic_rec = db.run(
-        "MATCH (t:Topic {name: $name}) RETURN t LIMIT 1",
-        name=topic_name,
-    ).single()
+    decode_cursor(cursor, 2)  # 400 on a malformed cursor, before any lookup
 
-    if topic_rec is None:
+    # Cached per graph version; identical concurrent misses share one execution.
+    params = {"topic_name": topic_name, "depth": depth, "limit": limit, "cursor": cursor}
+    key = flight_key(TOPIC_GRAPH_ROUTE, **params)
+    ctx.cancellable = lambda: not _graph_flight.waiting(key)
+    payload = response_cache.get_or_load(
+        TOPIC_GRAPH_ROUTE,
+        params,
+        lambda: _graph_flight.do(key, lambda: _topic_graph_payload(db, ctx=ctx, **params)),
+    )
+    if payload is None:
         raise HTTPException(status_code=404, detail="Topic (genre) not found.")
 
-    record = _run_topic_graph_query(db, topic_name, depth, limit)
-
-    films = [_node_to_film(f) for f in (record["films"] or []) if f]
-    directors = [_node_to_director(d) for d in (record["directors"] or []) if d]
-
-    related_topics: List[RelatedGenre] = []
-    for item in record["related_raw"] or []:
-        if item and item.get("genre"):
-            related_topics.append(
-                RelatedGenre(
-                    genre=_node_to_genre(item["genre"]),
-                    score=float(item.get("score", 0)),
-                )
-            )
-
-    return GenreGraphResponse(
-        topic=_node_to_genre(topic_rec["t"]),
-        related_topics=related_topics,
-        films=films,
-        directors=directors,
-    )
+    return render(payload, GenreGraphResponse, "topics", headers=cache_headers)
+
+
+# Communities are precomputed on Topic (community, modularity) by the
+# genre_cooccurrence job (app/jobs/communities.py): no traversal here.
+CLUSTERS_CYPHER = """
+MATCH (t:Topic)
+WHERE t.community IS NOT NULL
+WITH t ORDER BY t.modularity DESC, t.name
+WITH t.community AS community,
+     count(t) AS size,
+     sum(t.modularity) AS modularity,
+     collect(t {.name}) AS members
+WHERE size >= $min_size
+RETURN community, size, modularity, members[0..$genres] AS genres
+ORDER BY community
+LIMIT $limit
+"""
+
+CLUSTER_CYPHER = """
+MATCH (t:Topic {name: $name})
+CALL {
+    WITH t
+    MATCH (m:Topic {community: t.community})
+    WITH m ORDER BY m.modularity DESC, m.name
+    RETURN count(m) AS size,
+           sum(m.modularity) AS modularity,
+           collect(m {.name})[0..$genres] AS genres
+}
+RETURN t {.name} AS topic, t.community AS community, size, modularity, genres
+"""
+
+
+@router.get("/topics/clusters", response_model=GenreClustersResponse)
+def get_topic_clusters(
+    min_size: int = Query(2, ge=1, description="Hide communities smaller than this"),
+    limit: int = Query(50, ge=1, le=500, description="Max number of communities"),
+    genres: int = Query(10, ge=1, le=100, description="Max genres listed per community"),
+    db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("topic_clusters")),
+):
+    """
+    Genre communities detected on the co-occurrence graph (Louvain), largest
+    first, with their most central genres. Recomputed after each import.
+    """
+    records = run_read(db, CLUSTERS_CYPHER, ctx, min_size=min_size, limit=limit, genres=genres)
+    payload = {"clusters": [record.data() for record in records]}
+    return render(payload, GenreClustersResponse, "topics")
+
+
+@router.get("/topics/{topic_name}/cluster", response_model=GenreClusterResponse)
+def get_topic_cluster(
+    topic_name: str = Path(..., description="Genre name (Topic.name)"),
+    genres: int = Query(50, ge=1, le=500, description="Max genres listed"),
+    db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("topic_clusters")),
+):
+    """The community of a genre and its members, most central first."""
+    records = run_read(db, CLUSTER_CYPHER, ctx, name=topic_name, genres=genres)
+    if not records:
+        raise HTTPException(status_code=404, detail="Topic (genre) not found.")
+
+    record = records[0].data()
+    if record["community"] is None:
+        raise HTTPException(status_code=503, detail="Genre communities not computed yet.")
+
+    topic = record.pop("topic")
+    return render({"topic": topic, "cluster": record}, GenreClusterResponse, "topics")
+
+
+# Author.pagerank is precomputed by the director_centrality job
+# (app/jobs/centrality.py), Author.film_count maintained by the importer.
+# Authors are read in pagerank index order and filtered until `limit`
+# directors of the genre are found: no aggregation.
+TOP_DIRECTORS_CYPHER = """
+MATCH (t:Topic {name: $name})
+CALL {
+    WITH t
+    MATCH (d:Author)
+    WHERE d.pagerank IS NOT NULL
+      AND EXISTS { (d)-[:DIRECTED]->(:Article)-[:HAS_TOPIC]->(t) }
+    WITH d
+    ORDER BY d.pagerank DESC
+    LIMIT $limit
+    RETURN collect({
+        director: d {.wikidata_id, .name},
+        pagerank: d.pagerank,
+        films: d.film_count,
+        genre_films: COUNT { (d)-[:DIRECTED]->(:Article)-[:HAS_TOPIC]->(t) }
+    }) AS directors
+}
+RETURN t {.name} AS topic, directors
+"""
+
+
+@router.get("/topics/{topic_name}/top-directors", response_model=TopDirectorsResponse)
+def get_topic_top_directors(
+    topic_name: str = Path(..., description="Genre name (Topic.name)"),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("top_directors")),
+):
+    """
+    Most influential directors of a genre, by weighted PageRank over the
+    director - film - genre graph (recomputed after each import; empty until
+    the first run).
+    """
+    records = run_read(db, TOP_DIRECTORS_CYPHER, ctx, name=topic_name, limit=limit)
+    if not records:
+        raise HTTPException(status_code=404, detail="Topic (genre) not found.")
+
+    return render(records[0].data(), TopDirectorsResponse, "topics")
+
+
+# Decade histogram precomputed on the Topic by the timelines job
+# (app/jobs/timelines.py); timeline_undated is null until its first run.
+TOPIC_TIMELINE_CYPHER = """
+MATCH (t:Topic {name: $name})
+RETURN t {.name} AS topic,
+       [i IN range(0, size(coalesce(t.timeline_decades, [])) - 1) |
+        {decade: t.timeline_decades[i], films: t.timeline_counts[i]}] AS decades,
+       t.timeline_undated AS undated
+"""
+
+
+@router.get("/topics/{topic_name}/timeline", response_model=GenreTimelineResponse)
+def get_topic_timeline(
+    topic_name: str = Path(..., description="Genre name (Topic.name)"),
+    db: Session = Depends(get_db),
+    ctx: QueryContext = Depends(query_context("timelines")),
+):
+    """Films of a genre per decade (recomputed after each import)."""
+    records = run_read(db, TOPIC_TIMELINE_CYPHER, ctx, name=topic_name)
+    if not records:
+        raise HTTPException(status_code=404, detail="Topic (genre) not found.")
+
+    payload = records[0].data()
+    if payload["undated"] is None:
+        raise HTTPException(status_code=503, detail="Genre timelines not computed yet.")
+    return render(payload, GenreTimelineResponse, "topics")
@@ -0,0 +1,305 @@
+# app/scheduler.py
+
+"""
+In-process background job scheduler.
+
+Jobs are registered once (see app/jobs/) and started with the application
+lifespan. A job runs:
+- every `interval` seconds, and/or
+- whenever the graph version changes (`on_graph_change`), i.e. after an
+  import or a seed.
+
+Single run across workers: before running, a worker takes a lease on a
+(:JobLock {name}) node in Neo4j (owner + expiry, so a crashed worker never
+blocks a job forever). Workers that do not get the lease skip that run. For
+graph-change jobs the lease node also records the last version processed,
+so a restart does not rebuild what another worker already built.
+
+Execution: light jobs (mostly Cypher, waiting on Neo4j) run in the
+threadpool; `heavy` jobs (CPU-bound Python) run in a spawn-based process pool
+so they never hold the GIL against request threads. Heavy job functions must
+be importable module-level callables.
+
+Configuration: SCHEDULER_ENABLED (default 1), SCHEDULER_TICK_SECONDS
+(default 5), SCHEDULER_PROCESSES (default 1).
+
+Metrics: scheduler.<job> timing, scheduler.<job>.runs / .errors /
+.skipped_locked counters.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.database.neo4j import get_driver
+from app.graph_version import graph_version
+from app.metrics import metrics
+
+
+@dataclass
+class Job:
+    """A registered job and its run state."""
+
+    name: str
+    fn: Callable[[], Any]
+    interval: Optional[float] = None
+    on_graph_change: bool = False
+    heavy: bool = False
+    lease_seconds: float = 600.0
+
+    running: bool = field(default=False, init=False)
+    requested: bool = field(default=False, init=False)
+    runs: int = field(default=0, init=False)
+    last_started_at: Optional[float] = field(default=None, init=False)
+    last_finished_at: Optional[float] = field(default=None, init=False)
+    last_duration_seconds: Optional[float] = field(default=None, init=False)
+    last_status: Optional[str] = field(default=None, init=False)
+    last_error: Optional[str] = field(default=None, init=False)
+    last_result: Any = field(default=None, init=False)
+    last_graph_version: Optional[int] = field(default=None, init=False)
+    next_run_at: Optional[float] = field(default=None, init=False)
+
+    def __post_init__(self):
+        if self.interval is None and not self.on_graph_change:
+            raise ValueError(f"Job {self.name!r} needs an interval or on_graph_change.")
+
+    def is_due(self, now: float, version: Optional[int]) -> bool:
+        if self.running:
+            return False
+        if self.requested:
+            return True
+        if self.on_graph_change and version is not None and version != self.last_graph_version:
+            return True
+        return self.interval is not None and (self.next_run_at is None or now >= self.next_run_at)
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "interval_seconds": self.interval,
+            "on_graph_change": self.on_graph_change,
+            "heavy": self.heavy,
+            "running": self.running,
+            "runs": self.runs,
+            "last_started_at": self.last_started_at,
+            "last_finished_at": self.last_finished_at,
+            "last_duration_seconds": self.last_duration_seconds,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "last_graph_version": self.last_graph_version,
+            "last_result": self.last_result,
+            "next_run_at": self.next_run_at,
+        }
+
+
+class Neo4jLease:
+    """Expiring per-job lock stored on (:JobLock {name}) nodes."""
+
+    def __init__(self):
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def acquire(self, name: str, seconds: float) -> Optional[dict]:
+        """Take the lease; returns the lock state ({last_version}) or None if held."""
+        # The first SET takes the node's write lock before the owner is read:
+        # workers ticking at the same moment queue on it and each sees the
+        # owner committed by the previous one (a plain WHERE ... SET is a
+        # check-then-act under read committed, both could see owner IS NULL).
+        cypher = """
+        MERGE (l:JobLock {name: $name})
+        SET l._lock = true
+        WITH l, (l.owner IS NULL OR l.owner = $owner OR l.expires_at < datetime()) AS free
+        SET l.owner = CASE WHEN free THEN $owner ELSE l.owner END,
+            l.expires_at = CASE
+                WHEN free THEN datetime() + duration({milliseconds: $ms})
+                ELSE l.expires_at
+            END
+        REMOVE l._lock
+        RETURN free, l.last_version AS last_version
+        """
+        with get_driver().session() as session:
+            record = session.run(
+                cypher, name=name, owner=self.owner, ms=int(seconds * 1000)
+            ).single()
+        return {"last_version": record["last_version"]} if record["free"] else None
+
+    def release(self, name: str, version: Optional[int] = None) -> None:
+        cypher = """
+        MATCH (l:JobLock {name: $name, owner: $owner})
+        SET l.owner = null,
+            l.expires_at = null,
+            l.last_version = coalesce($version, l.last_version)
+        """
+        with get_driver().session() as session:
+            session.run(cypher, name=name, owner=self.owner, version=version).consume()
+
+
+class Scheduler:
+    """Runs registered jobs from an asyncio task started by the app lifespan."""
+
+    def __init__(self, lease=None, tick_seconds: float = 5.0, processes: int = 1):
+        self.lease = lease if lease is not None else Neo4jLease()
+        self.tick_seconds = tick_seconds
+        self.processes = processes
+        self._jobs: Dict[str, Job] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running: set = set()
+
+    @classmethod
+    def from_env(cls) -> "Scheduler":
+        return cls(
+            tick_seconds=float(os.getenv("SCHEDULER_TICK_SECONDS", "5")),
+            processes=int(os.getenv("SCHEDULER_PROCESSES", "1")),
+        )
+
+    # -------------------------
+    # Registration
+    # -------------------------
+    def register(self, job: Job) -> Job:
+        if job.name in self._jobs:
+            raise ValueError(f"Job {job.name!r} is already registered.")
+        self._jobs[job.name] = job
+        return job
+
+    def job(self, name: str) -> Optional[Job]:
+        return self._jobs.get(name)
+
+    def jobs(self) -> List[Job]:
+        return list(self._jobs.values())
+
+    def request_run(self, name: str) -> bool:
+        """Run `name` at the next tick (False if unknown)."""
+        job = self._jobs.get(name)
+        if job is None:
+            return False
+        job.requested = True
+        return True
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._running):
+            task.cancel()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception:  # pylint: disable=broad-except
+                metrics.incr("scheduler.tick_errors")
+            await asyncio.sleep(self.tick_seconds)
+
+    async def tick(self) -> List[asyncio.Task]:
+        """Start every due job; returns the started tasks."""
+        version = await run_in_threadpool(graph_version.get)
+        now = time.time()
+        started = []
+        for job in self._jobs.values():
+            if job.is_due(now, version):
+                job.running = True
+                task = asyncio.create_task(self._execute(job, version))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+                started.append(task)
+        return started
+
+    # -------------------------
+    # Execution
+    # -------------------------
+    def _process_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: a fork would copy the driver's sockets and the event loop
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def _run_fn(self, job: Job) -> Any:
+        if job.heavy:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._process_pool(), job.fn)
+        return await run_in_threadpool(job.fn)
+
+    async def _execute(self, job: Job, version: Optional[int]) -> None:
+        forced, job.requested = job.requested, False
+        try:
+            state = await run_in_threadpool(self.lease.acquire, job.name, job.lease_seconds)
+            if state is None:
+                job.last_status = "skipped_locked"
+                metrics.incr(f"scheduler.{job.name}.skipped_locked")
+                return
+
+            already_done = (
+                job.on_graph_change
+                and not forced
+                and version is not None
+                and state.get("last_version") == version
+                and job.interval is None
+            )
+            succeeded = False
+            try:
+                if already_done:
+                    job.last_status = "up_to_date"
+                else:
+                    await self._run_once(job)
+                succeeded = True
+            finally:
+                done_version = version if job.on_graph_change and succeeded else None
+                await run_in_threadpool(self.lease.release, job.name, done_version)
+        except Exception as exc:  # pylint: disable=broad-except
+            job.last_status = "error"
+            job.last_error = repr(exc)
+            metrics.incr(f"scheduler.{job.name}.errors")
+        finally:
+            # Failed graph-change runs are not retried until the next version
+            # (or a manual run): a broken job must not loop every tick.
+            job.last_graph_version = version
+            job.running = False
+            if job.interval is not None:
+                job.next_run_at = time.time() + job.interval
+
+    async def _run_once(self, job: Job) -> None:
+        job.last_started_at = time.time()
+        start = time.perf_counter()
+        try:
+            job.last_result = await self._run_fn(job)
+        finally:
+            job.last_duration_seconds = time.perf_counter() - start
+            job.last_finished_at = time.time()
+            metrics.observe(f"scheduler.{job.name}", job.last_duration_seconds)
+        job.runs += 1
+        job.last_status = "ok"
+        job.last_error = None
+        metrics.incr(f"scheduler.{job.name}.runs")
+
+
+scheduler = Scheduler.from_env()
+
+
+def scheduler_enabled() -> bool:
+    return os.getenv("SCHEDULER_ENABLED", "1").strip().lower() not in ("0", "false", "no", "")
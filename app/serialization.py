@@ -0,0 +1,68 @@
+# app/serialization.py
+
+"""
+Response rendering for router payloads.
+
+Routers build plain dict payloads straight from Cypher map projections, already
+shaped like the response schemas. Two ways to put them on the wire:
+
+- fast path: encode the dict with orjson (stdlib json if orjson is missing)
+  and return the bytes as is, skipping Pydantic entirely;
+- validated path: run the dict through the response model once, then dump it.
+
+Both return a Response object, so FastAPI does not validate/serialize again.
+
+FAST_JSON_ROUTES selects the routes using the fast path: comma separated route
+names (e.g. "search,topics"), "*" for all routes (default) or "" for none.
+"""
+
+import json
+import os
+from typing import Any, Mapping, Optional, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson, without any model validation."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_path_enabled(route: str) -> bool:
+    setting = os.getenv("FAST_JSON_ROUTES", "*").strip()
+    if setting == "*":
+        return True
+    return route in {name.strip() for name in setting.split(",") if name.strip()}
+
+
+def render(
+    payload: dict,
+    model: Type[BaseModel],
+    route: str,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Render a schema-shaped payload through the fast or validated path."""
+    if fast_path_enabled(route):
+        return FastJSONResponse(payload, headers=headers)
+    return Response(
+        model.model_validate(payload).model_dump_json(),
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,51 @@
+# app/services/centrality.py
+
+"""
+Weighted PageRank on an undirected graph given as integer edge arrays.
+
+Power iteration with numpy (`bincount` as the sparse matrix product), so a
+graph of a few million edges ranks in seconds without a graph library.
+Every undirected edge is followed both ways; a node spreads its rank over
+its edges in proportion to their weight, and isolated nodes (no edges)
+redistribute theirs uniformly.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def pagerank(
+    size: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    damping: float = 0.85,
+    tolerance: float = 1e-8,
+    max_iterations: int = 200,
+) -> Tuple[np.ndarray, int]:
+    """
+    PageRank of nodes 0..size-1 (sums to 1) and the number of iterations run.
+
+    `sources[i] - targets[i]` is an undirected edge of weight `weights[i]`.
+    """
+    if size == 0:
+        return np.zeros(0), 0
+    src = np.concatenate([sources, targets]).astype(np.int64)
+    dst = np.concatenate([targets, sources]).astype(np.int64)
+    weight = np.concatenate([weights, weights]).astype(np.float64)
+
+    out_weight = np.bincount(src, weights=weight, minlength=size)
+    dangling = out_weight == 0
+    share = weight / np.where(out_weight == 0, 1.0, out_weight)[src]
+
+    rank = np.full(size, 1.0 / size)
+    for iteration in range(1, max_iterations + 1):
+        spread = np.bincount(dst, weights=rank[src] * share, minlength=size)
+        leaked = rank[dangling].sum()
+        updated = (1.0 - damping) / size + damping * (spread + leaked / size)
+        delta = np.abs(updated - rank).sum()
+        rank = updated
+        if delta < tolerance:
+            break
+    return rank, iteration
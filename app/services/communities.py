@@ -0,0 +1,142 @@
+# app/services/communities.py
+
+"""
+Louvain community detection on a small weighted undirected graph.
+
+Used for genre communities over the CO_OCCURS_WITH edges (a few thousand
+Topic nodes at most): plain Python, deterministic (nodes are visited in
+sorted order, ties keep the current community), so the same graph always
+gets the same communities and ids.
+
+Modularity of a partition, with m the total edge weight, k_i the weighted
+degree of node i and d_c the total degree of community c:
+
+    Q = sum_c [ L_c / m - resolution * (d_c / 2m)^2 ]
+
+split per node as q_i = w_i,c / 2m - resolution * k_i * d_c / (2m)^2, where
+w_i,c is the weight from i to the other members of its community (so the q_i
+of a community sum to its term of Q).
+"""
+
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+Edge = Tuple[Hashable, Hashable, float]
+
+
+def _adjacency(nodes: Iterable[Hashable], edges: Iterable[Edge]) -> Dict:
+    """Symmetric weighted adjacency; parallel edges keep the largest weight."""
+    adjacency: Dict[Hashable, Dict[Hashable, float]] = {node: {} for node in nodes}
+    for u, v, weight in edges:
+        if u == v or weight <= 0:
+            continue
+        adjacency.setdefault(u, {})
+        adjacency.setdefault(v, {})
+        weight = max(weight, adjacency[u].get(v, 0.0))
+        adjacency[u][v] = adjacency[v][u] = float(weight)
+    return adjacency
+
+
+def _local_moves(adjacency: Dict, resolution: float) -> Dict[Hashable, Hashable]:
+    """Phase 1: move nodes to the neighbouring community with the best gain."""
+    community = {node: node for node in adjacency}
+    degree = {node: sum(adjacency[node].values()) for node in adjacency}
+    total = dict(degree)  # community -> sum of member degrees
+    two_m = sum(degree.values())
+    if two_m == 0:
+        return community
+
+    order = sorted(adjacency, key=repr)
+    moved = True
+    while moved:
+        moved = False
+        for node in order:
+            current = community[node]
+            links: Dict[Hashable, float] = defaultdict(float)
+            for neighbour, weight in adjacency[node].items():
+                if neighbour != node:
+                    links[community[neighbour]] += weight
+
+            total[current] -= degree[node]
+            k = degree[node]
+
+            def gain(target, k=k, links=links):
+                return links.get(target, 0.0) - resolution * total[target] * k / two_m
+
+            best, best_gain = current, gain(current)
+            for target in sorted(links, key=repr):
+                target_gain = gain(target)
+                if target_gain > best_gain + 1e-12:
+                    best, best_gain = target, target_gain
+
+            total[best] += k
+            if best != current:
+                community[node] = best
+                moved = True
+    return community
+
+
+def _aggregate(adjacency: Dict, community: Dict) -> Dict:
+    """Phase 2: one node per community, edge weights summed (self-loops kept)."""
+    aggregated: Dict[Hashable, Dict[Hashable, float]] = {c: {} for c in set(community.values())}
+    for u, neighbours in adjacency.items():
+        for v, weight in neighbours.items():
+            cu, cv = community[u], community[v]
+            aggregated[cu][cv] = aggregated[cu].get(cv, 0.0) + weight
+    return aggregated
+
+
+def louvain(
+    nodes: Iterable[Hashable],
+    edges: Iterable[Edge],
+    resolution: float = 1.0,
+    max_levels: int = 10,
+) -> Dict[Hashable, int]:
+    """
+    Community id of every node (isolated nodes get their own community).
+
+    Ids are 0..n-1, by community size descending then smallest member, so
+    they are stable for a given graph.
+    """
+    adjacency = _adjacency(nodes, edges)
+    membership = {node: node for node in adjacency}
+
+    level_graph = adjacency
+    for _ in range(max_levels):
+        community = _local_moves(level_graph, resolution)
+        if len(set(community.values())) == len(level_graph):
+            break
+        membership = {node: community[c] for node, c in membership.items()}
+        level_graph = _aggregate(level_graph, community)
+
+    groups: Dict[Hashable, List[Hashable]] = defaultdict(list)
+    for node, c in membership.items():
+        groups[c].append(node)
+    ordered = sorted(groups.values(), key=lambda members: (-len(members), min(map(repr, members))))
+    return {node: index for index, members in enumerate(ordered) for node in members}
+
+
+def modularity_contributions(
+    edges: Iterable[Edge],
+    communities: Dict[Hashable, int],
+    resolution: float = 1.0,
+) -> Dict[Hashable, float]:
+    """Per-node share q_i of the modularity (see module docstring)."""
+    adjacency = _adjacency(communities, edges)
+    degree = {node: sum(neighbours.values()) for node, neighbours in adjacency.items()}
+    two_m = sum(degree.values())
+    if two_m == 0:
+        return {node: 0.0 for node in communities}
+
+    community_degree: Dict[int, float] = defaultdict(float)
+    for node, k in degree.items():
+        community_degree[communities[node]] += k
+
+    contributions = {}
+    for node, neighbours in adjacency.items():
+        c = communities[node]
+        inside = sum(w for other, w in neighbours.items() if communities[other] == c)
+        contributions[node] = (
+            inside / two_m - resolution * degree[node] * community_degree[c] / two_m**2
+        )
+    return contributions
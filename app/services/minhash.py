@@ -0,0 +1,205 @@
+# app/services/minhash.py
+
+"""
+MinHash signatures and LSH banding for approximate Jaccard similarity.
+
+A set is summarized by `bands * rows` minimum hash values; the fraction of
+equal positions between two signatures estimates the Jaccard similarity of
+the sets. Signatures are cut into `bands` bands of `rows` values, each band
+hashed into a bucket: two sets become candidates when at least one band is
+identical, which happens with probability 1 - (1 - J ** rows) ** bands.
+
+More bands (or fewer rows) raise recall at the cost of more candidates to
+score; the S-curve crosses 1/2 around J = (1 / bands) ** (1 / rows).
+Only candidates are scored, so the top-K of every set is built in roughly
+linear time instead of comparing all pairs.
+"""
+
+import hashlib
+import random
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+_SHIFT = np.uint64(32)
+
+
+def token_hash(token: str) -> int:
+    """Stable 32-bit hash of a token (independent of PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def multiset_tokens(values: Iterable[str], prefix: str) -> List[str]:
+    """A multiset as a set: the n-th occurrence of `value` becomes `prefix:value#n`."""
+    seen: Counter = Counter()
+    tokens = []
+    for value in values:
+        seen[value] += 1
+        tokens.append(f"{prefix}:{value}#{seen[value]}")
+    return tokens
+
+
+def jaccard(a: Set, b: Set) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+class MinHasher:
+    """`bands * rows` multiply-shift hash functions, seeded for reproducible signatures."""
+
+    def __init__(self, bands: int, rows: int, seed: int = 1):
+        if bands < 1 or rows < 1:
+            raise ValueError("bands and rows must be >= 1.")
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.default_rng(seed)
+        size = bands * rows
+        # h(x) = ((a * x + b) mod 2^64) >> 32, a odd: uint64 arithmetic wraps.
+        self._a = rng.integers(0, 2**64, size=size, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**64, size=size, dtype=np.uint64)
+
+    @property
+    def num_perm(self) -> int:
+        return self.bands * self.rows
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        hashes = np.fromiter((token_hash(t) for t in set(tokens)), dtype=np.uint64)
+        if not hashes.size:
+            raise ValueError("Cannot sign an empty set.")
+        values = (hashes[:, None] * self._a + self._b) >> _SHIFT
+        return values.min(axis=0).astype(np.uint32)
+
+
+class LSHIndex:
+    """Signatures bucketed by band; candidates are the keys sharing at least one bucket."""
+
+    def __init__(self, hasher: MinHasher, max_bucket: int = 1000):
+        self.hasher = hasher
+        # Buckets larger than this are ignored when collecting candidates, so a
+        # handful of near-identical profiles cannot make the build quadratic.
+        self.max_bucket = max_bucket
+        self._keys: List[Hashable] = []
+        self._signatures: List[np.ndarray] = []
+        self._buckets: Dict[tuple, List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: Hashable, tokens: Iterable[str]) -> None:
+        signature = self.hasher.signature(tokens)
+        index = len(self._keys)
+        self._keys.append(key)
+        self._signatures.append(signature)
+        rows = self.hasher.rows
+        for band in range(self.hasher.bands):
+            chunk = signature[band * rows : (band + 1) * rows].tobytes()
+            self._buckets[(band, chunk)].append(index)
+
+    def oversized_buckets(self) -> int:
+        return sum(1 for members in self._buckets.values() if len(members) > self.max_bucket)
+
+    def _candidate_lists(self) -> List[Set[int]]:
+        candidates: List[Set[int]] = [set() for _ in self._keys]
+        for members in self._buckets.values():
+            if len(members) < 2 or len(members) > self.max_bucket:
+                continue
+            for index in members:
+                candidates[index].update(members)
+        for index, found in enumerate(candidates):
+            found.discard(index)
+        return candidates
+
+    def all_top_k(
+        self,
+        k: int,
+        min_score: float = 0.0,
+        sets: Optional[Dict[Hashable, Set[str]]] = None,
+    ) -> Dict[Hashable, List[Tuple[Hashable, float]]]:
+        """
+        Approximate top-`k` neighbours of every key.
+
+        Candidates are scored by the signature estimate, or by exact Jaccard
+        when the original `sets` are given (LSH then only bounds the pairs
+        compared). Returns `{key: [(other, score), ...]}` sorted by score
+        descending, keeping scores >= `min_score` (keys without candidates
+        are omitted).
+        """
+        if not self._keys:
+            return {}
+        signatures = np.stack(self._signatures)
+        results = {}
+        for index, found in enumerate(self._candidate_lists()):
+            if not found:
+                continue
+            others = np.fromiter(found, dtype=np.int64, count=len(found))
+            if sets is None:
+                scores = (signatures[others] == signatures[index]).mean(axis=1)
+            else:
+                target = sets[self._keys[index]]
+                scores = np.array([jaccard(target, sets[self._keys[i]]) for i in others])
+            order = np.lexsort((others, -scores))[:k]
+            top = [
+                (self._keys[others[i]], float(scores[i]))
+                for i in order
+                if scores[i] >= min_score
+            ]
+            if top:
+                results[self._keys[index]] = top
+        return results
+
+
+def exact_top_k(
+    sets: Dict[Hashable, Set[str]], key: Hashable, k: int, min_score: float = 0.0
+) -> List[Tuple[Hashable, float]]:
+    """Exact top-`k` of `key` by Jaccard (scores >= `min_score`), by brute force."""
+    target = sets[key]
+    scores = [
+        (other, score)
+        for other, tokens in sets.items()
+        if other != key and not target.isdisjoint(tokens)
+        for score in (jaccard(target, tokens),)
+        if score > 0 and score >= min_score
+    ]
+    scores.sort(key=lambda item: (-item[1], str(item[0])))
+    return scores[:k]
+
+
+def evaluate(
+    sets: Dict[Hashable, Set[str]],
+    approximate: Dict[Hashable, List[Tuple[Hashable, float]]],
+    k: int,
+    sample_size: int,
+    min_score: float = 0.0,
+    seed: int = 1,
+) -> dict:
+    """
+    Accuracy of `approximate` against exact Jaccard on a random sample of keys.
+
+    - recall_at_k: share of the exact top-k found (ties at the k-th score
+      count as found whichever of them was returned);
+    - mean_abs_error: |estimated - exact| Jaccard over the returned pairs.
+    """
+    keys: Sequence[Hashable] = sorted(sets, key=str)
+    sample = random.Random(seed).sample(keys, min(sample_size, len(keys)))
+    hits = expected = 0
+    errors: List[float] = []
+    for key in sample:
+        exact = exact_top_k(sets, key, k, min_score)
+        if not exact:
+            continue
+        threshold = exact[-1][1]
+        found = approximate.get(key, [])
+        returned = {other for other, _ in found}
+        relevant = {other for other, score in exact if score > threshold}
+        relevant |= {
+            other for other in returned if jaccard(sets[key], sets[other]) == threshold
+        }
+        hits += min(len(returned & relevant), len(exact))
+        expected += len(exact)
+        errors.extend(abs(score - jaccard(sets[key], sets[other])) for other, score in found)
+    return {
+        "sampled": len(sample),
+        "recall_at_k": round(hits / expected, 4) if expected else None,
+        "mean_abs_error": round(sum(errors) / len(errors), 4) if errors else None,
+    }
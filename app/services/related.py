@@ -0,0 +1,82 @@
+# app/services/related.py
+
+"""
+Related-films engine.
+
+Candidates are reached by traversal from each seed film instead of scanning
+every Article:
+- films sharing a director (+2 per shared director),
+- films sharing a genre (+1 per shared genre),
+- films released within 3 years (year bonus, Article.year range index seek).
+
+Scores are the same as the original per-film query:
+    score = shared_directors * 2 + shared_genres + year_bonus (0.5 if |dy| <= 1,
+    0.2 if |dy| <= 3), keeping films with score > 0.
+
+The query is UNWIND-driven: any number of seed films is scored in one round
+trip, and unknown ids come back with `found = false`.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+from neo4j import Session
+
+from app.database.transactions import QueryContext, run_read
+
+RELATED_FILMS_CYPHER = """
+UNWIND $ids AS id
+OPTIONAL MATCH (f:Article {wikidata_id: id})
+CALL {
+    WITH f
+    WITH f
+    WHERE f IS NOT NULL
+    CALL {
+        WITH f
+        MATCH (f)<-[:DIRECTED]-(:Author)-[:DIRECTED]->(other:Article)
+        RETURN other, 2.0 AS weight
+        UNION ALL
+        WITH f
+        MATCH (f)-[:HAS_TOPIC]->(:Topic)<-[:HAS_TOPIC]-(other:Article)
+        RETURN other, 1.0 AS weight
+        UNION ALL
+        WITH f
+        MATCH (other:Article)
+        WHERE other.year >= f.year - 3 AND other.year <= f.year + 3
+        RETURN other, 0.0 AS weight
+    }
+    WITH f, other, sum(weight) AS base_score
+    WHERE other <> f
+    WITH other,
+         base_score + CASE
+             WHEN abs(other.year - f.year) <= 1 THEN 0.5
+             WHEN abs(other.year - f.year) <= 3 THEN 0.2
+             ELSE 0.0
+         END AS score
+    WHERE score > 0
+    ORDER BY score DESC, other.year DESC
+    LIMIT $limit
+    RETURN collect({film: other {.wikidata_id, .title, .year}, score: score}) AS related
+}
+RETURN id, f IS NOT NULL AS found, related
+"""
+
+
+def fetch_related_films(
+    db: Session,
+    film_ids: Sequence[str],
+    limit: int,
+    ctx: Optional[QueryContext] = None,
+) -> Dict[str, Optional[List[dict]]]:
+    """
+    Top-`limit` related films for every id, in one round trip.
+
+    Returns `{film_id: [{"film": {...}, "score": float}, ...]}` in input order
+    (duplicates removed); unknown films map to None.
+    """
+    ids = list(dict.fromkeys(film_ids))
+    results: Dict[str, Optional[List[dict]]] = {film_id: None for film_id in ids}
+
+    for record in run_read(db, RELATED_FILMS_CYPHER, ctx, ids=ids, limit=limit):
+        results[record["id"]] = record["related"] if record["found"] else None
+
+    return results
@@ -0,0 +1,105 @@
+# app/singleflight.py
+
+"""
+Request coalescing (single-flight).
+
+Concurrent calls with the same key share one execution: the first caller
+(the leader) runs the function, the others wait for its result (or its
+exception). Nothing is kept once the call completes, so this protects Neo4j
+from thundering herds without ever serving stale data.
+
+Two flavours share the counters:
+- `do()` for sync handlers running in the threadpool,
+- `do_async()` for coroutines on the event loop: the execution is a task of
+  its own that every caller awaits through `asyncio.shield`, so cancelling
+  any caller (the first one included) never cancels it for the others.
+
+Results are shared between requests: callers must treat them as read-only.
+
+Metrics: `singleflight.<name>.executions` and `singleflight.<name>.coalesced`.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from app.metrics import metrics
+
+T = TypeVar("T")
+
+
+def flight_key(route: str, **params: Any) -> Tuple[Hashable, ...]:
+    """Normalized key: route template + params sorted by name."""
+    return (route,) + tuple(sorted(params.items()))
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent executions per key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    def waiting(self, key: Hashable) -> int:
+        """Number of callers currently waiting on the in-flight sync call for `key`."""
+        with self._lock:
+            call = self._calls.get(key)
+            return call.waiters if call is not None else 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            metrics.incr(f"singleflight.{self.name}.coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        metrics.incr(f"singleflight.{self.name}.executions")
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            metrics.incr(f"singleflight.{self.name}.executions")
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            metrics.incr(f"singleflight.{self.name}.coalesced")
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Retrieved here so an error nobody is left waiting for is not logged as lost.
+        if not task.cancelled():
+            task.exception()
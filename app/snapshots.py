@@ -0,0 +1,235 @@
+# app/snapshots.py
+
+"""
+On-disk snapshots of in-process structures, for fast restarts.
+
+A snapshot file holds named binary sections and a header tagged with the
+graph version the data was built from:
+
+    KGSNAP01 | u32 header length | JSON header | section bytes...
+
+    header = {"name", "graph_version", "created_at",
+              "sections": {section: [offset, length]}}
+
+Files are written to a temporary name then renamed (readers never see a
+partial file), and read through mmap so opening a snapshot only parses the
+header. This is a pickle-on-disk warm start: the only registered structure
+(the response cache, app/cache.py) is one pickled section, unpickled into
+ordinary objects by every process that restores it. Nothing is shared
+between processes through the file; under gunicorn the master restores the
+snapshot before forking and workers inherit the objects copy-on-write.
+
+Structures take part by registering a `Snapshottable` (dump / restore
+callables). At startup `restore_all(version)` loads every snapshot whose
+graph version matches; a missing, corrupt or stale file just means the
+structure is rebuilt the usual way. `save_all(version)` runs on shutdown.
+
+Configuration: SNAPSHOT_DIR (default var/snapshots), SNAPSHOTS_ENABLED
+(default 1).
+
+Metrics: snapshots.<name>.save / .restore timings, snapshots.<name>.stale /
+.missing / .errors counters.
+"""
+
+import json
+import mmap
+import os
+import pickle
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.metrics import metrics
+
+MAGIC = b"KGSNAP01"
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def snapshot_dir() -> Path:
+    return Path(os.getenv("SNAPSHOT_DIR", "var/snapshots"))
+
+
+def snapshots_enabled() -> bool:
+    return os.getenv("SNAPSHOTS_ENABLED", "1").strip().lower() not in ("0", "false", "no", "")
+
+
+def snapshot_path(name: str, directory: Optional[Path] = None) -> Path:
+    return (directory or snapshot_dir()) / f"{name}.snap"
+
+
+def pickled(value: Any) -> bytes:
+    """Section bytes for an arbitrary Python value (see `Snapshot.load`)."""
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def write_snapshot(
+    name: str,
+    graph_version: int,
+    sections: Dict[str, bytes],
+    directory: Optional[Path] = None,
+) -> Path:
+    """Atomically write `sections` as the snapshot `name` of `graph_version`."""
+    path = snapshot_path(name, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    layout, offset = {}, 0
+    for section, data in sections.items():
+        layout[section] = [offset, len(data)]
+        offset += len(data)
+    header = json.dumps(
+        {
+            "name": name,
+            "graph_version": graph_version,
+            "created_at": time.time(),
+            "sections": layout,
+        }
+    ).encode("utf-8")
+
+    tmp = path.with_suffix(f".tmp{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        for data in sections.values():
+            f.write(data)
+    tmp.replace(path)
+    return path
+
+
+class Snapshot:
+    """A memory-mapped snapshot file (read-only)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "rb")  # pylint: disable=consider-using-with
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._map[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a snapshot file.")
+            start = len(MAGIC) + _HEADER_LENGTH.size
+            (header_length,) = _HEADER_LENGTH.unpack_from(self._map, len(MAGIC))
+            self.header = json.loads(self._map[start : start + header_length])
+            self._data_offset = start + header_length
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def graph_version(self) -> int:
+        return self.header["graph_version"]
+
+    @property
+    def sections(self) -> List[str]:
+        return list(self.header["sections"])
+
+    def section(self, name: str) -> memoryview:
+        """Bytes of a section, as a view of the mapping (valid until `close`)."""
+        offset, length = self.header["sections"][name]
+        start = self._data_offset + offset
+        if start + length > len(self._map):
+            raise ValueError(f"{self.path} is truncated.")
+        return memoryview(self._map)[start : start + length]
+
+    def load(self, name: str) -> Any:
+        """Unpickle a section written with `pickled`."""
+        with self.section(name) as view:
+            return pickle.loads(view)
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Views still exported: the map is released with its last view.
+                pass
+        self._file.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_snapshot(
+    name: str,
+    graph_version: int,
+    directory: Optional[Path] = None,
+) -> Optional[Snapshot]:
+    """The snapshot `name` if it exists and was built for `graph_version`, else None."""
+    path = snapshot_path(name, directory)
+    if not path.exists():
+        metrics.incr(f"snapshots.{name}.missing")
+        return None
+    try:
+        snapshot = Snapshot(path)
+    except (OSError, ValueError):
+        metrics.incr(f"snapshots.{name}.errors")
+        return None
+    if snapshot.graph_version != graph_version:
+        metrics.incr(f"snapshots.{name}.stale")
+        snapshot.close()
+        return None
+    return snapshot
+
+
+@dataclass
+class Snapshottable:
+    """A structure that can be saved to / restored from a snapshot."""
+
+    name: str
+    dump: Callable[[int], Optional[Dict[str, bytes]]]  # version -> sections (None: skip)
+    restore: Callable[[Snapshot], Any]
+
+
+_registry: Dict[str, Snapshottable] = {}
+
+# name -> graph version restored in this process (or inherited from the
+# gunicorn master, see gunicorn.conf.py): restoring twice is skipped.
+_restored: Dict[str, int] = {}
+
+
+def register(snapshottable: Snapshottable) -> None:
+    _registry[snapshottable.name] = snapshottable
+
+
+def save_all(graph_version: Optional[int], directory: Optional[Path] = None) -> List[str]:
+    """Snapshot every registered structure for `graph_version`; returns the names saved."""
+    saved = []
+    if graph_version is None:
+        return saved
+    for item in _registry.values():
+        try:
+            with metrics.timer(f"snapshots.{item.name}.save"):
+                sections = item.dump(graph_version)
+                if sections is None:
+                    continue
+                write_snapshot(item.name, graph_version, sections, directory)
+            saved.append(item.name)
+        except Exception:  # pylint: disable=broad-except
+            metrics.incr(f"snapshots.{item.name}.errors")
+    return saved
+
+
+def restore_all(graph_version: Optional[int], directory: Optional[Path] = None) -> List[str]:
+    """Restore every registered structure with a matching snapshot; returns the names restored."""
+    restored = []
+    if graph_version is None:
+        return restored
+    for item in _registry.values():
+        if _restored.get(item.name) == graph_version:
+            restored.append(item.name)
+            continue
+        snapshot = open_snapshot(item.name, graph_version, directory)
+        if snapshot is None:
+            continue
+        try:
+            with metrics.timer(f"snapshots.{item.name}.restore"), snapshot:
+                item.restore(snapshot)
+            _restored[item.name] = graph_version
+            restored.append(item.name)
+        except Exception:  # pylint: disable=broad-except
+            metrics.incr(f"snapshots.{item.name}.errors")
+    return restored
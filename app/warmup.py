@@ -0,0 +1,191 @@
+# app/warmup.py
+
+"""
+Startup warm-up and readiness.
+
+Run once by the application lifespan, in the background so /health answers
+right away:
+1. create the driver and wait until Neo4j is reachable (verify_connectivity),
+2. pre-plan every router query with EXPLAIN and representative parameters
+   (planned and cached by Neo4j, never executed),
+3. restore the in-process structures snapshotted on the last shutdown when
+   the graph version did not change (see app/snapshots.py),
+4. replay the most frequent requests of the previous run (see app/cache.py)
+   into the response cache, for the keys still missing.
+
+GET /ready answers 503 until these steps are done, then 200: load
+balancers route traffic on /ready, container liveness stays on /health.
+
+Configuration: WARMUP_ENABLED (default 1; when 0 the app is ready as soon
+as it starts), WARMUP_HOT_KEYS (max replayed keys, default 200).
+
+Metrics: warmup.connect / warmup.plan / warmup.snapshots / warmup.hot_keys timings,
+warmup.plan_errors / warmup.hot_key_errors counters, warmup.ready gauge.
+"""
+
+import os
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from app.cache import hot_keys_path, load_hot_keys, response_cache
+from app.database.neo4j import get_driver
+from app.database.transactions import QueryContext
+from app.graph_version import GRAPH_VERSION_CYPHER, graph_version
+from app.metrics import metrics
+from app.routers.authors import CONTRIBUTIONS_CYPHER, DIRECTOR_TIMELINE_CYPHER, SIMILAR_CYPHER
+from app.routers.films import DIRECTOR_FILMS_BY_YEAR_CYPHER, FILMS_BY_YEAR_CYPHER
+from app.routers.llm import INTENTS
+from app.routers.search import SEARCH_CYPHER
+from app.routers.stats import DISTRIBUTIONS_CYPHER, TOTALS_CYPHER
+from app.routers.topics import (
+    CLUSTER_CYPHER,
+    CLUSTERS_CYPHER,
+    HUB_TOPIC_GRAPH_DEPTH_1_CYPHER,
+    HUB_TOPIC_GRAPH_DEPTH_2_CYPHER,
+    MAX_YEAR_KEY,
+    TOPIC_FILM_COUNT_CYPHER,
+    TOPIC_TIMELINE_CYPHER,
+    TOPIC_GRAPH_DEPTH_1_CYPHER,
+    TOPIC_GRAPH_DEPTH_2_CYPHER,
+    TOP_DIRECTORS_CYPHER,
+)
+from app.services.related import RELATED_FILMS_CYPHER
+from app.singleflight import flight_key
+from app.snapshots import restore_all, snapshots_enabled
+
+CONNECT_RETRY_SECONDS = 2.0
+
+
+def planned_queries() -> List[Tuple[str, str, dict]]:
+    """(name, cypher, representative params) of every query served by the routers."""
+    page = {"after": None, "limit": 10, "page_size": 11}
+    films = {
+        "year_from": 1990, "year_to": 2000, "genre": "drama", "director": "Q1",
+        "after": None, "page_size": 11,
+    }
+    hub = {**page, "sample": 1000, "scale": 1.0, "max_year_key": MAX_YEAR_KEY}
+    queries = [
+        ("health", "RETURN 1 AS ok", {}),
+        ("graph_version", GRAPH_VERSION_CYPHER, {}),
+        ("search", SEARCH_CYPHER, {"q": "a", "after": None, "page_size": 11}),
+        ("authors", CONTRIBUTIONS_CYPHER, {"id": "Q1", **page}),
+        ("similar_directors", SIMILAR_CYPHER, {"id": "Q1", "limit": 10}),
+        ("director_timeline", DIRECTOR_TIMELINE_CYPHER, {"id": "Q1"}),
+        ("films", FILMS_BY_YEAR_CYPHER, films),
+        ("director_films", DIRECTOR_FILMS_BY_YEAR_CYPHER, films),
+        ("related", RELATED_FILMS_CYPHER, {"ids": ["Q1"], "limit": 10}),
+        ("topic_graph_1", TOPIC_GRAPH_DEPTH_1_CYPHER, {"name": "drama", **page}),
+        ("topic_graph_2", TOPIC_GRAPH_DEPTH_2_CYPHER, {"name": "drama", **page}),
+        ("topic_film_count", TOPIC_FILM_COUNT_CYPHER, {"name": "drama"}),
+        ("hub_topic_graph_1", HUB_TOPIC_GRAPH_DEPTH_1_CYPHER, {"name": "drama", **hub}),
+        ("hub_topic_graph_2", HUB_TOPIC_GRAPH_DEPTH_2_CYPHER, {"name": "drama", **hub}),
+        ("topic_timeline", TOPIC_TIMELINE_CYPHER, {"name": "drama"}),
+        ("topic_clusters", CLUSTERS_CYPHER, {"min_size": 2, "limit": 50, "genres": 10}),
+        ("topic_cluster", CLUSTER_CYPHER, {"name": "drama", "genres": 50}),
+        ("top_directors", TOP_DIRECTORS_CYPHER, {"name": "drama", "limit": 10}),
+        ("stats_totals", TOTALS_CYPHER, {}),
+        ("stats_distributions", DISTRIBUTIONS_CYPHER, {}),
+    ]
+    for intent in INTENTS:
+        params = {"id": "Q1", "ids": ["Q1"], "limit": 10}
+        queries.append((f"llm.{intent.name}", intent.cypher, params))
+    return queries
+
+
+class Warmup:
+    """Readiness state and the warm-up steps."""
+
+    def __init__(self):
+        self._ready = threading.Event()
+        self._stopping = threading.Event()
+        self.steps: dict = {}
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def mark_ready(self) -> None:
+        self._ready.set()
+
+    def stop(self) -> None:
+        """Abort a warm-up still waiting for Neo4j (application shutdown)."""
+        self._stopping.set()
+
+    def connect(self, max_wait: Optional[float] = None) -> bool:
+        """
+        Create the driver and block until Neo4j answers.
+
+        False if `max_wait` elapsed or the application is stopping.
+        """
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        with metrics.timer("warmup.connect"):
+            while True:
+                try:
+                    get_driver().verify_connectivity()
+                    return True
+                except Exception:  # pylint: disable=broad-except
+                    if deadline is not None and time.monotonic() >= deadline:
+                        return False
+                    if self._stopping.wait(CONNECT_RETRY_SECONDS):
+                        return False
+
+    def plan_queries(self) -> int:
+        """EXPLAIN every router query so its plan is cached; returns the number planned."""
+        planned = 0
+        with metrics.timer("warmup.plan"), get_driver().session() as session:
+            for name, cypher, params in planned_queries():
+                try:
+                    session.run("EXPLAIN " + cypher, **params).consume()
+                    planned += 1
+                except Exception:  # pylint: disable=broad-except
+                    metrics.incr("warmup.plan_errors")
+                    self.steps.setdefault("plan_errors", []).append(name)
+        return planned
+
+    def load_hot_keys(self, limit: int) -> int:
+        """Replay the most frequent requests of the last run into the response cache."""
+        version = graph_version.get()
+        if version is None:
+            return 0
+
+        loaded = 0
+        with metrics.timer("warmup.hot_keys"), get_driver().session() as session:
+            for entry in load_hot_keys(hot_keys_path())[:limit]:
+                loader = response_cache.loader(entry.get("route"))
+                if loader is None:
+                    continue
+                params = entry.get("params") or {}
+                key = flight_key(entry["route"], **params)
+                if response_cache.contains(key, version):
+                    continue  # restored from the snapshot
+                ctx = QueryContext("warmup")
+                try:
+                    payload = loader(session, ctx=ctx, **params)
+                except Exception:  # pylint: disable=broad-except
+                    metrics.incr("warmup.hot_key_errors")
+                    continue
+                response_cache.put(key, version, payload)
+                loaded += 1
+        return loaded
+
+    def run(self) -> None:
+        """All steps, then flip readiness (blocking: run it in a thread)."""
+        start = time.perf_counter()
+        if not self.connect():
+            return
+        self.steps["planned_queries"] = self.plan_queries()
+        if snapshots_enabled():
+            with metrics.timer("warmup.snapshots"):
+                self.steps["snapshots"] = restore_all(graph_version.get())
+        self.steps["hot_keys"] = self.load_hot_keys(int(os.getenv("WARMUP_HOT_KEYS", "200")))
+        self.steps["seconds"] = round(time.perf_counter() - start, 3)
+        self.mark_ready()
+
+
+def warmup_enabled() -> bool:
+    return os.getenv("WARMUP_ENABLED", "1").strip().lower() not in ("0", "false", "no", "")
+
+
+warmup = Warmup()
+metrics.gauge("warmup.ready", lambda: 1.0 if warmup.ready else 0.0)
@@ -0,0 +1,462 @@
+# benchmarks/bench_import.py
+
+"""
+Ingestion benchmark: import strategies and derived-structure builds vs size.
+
+Replays a fixed dataset (deterministic synthetic films, or a `--replay` file
+written by `import_wikidata.py --save`) at several scale factors through each
+import strategy:
+
+  per_row    one write transaction per row (IMPORT_CYPHER)
+  batched    IMPORT_BATCH_SIZE rows per transaction (import_wikidata default)
+  pipelined  scripts/import_pipeline.py, fed by an in-process SPARQL server
+             serving the dataset (partitioned / paged like Wikidata)
+  bulk_csv   scripts/bulk_csv.py CSV generation; the neo4j-admin load itself
+             only with --bulk-load (the database must be stopped)
+
+Every (strategy, scale) run happens in its own process on an empty graph,
+so peak RSS is per run. The Neo4j strategies go through the importer entry
+points (`import_rows`, `import_pipelined`), schema setup included, so they
+measure what `import_wikidata.py` runs. After the Neo4j strategies of a scale, the derived
+builds (co-occurrence, communities, centrality, similar directors,
+timelines) are timed on the imported graph.
+
+The report (JSON, same layout for every run, `--compare` prints the ratio
+to an older one) records rows/sec, transactions, peak RSS and the time per
+stage. Pipeline stage times are busy time summed over the stage threads.
+
+The Neo4j strategies delete the whole graph of NEO4J_URI between runs:
+they refuse to start on a non-empty graph without --wipe.
+
+Usage:
+    python -m benchmarks.bench_import --scales 1 4 16 --wipe
+    python -m benchmarks.bench_import --strategies bulk_csv --scales 1 10 100
+    python -m benchmarks.bench_import --replay rows.jsonl --compare var/bench/old.json --wipe
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import resource
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from bulk_csv import write_bulk_csv  # noqa: E402
+from import_pipeline import year_partitions  # noqa: E402
+from import_wikidata import (  # noqa: E402
+    get_driver,
+    import_pipelined,
+    import_rows,
+    read_replay,
+)
+
+STRATEGIES = ["per_row", "batched", "pipelined", "bulk_csv"]
+DB_STRATEGIES = {"per_row", "batched", "pipelined"}
+BASE_FILMS = 1000
+ENTITY = "http://www.wikidata.org/entity/"
+
+
+# ---------------------------------------------------------------- datasets
+
+
+def synthetic_rows(films: int, seed: int = 7) -> List[dict]:
+    """
+    Deterministic import rows: 1-2 directors per film from a pool of
+    films/5, 0-3 genres out of 60 with a skewed (Zipf-like) popularity,
+    years 1920-2024 (5% unknown). One row per film x director x genre.
+    """
+    rng = random.Random(seed)
+    genres = [f"genre {i:02d}" for i in range(60)]
+    genre_weights = [1.0 / (rank + 1) for rank in range(len(genres))]
+    directors = max(1, films // 5)
+    rows = []
+    for i in range(films):
+        film_id = f"Q{1_000_000 + i}"
+        year = None if rng.random() < 0.05 else rng.randint(1920, 2024)
+        film_directors = rng.sample(range(directors), k=min(directors, rng.choice([1, 1, 1, 2])))
+        film_genres = sorted(set(rng.choices(genres, genre_weights, k=rng.randint(0, 3))))
+        for d in film_directors:
+            for genre in film_genres or [None]:
+                rows.append(
+                    {
+                        "film_id": film_id,
+                        "film_title": f"Film {i}",
+                        "year": year,
+                        "director_id": f"Q{2_000_000 + d}",
+                        "director_name": f"Director {d}",
+                        "genre_name": genre,
+                    }
+                )
+    return rows
+
+
+def scaled(rows: List[dict], factor: int) -> List[dict]:
+    """`factor` copies of a replayed dataset, with distinct film / director ids."""
+    if factor == 1:
+        return list(rows)
+    out = []
+    for copy in range(factor):
+        suffix = "" if copy == 0 else f"-{copy}"
+        for row in rows:
+            out.append(
+                {
+                    **row,
+                    "film_id": row["film_id"] + suffix,
+                    "director_id": row["director_id"] + suffix,
+                }
+            )
+    return out
+
+
+def dataset(scale: int, replay: Optional[str]) -> List[dict]:
+    if replay:
+        return scaled(list(read_replay(replay)), scale)
+    return synthetic_rows(BASE_FILMS * scale)
+
+
+def _binding(row: dict) -> dict:
+    """Import row -> SPARQL binding (inverse of import_wikidata.to_params)."""
+    binding = {
+        "film": {"value": ENTITY + row["film_id"]},
+        "filmLabel": {"value": row["film_title"]},
+        "director": {"value": ENTITY + row["director_id"]},
+        "directorLabel": {"value": row["director_name"]},
+    }
+    if row["year"] is not None:
+        binding["pubDate"] = {"value": f"{row['year']:04d}-01-01T00:00:00Z"}
+    if row["genre_name"] is not None:
+        binding["genreLabel"] = {"value": row["genre_name"]}
+    return binding
+
+
+def _sparql_server(rows: List[dict]) -> ThreadingHTTPServer:
+    """Serves `rows` to the pipeline queries (year partition filters, paging)."""
+    by_year: Dict[Optional[int], List[dict]] = {}
+    for row in rows:
+        by_year.setdefault(row["year"], []).append(_binding(row))
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            query = parse_qs(urlparse(self.path).query)["query"][0]
+            if "FILTER NOT EXISTS" in query:
+                selected = by_year.get(None, [])
+            else:
+                low = re.search(r"YEAR\(\?pubDate\) >= (\d+)", query)
+                high = re.search(r"YEAR\(\?pubDate\) < (\d+)", query)
+                selected = [
+                    binding
+                    for year in sorted(y for y in by_year if y is not None)
+                    if (not low or year >= int(low.group(1)))
+                    and (not high or year < int(high.group(1)))
+                    for binding in by_year[year]
+                ]
+            limit = int(re.search(r"LIMIT (\d+)", query).group(1))
+            offset = int(re.search(r"OFFSET (\d+)", query).group(1))
+            body = json.dumps({"results": {"bindings": selected[offset:offset + limit]}})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/sparql-results+json")
+            self.end_headers()
+            self.wfile.write(body.encode("utf-8"))
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------------------------------------------------------- strategies
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _reset_graph(driver) -> None:
+    """Delete every node; the schema is left to the import entry points."""
+    with driver.session() as session:
+        session.run(
+            "MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS"
+        ).consume()
+
+
+def _run_transactional(rows: List[dict], batch_size: int, stages: dict) -> int:
+    driver = get_driver()
+    started = time.perf_counter()
+    _reset_graph(driver)
+    stages["reset"] = time.perf_counter() - started
+
+    # Same entry point as `import_wikidata.py` (schema, counters, version included).
+    started = time.perf_counter()
+    _imported, transactions, _version = import_rows(driver, rows, batch_size)
+    stages["write"] = time.perf_counter() - started
+    driver.close()
+    return transactions
+
+
+def _run_pipelined(rows: List[dict], options: dict, stages: dict, extra: dict) -> int:
+    driver = get_driver()
+    started = time.perf_counter()
+    _reset_graph(driver)
+    stages["reset"] = time.perf_counter() - started
+
+    # Same entry point as `import_wikidata.py --pipeline`.
+    server = _sparql_server(rows)
+    try:
+        stats, _version = import_pipelined(
+            driver,
+            year_partitions(1920, 2030, 5),
+            f"http://127.0.0.1:{server.server_address[1]}/sparql",
+            fetchers=options["fetchers"],
+            writers=options["writers"],
+            batch_size=options["batch_size"],
+        )
+    finally:
+        server.shutdown()
+    driver.close()
+
+    stages.update({f"{stage}_busy": seconds for stage, seconds in stats.stage_seconds.items()})
+    stages["pipeline_wall"] = stats.wall_seconds
+    extra.update(
+        pages=stats.pages,
+        write_retries=stats.write_retries,
+        duplicates=stats.duplicates,
+    )
+    return stats.transactions
+
+
+def _run_bulk_csv(rows: List[dict], options: dict, stages: dict, extra: dict) -> int:
+    out_dir = options["bulk_dir"] or tempfile.mkdtemp(prefix="bench-bulk-")
+    started = time.perf_counter()
+    manifest = write_bulk_csv(rows, out_dir, 1, options["chunk_size"])
+    stages["sort_and_csv"] = time.perf_counter() - started
+    extra.update(
+        spilled_runs=manifest["counts"]["spilled_runs"],
+        csv_bytes=sum(f.stat().st_size for f in Path(out_dir).glob("*.csv")),
+        command=manifest["command"],
+    )
+    if options["bulk_load"]:
+        started = time.perf_counter()
+        subprocess.run(shlex.split(manifest["command"]), check=True)
+        stages["admin_import"] = time.perf_counter() - started
+    return 0
+
+
+def run_strategy(strategy: str, scale: int, options: dict) -> dict:
+    """One import of the dataset at `scale` with `strategy` (run in a child process)."""
+    stages: Dict[str, float] = {}
+    extra: dict = {}
+
+    started = time.perf_counter()
+    rows = dataset(scale, options["replay"])
+    stages["load_dataset"] = time.perf_counter() - started
+
+    if strategy == "per_row" and len(rows) > options["max_per_row"]:
+        return {"strategy": strategy, "scale": scale, "rows": len(rows), "skipped": True}
+
+    started = time.perf_counter()
+    if strategy == "per_row":
+        transactions = _run_transactional(rows, 1, stages)
+    elif strategy == "batched":
+        transactions = _run_transactional(rows, options["batch_size"], stages)
+    elif strategy == "pipelined":
+        transactions = _run_pipelined(rows, options, stages, extra)
+    elif strategy == "bulk_csv":
+        transactions = _run_bulk_csv(rows, options, stages, extra)
+    else:
+        raise ValueError(f"unknown strategy {strategy!r}")
+    seconds = time.perf_counter() - started
+    import_seconds = seconds - stages.get("reset", 0.0)
+
+    return {
+        "strategy": strategy,
+        "scale": scale,
+        "rows": len(rows),
+        "films": len({row["film_id"] for row in rows}),
+        "seconds": round(import_seconds, 3),
+        "rows_per_sec": round(len(rows) / import_seconds, 1) if import_seconds else None,
+        "transactions": transactions,
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": {name: round(value, 3) for name, value in stages.items()},
+        **({"extra": extra} if extra else {}),
+    }
+
+
+def run_derived_builds(scale: int) -> List[dict]:
+    """Time the derived-structure builds on the graph currently imported."""
+    # App imports here: only the derived builds need the app package.
+    from app.jobs.centrality import rank_directors
+    from app.jobs.communities import detect_genre_communities
+    from app.jobs.cooccurrence import rebuild_genre_cooccurrence
+    from app.jobs.similar_directors import rebuild_similar_directors
+    from app.jobs.timelines import rebuild_timelines
+
+    builds = [
+        ("genre_cooccurrence", rebuild_genre_cooccurrence),
+        ("genre_communities", detect_genre_communities),
+        ("director_centrality", rank_directors),
+        ("similar_directors", rebuild_similar_directors),
+        ("timelines", rebuild_timelines),
+    ]
+    report = []
+    for name, build in builds:
+        started = time.perf_counter()
+        result = build()
+        report.append(
+            {
+                "scale": scale,
+                "build": name,
+                "seconds": round(time.perf_counter() - started, 3),
+                "peak_rss_mb": _peak_rss_mb(),
+                "result": result,
+            }
+        )
+    return report
+
+
+def _child(target, args, results) -> None:
+    try:
+        results.put(("ok", target(*args)))
+    except BaseException as exc:  # pylint: disable=broad-except
+        results.put(("error", f"{type(exc).__name__}: {exc}"))
+
+
+def _isolated(target, *args):
+    """Run `target(*args)` in a fresh process (own peak RSS)."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_child, args=(target, args, results))
+    process.start()
+    status, value = results.get()
+    process.join()
+    if status == "error":
+        raise RuntimeError(value)
+    return value
+
+
+# ---------------------------------------------------------------- report
+
+
+def _graph_is_empty() -> bool:
+    driver = get_driver()
+    with driver.session() as session:
+        empty = session.run("MATCH (n) RETURN count(n) = 0 AS empty").single()["empty"]
+    driver.close()
+    return empty
+
+
+def compare(report: dict, baseline: dict) -> List[dict]:
+    """rows/sec and seconds of `report` relative to `baseline`, per (strategy, scale)."""
+    previous = {(run["strategy"], run["scale"]): run for run in baseline.get("runs", [])}
+    rows = []
+    for run in report["runs"]:
+        old = previous.get((run["strategy"], run["scale"]))
+        if old and old.get("rows_per_sec") and run.get("rows_per_sec"):
+            rows.append(
+                {
+                    "strategy": run["strategy"],
+                    "scale": run["scale"],
+                    "rows_per_sec": run["rows_per_sec"],
+                    "baseline_rows_per_sec": old["rows_per_sec"],
+                    "speedup": round(run["rows_per_sec"] / old["rows_per_sec"], 2),
+                }
+            )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import strategies and derived builds.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4, 16],
+                        help=f"Scale factors (x{BASE_FILMS} synthetic films, or x replay copies)")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    parser.add_argument("--replay", help="Dataset from a JSON-lines replay file")
+    parser.add_argument("--batch-size", type=int,
+                        default=int(os.getenv("IMPORT_BATCH_SIZE", "1000")))
+    parser.add_argument("--fetchers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Bulk CSV sort run size")
+    parser.add_argument("--bulk-dir", help="Where to write the bulk CSV files (default: temp dir)")
+    parser.add_argument("--bulk-load", action="store_true",
+                        help="Also run the neo4j-admin import (database stopped)")
+    parser.add_argument("--no-derived", action="store_true", help="Skip the derived builds")
+    parser.add_argument("--max-per-row", type=int, default=20_000,
+                        help="Skip per_row above this many rows (one transaction per row)")
+    parser.add_argument("--wipe", action="store_true",
+                        help="Allow deleting the current graph (Neo4j strategies)")
+    parser.add_argument("--output", help="Report path (default var/bench/import-<time>.json)")
+    parser.add_argument("--compare", help="Older report to compare rows/sec with")
+    args = parser.parse_args()
+
+    uses_db = bool(DB_STRATEGIES & set(args.strategies))
+    if uses_db and not args.wipe and not _graph_is_empty():
+        parser.error("the Neo4j strategies delete the graph: pass --wipe or use an empty database")
+
+    options = {
+        "replay": args.replay,
+        "batch_size": args.batch_size,
+        "fetchers": args.fetchers,
+        "writers": args.writers,
+        "chunk_size": args.chunk_size,
+        "bulk_dir": args.bulk_dir,
+        "bulk_load": args.bulk_load,
+        "max_per_row": args.max_per_row,
+    }
+    started_at = datetime.now(timezone.utc)
+    report = {
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "neo4j_uri": os.getenv("NEO4J_URI", "bolt://neo4j:7687") if uses_db else None,
+            "dataset": args.replay or f"synthetic x{BASE_FILMS} films",
+            "options": {k: v for k, v in options.items() if k != "replay"},
+        },
+        "runs": [],
+        "derived": [],
+    }
+
+    for scale in args.scales:
+        imported = False
+        for strategy in args.strategies:
+            print(f"[bench] {strategy} x{scale}", file=sys.stderr)
+            run = _isolated(run_strategy, strategy, scale, options)
+            report["runs"].append(run)
+            imported = imported or (strategy in DB_STRATEGIES and not run.get("skipped"))
+        if imported and not args.no_derived:
+            print(f"[bench] derived builds x{scale}", file=sys.stderr)
+            report["derived"].extend(_isolated(run_derived_builds, scale))
+
+    output = Path(args.output or f"var/bench/import-{started_at:%Y%m%dT%H%M%S}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+
+    columns = ("strategy", "scale", "rows", "rows_per_sec", "transactions", "peak_rss_mb")
+    summary = [{key: run.get(key) for key in columns} for run in report["runs"]]
+    print(json.dumps(summary, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print(json.dumps(compare(report, baseline), indent=2))
+    print(f"[bench] report written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_related_batch.py
+
+"""
+Batch related-films benchmark: POST /api/articles/related:batch vs N calls
+to GET /api/articles/{film_id}/related.
+
+Runs in-process against the configured Neo4j (NEO4J_URI, API_KEY env vars).
+
+Usage:
+    python -m benchmarks.bench_related_batch --sizes 1 5 10 20 40
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+from starlette.testclient import TestClient
+
+from app.database.neo4j import get_driver
+from app.main import app
+
+
+def _film_ids(count: int) -> list:
+    with get_driver().session() as session:
+        records = session.run(
+            "MATCH (f:Article) RETURN f.wikidata_id AS id ORDER BY f.wikidata_id LIMIT $n",
+            n=count,
+        )
+        return [r["id"] for r in records]
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch vs single related-films calls.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10, 20, 40])
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    headers = {"X-API-Key": os.environ["API_KEY"]}
+    client = TestClient(app)
+    ids = _film_ids(max(args.sizes))
+
+    report = []
+    for size in args.sizes:
+        batch_ids = ids[:size]
+
+        def singles(batch_ids=batch_ids):
+            for film_id in batch_ids:
+                client.get(
+                    f"/api/articles/{film_id}/related",
+                    params={"limit": args.limit},
+                    headers=headers,
+                ).raise_for_status()
+
+        def batch(batch_ids=batch_ids):
+            client.post(
+                "/api/articles/related:batch",
+                json={"film_ids": batch_ids, "limit": args.limit},
+                headers=headers,
+            ).raise_for_status()
+
+        singles_ms = _median_ms(singles, args.repeat)
+        batch_ms = _median_ms(batch, args.repeat)
+        report.append(
+            {
+                "batch_size": len(batch_ids),
+                "single_calls_ms": round(singles_ms, 2),
+                "batch_call_ms": round(batch_ms, 2),
+                "batch_ms_per_film": round(batch_ms / len(batch_ids), 2),
+                "speedup": round(singles_ms / batch_ms, 2),
+            }
+        )
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
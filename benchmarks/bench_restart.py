@@ -0,0 +1,153 @@
+# benchmarks/bench_restart.py
+
+"""
+Restart-to-warm benchmark for the response cache.
+
+Measures how long a restarted process needs to get its response cache back:
+- snapshot: restore the entries from the on-disk snapshot (unpickle),
+  in a fresh interpreter, i.e. what the startup warm-up does when the graph
+  version did not change;
+- rebuild:  recompute the same entries against Neo4j through the route
+  loaders (what happens without a snapshot). Only with --neo4j.
+
+Without --neo4j the entries are synthetic related-films payloads.
+
+Usage:
+    python -m benchmarks.bench_restart --entries 1000 10000
+    python -m benchmarks.bench_restart --entries 200 --neo4j
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.cache import ResponseCache
+from app.routers.articles import RELATED_ROUTE, _related_payload
+from app.singleflight import flight_key
+from app.snapshots import pickled, write_snapshot
+
+GRAPH_VERSION = 1
+
+# Executed in a fresh interpreter: open + restore (timed), as on startup.
+_RESTORE_SCRIPT = """
+import sys, time
+from pathlib import Path
+from app.cache import ResponseCache
+from app.snapshots import open_snapshot
+start = time.perf_counter()
+cache = ResponseCache(max_entries=int(sys.argv[2]))
+with open_snapshot("bench_response_cache", 1, Path(sys.argv[1])) as snapshot:
+    cache.restore(snapshot.graph_version, snapshot.load("entries"))
+print(len(cache), time.perf_counter() - start)
+"""
+
+
+def _synthetic_entries(count: int) -> list:
+    return [
+        (
+            flight_key(RELATED_ROUTE, film_id=f"Q{i}", limit=10),
+            [
+                {
+                    "film": {
+                        "wikidata_id": f"Q{i * 10 + j}",
+                        "title": f"Film {i * 10 + j}",
+                        "year": 1950 + j,
+                    },
+                    "score": 3.5 - j * 0.1,
+                }
+                for j in range(10)
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+def _neo4j_entries(count: int) -> tuple:
+    """Rebuild `count` related entries from Neo4j; returns (entries, seconds)."""
+    from app.database.neo4j import get_driver  # pylint: disable=import-outside-toplevel
+
+    with get_driver().session() as session:
+        ids = [
+            r["id"]
+            for r in session.run(
+                "MATCH (f:Article) RETURN f.wikidata_id AS id ORDER BY f.wikidata_id LIMIT $n",
+                n=count,
+            )
+        ]
+        start = time.perf_counter()
+        entries = [
+            (
+                flight_key(RELATED_ROUTE, film_id=film_id, limit=10),
+                _related_payload(session, film_id, 10),
+            )
+            for film_id in ids
+        ]
+        return entries, time.perf_counter() - start
+
+
+def _restore_in_fresh_process(directory: Path, count: int) -> tuple:
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", _RESTORE_SCRIPT, str(directory), str(count)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    return int(out[0]), float(out[1]), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cache restore vs rebuild on restart.")
+    parser.add_argument("--entries", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--neo4j", action="store_true", help="Rebuild from Neo4j for comparison")
+    args = parser.parse_args()
+
+    report = []
+    for count in args.entries:
+        rebuild_seconds = None
+        if args.neo4j:
+            entries, rebuild_seconds = _neo4j_entries(count)
+        else:
+            entries = _synthetic_entries(count)
+
+        cache = ResponseCache(max_entries=len(entries))
+        cache.restore(GRAPH_VERSION, entries)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            start = time.perf_counter()
+            path = write_snapshot(
+                "bench_response_cache",
+                GRAPH_VERSION,
+                {"entries": pickled(cache.entries(GRAPH_VERSION))},
+                directory,
+            )
+            save_seconds = time.perf_counter() - start
+            restored, restore_seconds, process_seconds = _restore_in_fresh_process(
+                directory, len(entries)
+            )
+            size = path.stat().st_size
+
+        report.append(
+            {
+                "entries": len(entries),
+                "snapshot_bytes": size,
+                "save_ms": round(save_seconds * 1000, 2),
+                "restore_ms": round(restore_seconds * 1000, 2),
+                "fresh_process_to_warm_ms": round(process_seconds * 1000, 2),
+                "restored": restored,
+                "rebuild_from_neo4j_ms": (
+                    None if rebuild_seconds is None else round(rebuild_seconds * 1000, 2)
+                ),
+            }
+        )
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
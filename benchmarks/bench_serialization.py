@@ -0,0 +1,105 @@
+# benchmarks/bench_serialization.py
+
+"""
+Serialization benchmark for large /api/topics/{topic}/graph responses.
+
+Compares, on a synthetic payload of the same shape as the topics router output:
+- legacy:    node -> _node_to_* Pydantic objects -> response model -> FastAPI re-validation -> JSON
+- validated: map-projection dict -> response model -> JSON (FAST_JSON_ROUTES excludes the route)
+- fast:      map-projection dict -> orjson (default)
+
+Usage:
+    python -m benchmarks.bench_serialization --films 100 1000 10000
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from app.models.schemas import Director, Film, Genre, GenreGraphResponse, RelatedGenre
+from app.serialization import FastJSONResponse
+
+
+def _payload(n_films: int) -> dict:
+    """Dict shaped like the topics Cypher map projections."""
+    return {
+        "topic": {"name": "drama film"},
+        "related_topics": [
+            {"genre": {"name": f"genre {i}"}, "score": float(100 - i)} for i in range(10)
+        ],
+        "films": [
+            {"wikidata_id": f"Q{i}", "title": f"Film number {i}", "year": 1950 + i % 70}
+            for i in range(n_films)
+        ],
+        "directors": [
+            {"wikidata_id": f"Q{10_000_000 + i}", "name": f"Director {i}"}
+            for i in range(n_films)
+        ],
+    }
+
+
+def _legacy(payload: dict) -> bytes:
+    # Previous router code: build models from nodes, then FastAPI validates the
+    # returned model against response_model again before dumping it.
+    films = [Film(**f) for f in payload["films"]]
+    directors = [Director(**d) for d in payload["directors"]]
+    related = [
+        RelatedGenre(genre=Genre(**r["genre"]), score=float(r["score"]))
+        for r in payload["related_topics"]
+    ]
+    response = GenreGraphResponse(
+        topic=Genre(**payload["topic"]),
+        related_topics=related,
+        films=films,
+        directors=directors,
+    )
+    return GenreGraphResponse.model_validate(response.model_dump()).model_dump_json().encode()
+
+
+def _validated(payload: dict) -> bytes:
+    return GenreGraphResponse.model_validate(payload).model_dump_json().encode()
+
+
+def _fast(payload: dict) -> bytes:
+    return FastJSONResponse(payload).body
+
+
+def _median_ms(fn, payload: dict, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(payload)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark topics response serialization.")
+    parser.add_argument("--films", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    report = []
+    for n_films in args.films:
+        payload = _payload(n_films)
+        assert json.loads(_fast(payload)) == json.loads(_validated(payload))
+
+        legacy = _median_ms(_legacy, payload, args.repeat)
+        validated = _median_ms(_validated, payload, args.repeat)
+        fast = _median_ms(_fast, payload, args.repeat)
+        report.append(
+            {
+                "films": n_films,
+                "legacy_ms": round(legacy, 3),
+                "validated_ms": round(validated, 3),
+                "fast_ms": round(fast, 3),
+                "speedup_vs_legacy": round(legacy / fast, 1),
+            }
+        )
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
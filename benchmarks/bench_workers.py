@@ -0,0 +1,149 @@
+# benchmarks/bench_workers.py
+
+"""
+Throughput scaling of the multi-process serving mode (gunicorn.conf.py).
+
+For each worker count, starts `gunicorn -c gunicorn.conf.py app.main:app`
+on a free port, waits for /ready, warms every worker, then drives the target
+path with keep-alive client processes for a fixed duration and reports
+requests/second and the speedup over one worker.
+
+The default target is a large genre subgraph: after the first hit it is
+served from the response cache, so the measured work is the CPU-bound part
+(ETag, rendering, HTTP) that a single process cannot spread over cores.
+Needs the configured Neo4j (NEO4J_URI...). A run stops with an error when
+the target does not answer 200, instead of reporting 0 requests/second.
+
+Usage:
+    python -m benchmarks.bench_workers --workers 1 2 4 --seconds 10
+    python -m benchmarks.bench_workers --path "/api/search?q=love&limit=50"
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import quote
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/ready")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server on port {port} not ready after {timeout}s")
+
+
+def _check_target(port: int, path: str) -> None:
+    """Fail before measuring when the target does not answer 200."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    conn.request("GET", path)
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    if response.status != 200:
+        raise RuntimeError(
+            f"{path} answered {response.status}: {body[:200].decode('utf-8', 'replace')}"
+        )
+
+
+def _client(port: int, path: str, seconds: float, results) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    done = errors = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status == 200:
+                done += 1
+            else:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    results.put((done, errors))
+
+
+def _measure(port: int, path: str, clients: int, seconds: float) -> dict:
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=_client, args=(port, path, seconds, results))
+        for _ in range(clients)
+    ]
+    for proc in procs:
+        proc.start()
+    counts = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    done = sum(c[0] for c in counts)
+    return {"requests": done, "errors": sum(c[1] for c in counts), "rps": done / seconds}
+
+
+def run(workers: int, path: str, clients: int, seconds: float) -> dict:
+    port = _free_port()
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), BIND=f"127.0.0.1:{port}")
+    server = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_ready(port, timeout=120)
+        _check_target(port, path)
+        _measure(port, path, clients, 2.0)  # every worker fills its cache
+        result = _measure(port, path, clients, seconds)
+        if not result["requests"]:
+            raise RuntimeError(f"No successful request to {path} ({result['errors']} errors)")
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+    return {"workers": workers, "clients": clients, **result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark throughput vs worker count.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--topic", default="drama film")
+    parser.add_argument("--path", help="Target path (default: topic graph, limit=100)")
+    parser.add_argument("--clients-per-worker", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    path = args.path or f"/api/topics/{quote(args.topic)}/graph?limit=100"
+    print(f"[Bench] {os.cpu_count()} CPUs, target {path}", file=sys.stderr)
+
+    report = []
+    for workers in args.workers:
+        result = run(workers, path, workers * args.clients_per_worker, args.seconds)
+        base = report[0]["rps"] if report else result["rps"]
+        result["speedup"] = round(result["rps"] / base, 2) if base else None
+        result["rps"] = round(result["rps"], 1)
+        report.append(result)
+        print(f"[Bench] {result}", file=sys.stderr)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
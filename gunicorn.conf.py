@@ -0,0 +1,61 @@
+# gunicorn.conf.py
+
+"""
+Production serving mode: N uvicorn worker processes under gunicorn.
+
+    gunicorn -c gunicorn.conf.py app.main:app      (make serve)
+
+One worker per available CPU by default (WEB_CONCURRENCY overrides it):
+Pydantic/JSON work is CPU-bound, a single process only ever uses one core.
+
+Shared read-only state: the app is imported once in the master
+(preload_app) and the snapshots whose graph version still matches are
+restored there, before forking. Workers inherit those pages copy-on-write;
+`gc.freeze()` moves everything loaded so far out of the garbage collector's
+reach so collections in the workers do not write to (and duplicate) them.
+A worker that restores a snapshot itself (e.g. after a version change)
+unpickles its own copy: snapshot files are not shared memory.
+
+The Neo4j driver is closed in the master before forking: sockets must not be
+shared between processes, every worker opens its own pool on first use.
+"""
+
+import gc
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+keepalive = 5
+graceful_timeout = 30
+timeout = 60
+
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        return os.cpu_count() or 1
+
+
+workers = int(os.getenv("WEB_CONCURRENCY") or _available_cpus())
+
+
+def when_ready(server):
+    """Master, after the app is imported and before the workers are forked."""
+    # pylint: disable=import-outside-toplevel
+    from app.database.neo4j import close_driver, get_driver
+    from app.graph_version import graph_version
+    from app.snapshots import restore_all, snapshots_enabled
+
+    if snapshots_enabled():
+        restored = restore_all(graph_version.get())
+        server.log.info("Preloaded snapshots: %s", ", ".join(restored) or "none")
+
+    if get_driver.cache_info().currsize:
+        close_driver()
+        get_driver.cache_clear()
+    graph_version.invalidate()
+
+    gc.collect()
+    gc.freeze()
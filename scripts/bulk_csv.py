@@ -0,0 +1,280 @@
+# scripts/bulk_csv.py
+
+"""
+CSV files for `neo4j-admin database import full` (initial loads).
+
+Transactional MERGE (scripts/import_wikidata.py) is the right tool for
+incremental imports, but for a first load of millions of films the offline
+bulk importer is orders of magnitude faster. It needs every node and
+relationship exactly once, with the degree counters already computed, so the
+import rows (one per film x director x genre) are de-duplicated here by
+external sort: records are buffered up to `chunk_size`, spilled to sorted
+temporary run files and merged back with `heapq.merge`, so memory stays
+bounded whatever the input size.
+
+Files written in `out_dir` (same schema as the transactional importer):
+  articles.csv   (:Article)  wikidata_id, title, year, year_key, director_count, genre_count
+  authors.csv    (:Author)   wikidata_id, name, film_count
+  topics.csv     (:Topic)    name, film_count
+  directed.csv   (:Author)-[:DIRECTED]->(:Article)
+  has_topic.csv  (:Article)-[:HAS_TOPIC]->(:Topic)
+  manifest.json  graph version, counts and the neo4j-admin command
+"""
+
+import csv
+import heapq
+import json
+import os
+import shlex
+import tempfile
+from itertools import groupby
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+NODE_FILES = ("articles.csv", "authors.csv", "topics.csv")
+RELATIONSHIP_FILES = ("directed.csv", "has_topic.csv")
+
+HEADERS = {
+    "articles.csv": [
+        "wikidata_id:ID(Article)", "title", "year:int", "year_key:int",
+        "director_count:int", "genre_count:int", "graph_version:int", ":LABEL",
+    ],
+    "authors.csv": [
+        "wikidata_id:ID(Author)", "name", "film_count:int", "graph_version:int", ":LABEL",
+    ],
+    "topics.csv": ["name:ID(Topic)", "film_count:int", "graph_version:int", ":LABEL"],
+    "directed.csv": [":START_ID(Author)", ":END_ID(Article)", "graph_version:int", ":TYPE"],
+    "has_topic.csv": [":START_ID(Article)", ":END_ID(Topic)", "graph_version:int", ":TYPE"],
+}
+
+# Sort / dedup key of every record: its first field(s).
+Record = Tuple
+KeyFn = Callable[[Record], Tuple]
+
+
+class ExternalSorter:
+    """
+    Sort records (JSON-serializable tuples) with bounded memory.
+
+    At most `chunk_size` records are held in memory; fuller buffers are
+    sorted and spilled to a temporary run file. Iterating merges the runs.
+    """
+
+    def __init__(self, key: KeyFn, chunk_size: int = 100_000, tmp_dir: Optional[str] = None):
+        self.key = key
+        self.chunk_size = chunk_size
+        self.tmp_dir = tmp_dir
+        self.buffer: List[Record] = []
+        self.runs: List[str] = []
+
+    def add(self, record: Record) -> None:
+        self.buffer.append(record)
+        if len(self.buffer) >= self.chunk_size:
+            self._spill()
+
+    def _spill(self) -> None:
+        self.buffer.sort(key=self.key)
+        fd, path = tempfile.mkstemp(prefix="bulk-run-", suffix=".jsonl", dir=self.tmp_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            for record in self.buffer:
+                handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.runs.append(path)
+        self.buffer = []
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[Record]:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                yield tuple(json.loads(line))
+
+    def sorted(self) -> Iterator[Record]:
+        """Every record added, in key order (stable within a run)."""
+        self.buffer.sort(key=self.key)
+        runs = [self._read_run(path) for path in self.runs]
+        return heapq.merge(*runs, iter(self.buffer), key=self.key)
+
+    def unique(self) -> Iterator[Record]:
+        """First record of every distinct key, in key order."""
+        for _, group in groupby(self.sorted(), key=self.key):
+            yield next(group)
+
+    def close(self) -> None:
+        for path in self.runs:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.runs = []
+        self.buffer = []
+
+    def __enter__(self) -> "ExternalSorter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _first(record: Record) -> Tuple:
+    return (record[0],)
+
+
+def _pair(record: Record) -> Tuple:
+    return (record[0], record[1])
+
+
+def count_groups(records: Iterable[Record]) -> Iterator[Tuple[str, int]]:
+    """(first field, number of records) of records sorted on their first field."""
+    for key, group in groupby(records, key=lambda record: record[0]):
+        yield key, sum(1 for _ in group)
+
+
+def join_counts(
+    nodes: Iterable[Record], *counts: Iterable[Tuple[str, int]]
+) -> Iterator[Tuple[Record, List[int]]]:
+    """
+    Merge join of nodes sorted by id with count streams sorted by id:
+    (node, [count in each stream, 0 if absent]).
+    """
+    streams = [iter(stream) for stream in counts]
+    heads = [next(stream, None) for stream in streams]
+    for node in nodes:
+        values = []
+        for i, stream in enumerate(streams):
+            while heads[i] is not None and heads[i][0] < node[0]:
+                heads[i] = next(stream, None)
+            values.append(heads[i][1] if heads[i] is not None and heads[i][0] == node[0] else 0)
+        yield node, values
+
+
+def _writer(out_dir: Path, name: str):
+    handle = open(out_dir / name, "w", encoding="utf-8", newline="")
+    writer = csv.writer(handle)
+    writer.writerow(HEADERS[name])
+    return handle, writer
+
+
+def admin_import_command(out_dir: str, database: str = "neo4j") -> str:
+    """neo4j-admin command loading the files of `out_dir` (database stopped)."""
+    args = ["neo4j-admin", "database", "import", "full", "--overwrite-destination"]
+    args += [f"--nodes={Path(out_dir) / name}" for name in NODE_FILES]
+    args += [f"--relationships={Path(out_dir) / name}" for name in RELATIONSHIP_FILES]
+    args += ["--multiline-fields=true", database]
+    return " ".join(shlex.quote(arg) for arg in args)
+
+
+def write_bulk_csv(
+    rows: Iterable[dict],
+    out_dir: str,
+    version: int = 1,
+    chunk_size: int = 100_000,
+    database: str = "neo4j",
+) -> dict:
+    """
+    Write the bulk-import files of `rows` (import_wikidata.to_params dicts)
+    and their manifest; returns the manifest.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    tmp = str(out)
+
+    films = ExternalSorter(_first, chunk_size, tmp)
+    authors = ExternalSorter(_first, chunk_size, tmp)
+    topics = ExternalSorter(_first, chunk_size, tmp)
+    directed = ExternalSorter(_pair, chunk_size, tmp)
+    has_topic = ExternalSorter(_pair, chunk_size, tmp)
+    # Relationships re-sorted by their other end, for the counters of that end.
+    directed_by_film = ExternalSorter(_pair, chunk_size, tmp)
+    has_topic_by_genre = ExternalSorter(_pair, chunk_size, tmp)
+    sorters = [films, authors, topics, directed, has_topic, directed_by_film, has_topic_by_genre]
+
+    rows_in = 0
+    try:
+        for row in rows:
+            rows_in += 1
+            films.add((row["film_id"], row["film_title"], row["year"]))
+            authors.add((row["director_id"], row["director_name"]))
+            directed.add((row["director_id"], row["film_id"]))
+            if row.get("genre_name") is not None:
+                topics.add((row["genre_name"],))
+                has_topic.add((row["film_id"], row["genre_name"]))
+
+        counts = {"rows": rows_in}
+
+        # Relationships (deduplicated), feeding the per-end counters.
+        handle, writer = _writer(out, "directed.csv")
+        with handle:
+            author_counts = ExternalSorter(_first, chunk_size, tmp)
+            sorters.append(author_counts)
+            n = 0
+            for director_id, group in groupby(directed.unique(), key=lambda r: r[0]):
+                films_of_director = 0
+                for _, film_id in group:
+                    writer.writerow([director_id, film_id, version, "DIRECTED"])
+                    directed_by_film.add((film_id, director_id))
+                    films_of_director += 1
+                author_counts.add((director_id, films_of_director))
+                n += films_of_director
+            counts["DIRECTED"] = n
+
+        handle, writer = _writer(out, "has_topic.csv")
+        with handle:
+            film_genre_counts = ExternalSorter(_first, chunk_size, tmp)
+            sorters.append(film_genre_counts)
+            n = 0
+            for film_id, group in groupby(has_topic.unique(), key=lambda r: r[0]):
+                genres_of_film = 0
+                for _, genre in group:
+                    writer.writerow([film_id, genre, version, "HAS_TOPIC"])
+                    has_topic_by_genre.add((genre, film_id))
+                    genres_of_film += 1
+                film_genre_counts.add((film_id, genres_of_film))
+                n += genres_of_film
+            counts["HAS_TOPIC"] = n
+
+        # Nodes (first value wins), joined with their counters.
+        handle, writer = _writer(out, "articles.csv")
+        with handle:
+            director_counts = count_groups(directed_by_film.sorted())
+            n = 0
+            for (film_id, title, year), (directors, genres) in join_counts(
+                films.unique(), director_counts, film_genre_counts.sorted()
+            ):
+                year_key = -1 if year is None else year
+                writer.writerow(
+                    [film_id, title, year, year_key, directors, genres, version, "Article"]
+                )
+                n += 1
+            counts["Article"] = n
+
+        handle, writer = _writer(out, "authors.csv")
+        with handle:
+            n = 0
+            for (director_id, name), (films_count,) in join_counts(
+                authors.unique(), author_counts.sorted()
+            ):
+                writer.writerow([director_id, name, films_count, version, "Author"])
+                n += 1
+            counts["Author"] = n
+
+        handle, writer = _writer(out, "topics.csv")
+        with handle:
+            n = 0
+            for (name,), (films_count,) in join_counts(
+                topics.unique(), count_groups(has_topic_by_genre.sorted())
+            ):
+                writer.writerow([name, films_count, version, "Topic"])
+                n += 1
+            counts["Topic"] = n
+
+        counts["spilled_runs"] = sum(len(sorter.runs) for sorter in sorters)
+    finally:
+        for sorter in sorters:
+            sorter.close()
+
+    manifest = {
+        "graph_version": version,
+        "counts": counts,
+        "command": admin_import_command(str(out), database),
+    }
+    (out / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
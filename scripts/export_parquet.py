@@ -0,0 +1,280 @@
+# scripts/export_parquet.py
+"""
+Columnar export of the graph for offline analytics.
+
+Writes one file per node label and relationship type:
+
+    <out>/v<graph_version>/nodes_article.parquet   (wikidata_id, title, year, graph_version)
+    <out>/v<graph_version>/nodes_author.parquet    (wikidata_id, name, graph_version)
+    <out>/v<graph_version>/nodes_topic.parquet     (name, graph_version)
+    <out>/v<graph_version>/edges_directed.parquet  (source=author id, target=article id)
+    <out>/v<graph_version>/edges_has_topic.parquet (source=article id, target=topic name)
+    <out>/v<graph_version>/edges_co_occurs_with.parquet (source, target, score)
+
+The graph is read in keyset chunks (ordered on the unique key, so each chunk is
+an index range seek) and every chunk is written as one row group: memory stays
+bounded by --chunk-size whatever the graph size.
+
+--incremental only exports nodes/edges stamped with a `graph_version` newer
+than the last export recorded in <out>/manifest.json (the importer stamps
+everything it writes). CO_OCCURS_WITH is rebuilt from scratch by the seed, so
+it is always exported in full. Deletions are not tracked.
+
+Reading back:
+    pandas.read_parquet("exports/v3/nodes_article.parquet")
+"""
+import os
+import json
+import argparse
+from pathlib import Path
+
+from dotenv import load_dotenv
+from neo4j import GraphDatabase, basic_auth
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+MANIFEST = "manifest.json"
+
+
+# -------------------------
+# Connection
+# -------------------------
+def get_driver():
+    """Create a Neo4j driver from environment variables."""
+    load_dotenv()
+    uri = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "password")
+    return GraphDatabase.driver(uri, auth=basic_auth(user, password))
+
+
+def get_graph_version(session) -> int:
+    rec = session.run('MATCH (m:GraphMeta {key: "graph"}) RETURN m.version AS version').single()
+    return rec["version"] if rec and rec["version"] else 0
+
+
+# -------------------------
+# Tables
+# -------------------------
+def _schemas():
+    return {
+        "nodes_article": pa.schema(
+            [
+                ("wikidata_id", pa.string()),
+                ("title", pa.string()),
+                ("year", pa.int32()),
+                ("graph_version", pa.int64()),
+            ]
+        ),
+        "nodes_author": pa.schema(
+            [("wikidata_id", pa.string()), ("name", pa.string()), ("graph_version", pa.int64())]
+        ),
+        "nodes_topic": pa.schema([("name", pa.string()), ("graph_version", pa.int64())]),
+        "edges_directed": pa.schema(
+            [("source", pa.string()), ("target", pa.string()), ("graph_version", pa.int64())]
+        ),
+        "edges_has_topic": pa.schema(
+            [("source", pa.string()), ("target", pa.string()), ("graph_version", pa.int64())]
+        ),
+        "edges_co_occurs_with": pa.schema(
+            [("source", pa.string()), ("target", pa.string()), ("score", pa.int64())]
+        ),
+    }
+
+
+# Node chunks: keyset on the unique key (index-backed ORDER BY + range seek).
+NODE_QUERIES = {
+    "nodes_article": """
+        MATCH (n:Article)
+        WHERE n.wikidata_id > $after
+        WITH n ORDER BY n.wikidata_id LIMIT $chunk
+        RETURN n.wikidata_id AS key,
+               CASE WHEN coalesce(n.graph_version, 0) > $since
+                    THEN n {.wikidata_id, .title, .year, .graph_version} END AS row
+    """,
+    "nodes_author": """
+        MATCH (n:Author)
+        WHERE n.wikidata_id > $after
+        WITH n ORDER BY n.wikidata_id LIMIT $chunk
+        RETURN n.wikidata_id AS key,
+               CASE WHEN coalesce(n.graph_version, 0) > $since
+                    THEN n {.wikidata_id, .name, .graph_version} END AS row
+    """,
+    "nodes_topic": """
+        MATCH (n:Topic)
+        WHERE n.name > $after
+        WITH n ORDER BY n.name LIMIT $chunk
+        RETURN n.name AS key,
+               CASE WHEN coalesce(n.graph_version, 0) > $since
+                    THEN n {.name, .graph_version} END AS row
+    """,
+}
+
+# Edge chunks: a keyset chunk of source nodes, then their outgoing edges.
+EDGE_QUERIES = {
+    "edges_directed": (
+        "MATCH (n:Author) WHERE n.wikidata_id > $after "
+        "WITH n ORDER BY n.wikidata_id LIMIT $chunk RETURN n.wikidata_id AS key",
+        """
+        UNWIND $keys AS key
+        MATCH (:Author {wikidata_id: key})-[r:DIRECTED]->(f:Article)
+        WHERE coalesce(r.graph_version, 0) > $since
+        RETURN key AS source, f.wikidata_id AS target, r.graph_version AS graph_version
+        """,
+    ),
+    "edges_has_topic": (
+        "MATCH (n:Article) WHERE n.wikidata_id > $after "
+        "WITH n ORDER BY n.wikidata_id LIMIT $chunk RETURN n.wikidata_id AS key",
+        """
+        UNWIND $keys AS key
+        MATCH (:Article {wikidata_id: key})-[r:HAS_TOPIC]->(t:Topic)
+        WHERE coalesce(r.graph_version, 0) > $since
+        RETURN key AS source, t.name AS target, r.graph_version AS graph_version
+        """,
+    ),
+    "edges_co_occurs_with": (
+        "MATCH (n:Topic) WHERE n.name > $after "
+        "WITH n ORDER BY n.name LIMIT $chunk RETURN n.name AS key",
+        """
+        UNWIND $keys AS key
+        MATCH (:Topic {name: key})-[r:CO_OCCURS_WITH]->(t2:Topic)
+        RETURN key AS source, t2.name AS target, r.score AS score
+        """,
+    ),
+}
+
+
+class TableWriter:
+    """Appends chunks to a Parquet file (one row group each) or an Arrow IPC file."""
+
+    def __init__(self, path: Path, schema, fmt: str):
+        self.path = path
+        self.schema = schema
+        self.rows = 0
+        if fmt == "arrow":
+            self._sink = pa.OSFile(str(path), "wb")
+            self._writer = pa_ipc.new_file(self._sink, schema)
+        else:
+            self._sink = None
+            self._writer = pq.ParquetWriter(str(path), schema, compression="zstd")
+
+    def write(self, rows: list) -> None:
+        if rows:
+            self._writer.write_table(pa.Table.from_pylist(rows, schema=self.schema))
+            self.rows += len(rows)
+
+    def close(self) -> None:
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+
+def export_nodes(session, name: str, writer: TableWriter, since: int, chunk: int) -> None:
+    after = ""
+    while True:
+        records = list(session.run(NODE_QUERIES[name], after=after, since=since, chunk=chunk))
+        if not records:
+            return
+        writer.write([r["row"] for r in records if r["row"] is not None])
+        after = records[-1]["key"]
+
+
+def export_edges(session, name: str, writer: TableWriter, since: int, chunk: int) -> None:
+    keys_query, edges_query = EDGE_QUERIES[name]
+    after = ""
+    while True:
+        keys = [r["key"] for r in session.run(keys_query, after=after, chunk=chunk)]
+        if not keys:
+            return
+        writer.write([r.data() for r in session.run(edges_query, keys=keys, since=since)])
+        after = keys[-1]
+
+
+# -------------------------
+# Manifest
+# -------------------------
+def load_manifest(out_dir: Path) -> dict:
+    path = out_dir / MANIFEST
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {"last_version": None, "exports": []}
+
+
+def save_manifest(out_dir: Path, manifest: dict) -> None:
+    tmp = out_dir / (MANIFEST + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    tmp.replace(out_dir / MANIFEST)
+
+
+# -------------------------
+# Main
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Export the graph to Parquet/Arrow files.")
+    parser.add_argument("--out", default="exports", help="Output directory (default: exports/)")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows read per round trip")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only export what changed since the last export in the manifest",
+    )
+    args = parser.parse_args()
+
+    if pa is None:
+        raise SystemExit("pyarrow is required: pip install pyarrow")
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    extension = "arrow" if args.format == "arrow" else "parquet"
+
+    driver = get_driver()
+    with driver.session() as session:
+        version = get_graph_version(session)
+        since = -1
+        if args.incremental and manifest["last_version"] is not None:
+            since = manifest["last_version"]
+            if since >= version:
+                print(f"[Export] Graph version {version} already exported, nothing to do.")
+                driver.close()
+                return
+
+        target = out_dir / f"v{version}"
+        target.mkdir(parents=True, exist_ok=True)
+        files = {}
+
+        for name, schema in _schemas().items():
+            writer = TableWriter(target / f"{name}.{extension}", schema, args.format)
+            try:
+                if name in NODE_QUERIES:
+                    export_nodes(session, name, writer, since, args.chunk_size)
+                else:
+                    export_edges(session, name, writer, since, args.chunk_size)
+            finally:
+                writer.close()
+            files[name] = {"path": str(writer.path.relative_to(out_dir)), "rows": writer.rows}
+            print(f"[Export] {name}: {writer.rows} rows -> {writer.path}")
+
+    driver.close()
+
+    manifest["last_version"] = version
+    manifest["exports"].append(
+        {
+            "graph_version": version,
+            "since_version": None if since < 0 else since,
+            "format": args.format,
+            "files": files,
+        }
+    )
+    save_manifest(out_dir, manifest)
+    print(f"[Export] Done (graph version {version}).")
+
+
+if __name__ == "__main__":
+    main()
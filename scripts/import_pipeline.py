@@ -0,0 +1,350 @@
+# scripts/import_pipeline.py
+
+"""
+Pipelined Wikidata import: fetch -> transform -> write, all stages at once.
+
+The sequential importer fetches everything, then writes everything, so the
+network, the CPU and Neo4j each wait for the others. Here the stages are
+threads connected by bounded queues (a slow stage blocks the previous one
+instead of buffering the whole dataset):
+
+  fetchers (N)   one partitioned SPARQL query each (a year range, or the
+                 films without release date), paged with LIMIT / OFFSET;
+                 HTTP 429 / 5xx are retried with backoff
+  transform (1)  bindings -> import rows (to_params), de-duplicated per
+                 batch and routed to a writer by genre, so one Topic node
+                 is only ever locked by one writer
+  writers (M)    one transaction per batch (IMPORT_CYPHER); transient
+                 errors (deadlocks on shared Article / Author nodes) are
+                 retried with jittered backoff
+
+The first error stops every stage and is re-raised by `run_pipeline`; the
+graph version is only published after a complete run.
+"""
+
+import queue
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+import requests
+from neo4j.exceptions import TransientError
+
+from import_wikidata import IMPORT_CYPHER, to_params
+
+PARTITION_QUERY = """
+PREFIX wd: <http://www.wikidata.org/entity/>
+PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+PREFIX wikibase: <http://wikiba.se/ontology#>
+PREFIX bd: <http://www.bigdata.com/rdf#>
+
+SELECT ?film ?filmLabel ?director ?directorLabel ?genreLabel ?pubDate WHERE {{
+  ?film wdt:P31 wd:Q11424 .
+  ?film wdt:P57 ?director .
+  OPTIONAL {{ ?film wdt:P136 ?genre . }}
+  {date_pattern}
+  SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
+}}
+ORDER BY ?film ?director ?genreLabel ?pubDate
+LIMIT {limit}
+OFFSET {offset}
+"""
+
+USER_AGENT = "KG-WikiSystem/1.0 (student project)"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One slice of the dataset: films released in [year_from, year_to), or undated."""
+
+    name: str
+    date_pattern: str
+
+
+def year_partitions(start: int, end: int, step: int) -> List[Partition]:
+    """Year ranges covering [start, end), plus before / after / undated films."""
+    bounds = list(range(start, end, step)) + [end]
+    partitions = [_year_range(None, start)]
+    partitions += [_year_range(low, high) for low, high in zip(bounds, bounds[1:])]
+    partitions.append(_year_range(end, None))
+    partitions.append(
+        Partition("undated", "FILTER NOT EXISTS { ?film wdt:P577 ?anyDate . }")
+    )
+    return partitions
+
+
+def _year_range(low: Optional[int], high: Optional[int]) -> Partition:
+    # A film with several release dates is returned once per date, as with
+    # the OPTIONAL date of the sequential query.
+    conditions = []
+    if low is not None:
+        conditions.append(f"YEAR(?pubDate) >= {low}")
+    if high is not None:
+        conditions.append(f"YEAR(?pubDate) < {high}")
+    pattern = f"?film wdt:P577 ?pubDate . FILTER({' && '.join(conditions)})"
+    name = f"{'' if low is None else low}-{'' if high is None else high}"
+    return Partition(name, pattern)
+
+
+def partition_query(partition: Partition, limit: int, offset: int) -> str:
+    return PARTITION_QUERY.format(date_pattern=partition.date_pattern, limit=limit, offset=offset)
+
+
+def writer_for(row: dict, writers: int) -> int:
+    """Writer of a row: by genre (Topic lock), by film when it has none."""
+    key = row["genre_name"] if row.get("genre_name") is not None else row["film_id"]
+    return zlib.crc32(key.encode("utf-8")) % writers
+
+
+@dataclass
+class PipelineStats:
+    """Counters and per-stage busy time of one run."""
+
+    partitions: int = 0
+    pages: int = 0
+    http_retries: int = 0
+    bindings: int = 0
+    rows: int = 0
+    duplicates: int = 0
+    batches: int = 0
+    transactions: int = 0
+    write_retries: int = 0
+    stage_seconds: Dict[str, float] = field(
+        default_factory=lambda: {"fetch": 0.0, "transform": 0.0, "write": 0.0}
+    )
+    wall_seconds: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, stage: Optional[str] = None, seconds: float = 0.0, **counts: int) -> None:
+        with self.lock:
+            if stage:
+                self.stage_seconds[stage] += seconds
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> dict:
+        return {
+            name: getattr(self, name)
+            for name in self.__dataclass_fields__
+            if name != "lock"
+        }
+
+
+def fetch_page(
+    endpoint: str,
+    query: str,
+    stats: PipelineStats,
+    attempts: int = 5,
+    backoff: float = 1.0,
+    timeout: float = 120.0,
+) -> List[dict]:
+    """SPARQL bindings of one query, retrying throttling / server errors."""
+    headers = {"Accept": "application/sparql-results+json", "User-Agent": USER_AGENT}
+    for attempt in range(attempts):
+        response = requests.get(endpoint, params={"query": query}, headers=headers, timeout=timeout)
+        if response.status_code in RETRY_STATUSES and attempt < attempts - 1:
+            stats.add(http_retries=1)
+            retry_after = response.headers.get("Retry-After", "")
+            time.sleep(float(retry_after) if retry_after.isdigit() else backoff * 2**attempt)
+            continue
+        response.raise_for_status()
+        return response.json()["results"]["bindings"]
+    raise RuntimeError("unreachable")
+
+
+def neo4j_writer(driver, version: int) -> Callable[[int, List[dict]], None]:
+    """Batch writer for `run_pipeline`: one explicit transaction per batch."""
+
+    def write(_writer: int, rows: List[dict]) -> None:
+        # Explicit transaction: deadlocks surface as TransientError and are
+        # retried by the pipeline (counted), not hidden by execute_write.
+        with driver.session() as session:
+            with session.begin_transaction() as tx:
+                tx.run(IMPORT_CYPHER, rows=rows, version=version).consume()
+                tx.commit()
+
+    return write
+
+
+class _Pipeline:
+    def __init__(self, endpoint, write, fetchers, writers, batch_size, page_size,
+                 queue_size, retry_attempts, retry_backoff):
+        self.endpoint = endpoint
+        self.write = write
+        self.fetchers = fetchers
+        self.writers = writers
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.retry_attempts = retry_attempts
+        self.retry_backoff = retry_backoff
+        self.work: "queue.Queue" = queue.Queue()
+        self.raw: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.batches = [queue.Queue(maxsize=queue_size) for _ in range(writers)]
+        self.stop = threading.Event()
+        self.errors: List[BaseException] = []
+        self.stats = PipelineStats()
+
+    def _put(self, target: "queue.Queue", item) -> bool:
+        """Blocking put that gives up once the pipeline is stopping."""
+        while not self.stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: "queue.Queue"):
+        while not self.stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _guard(self, fn, *args) -> None:
+        try:
+            fn(*args)
+        except BaseException as exc:  # pylint: disable=broad-except
+            self.errors.append(exc)
+            self.stop.set()
+
+    def _fetch(self) -> None:
+        while not self.stop.is_set():
+            try:
+                partition = self.work.get_nowait()
+            except queue.Empty:
+                return
+            offset = 0
+            while not self.stop.is_set():
+                started = time.perf_counter()
+                page = fetch_page(
+                    self.endpoint,
+                    partition_query(partition, self.page_size, offset),
+                    self.stats,
+                    backoff=self.retry_backoff,
+                )
+                self.stats.add("fetch", time.perf_counter() - started, pages=1, bindings=len(page))
+                if page and not self._put(self.raw, page):
+                    return
+                if len(page) < self.page_size:
+                    break
+                offset += self.page_size
+            self.stats.add(partitions=1)
+
+    def _transform(self, fetchers: List[threading.Thread]) -> None:
+        buffers: List[Dict[tuple, dict]] = [{} for _ in range(self.writers)]
+
+        def flush(writer: int) -> bool:
+            rows = list(buffers[writer].values())
+            buffers[writer] = {}
+            return not rows or self._put(self.batches[writer], rows)
+
+        while True:
+            try:
+                page = self.raw.get(timeout=0.1)
+            except queue.Empty:
+                if self.stop.is_set():
+                    return
+                if not any(thread.is_alive() for thread in fetchers) and self.raw.empty():
+                    break
+                continue
+
+            started = time.perf_counter()
+            rows = duplicates = 0
+            for binding in page:
+                row = to_params(binding)
+                writer = writer_for(row, self.writers)
+                key = (row["film_id"], row["director_id"], row["genre_name"])
+                if key in buffers[writer]:
+                    duplicates += 1
+                    continue
+                buffers[writer][key] = row
+                rows += 1
+                if len(buffers[writer]) >= self.batch_size:
+                    if not flush(writer):
+                        return
+            self.stats.add("transform", time.perf_counter() - started,
+                           rows=rows, duplicates=duplicates)
+
+        for writer in range(self.writers):
+            if not flush(writer):
+                return
+        for batches in self.batches:
+            self._put(batches, _DONE)
+
+    def _write_stage(self, writer: int) -> None:
+        while True:
+            rows = self._get(self.batches[writer])
+            if rows is _DONE:
+                return
+            started = time.perf_counter()
+            for attempt in range(self.retry_attempts):
+                try:
+                    self.stats.add(transactions=1)
+                    self.write(writer, rows)
+                    break
+                except TransientError:
+                    if attempt == self.retry_attempts - 1 or self.stop.is_set():
+                        raise
+                    self.stats.add(write_retries=1)
+                    time.sleep(self.retry_backoff * 2**attempt * random.uniform(0.5, 1.5))
+            self.stats.add("write", time.perf_counter() - started, batches=1)
+
+    def run(self, partitions: Iterable[Partition]) -> PipelineStats:
+        started = time.perf_counter()
+        for partition in partitions:
+            self.work.put(partition)
+
+        fetchers = [
+            threading.Thread(target=self._guard, args=(self._fetch,), name=f"fetch-{i}")
+            for i in range(self.fetchers)
+        ]
+        writers = [
+            threading.Thread(target=self._guard, args=(self._write_stage, i), name=f"write-{i}")
+            for i in range(self.writers)
+        ]
+        transform = threading.Thread(
+            target=self._guard, args=(self._transform, fetchers), name="transform"
+        )
+        threads = fetchers + writers + [transform]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.stats.wall_seconds = time.perf_counter() - started
+        if self.errors:
+            raise self.errors[0]
+        return self.stats
+
+
+def run_pipeline(
+    partitions: Iterable[Partition],
+    endpoint: str,
+    write: Callable[[int, List[dict]], None],
+    fetchers: int = 4,
+    writers: int = 4,
+    batch_size: int = 1000,
+    page_size: int = 10_000,
+    queue_size: int = 8,
+    retry_attempts: int = 5,
+    retry_backoff: float = 0.5,
+) -> PipelineStats:
+    """
+    Import every partition through the staged pipeline.
+
+    `write(writer_index, rows)` writes one batch (see `neo4j_writer`); it is
+    called from `writers` threads, a given genre always on the same one.
+    """
+    pipeline = _Pipeline(
+        endpoint, write, fetchers, writers, batch_size, page_size,
+        queue_size, retry_attempts, retry_backoff,
+    )
+    return pipeline.run(partitions)
@@ -1,8 +1,34 @@
 #scripts/import_wikidata.py
+"""
+Import films / directors / genres from Wikidata into Neo4j.
+
+Usage:
+    python scripts/import_wikidata.py                          # SPARQL -> Neo4j (MERGE)
+    python scripts/import_wikidata.py --save rows.jsonl        # also keep the rows
+    python scripts/import_wikidata.py --replay rows.jsonl      # rows from a file
+    python scripts/import_wikidata.py --replay rows.jsonl --bulk-csv import/ --graph-version 8
+        # initial load: neo4j-admin CSV files + command (scripts/bulk_csv.py);
+        # the version must be above the one currently served (ETags, caches)
+    python scripts/import_wikidata.py --bulk-csv import/ --finalize
+        # after neo4j-admin: constraints / indexes, graph version, drops the
+        # API snapshot files (SNAPSHOT_DIR)
+    python scripts/import_wikidata.py --pipeline --fetchers 4 --writers 4
+        # all films, partitioned by year, fetched and written concurrently
+        # (scripts/import_pipeline.py)
+"""
+import argparse
+import json
 import os
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
 import requests
 from neo4j import GraphDatabase
 
+from bulk_csv import write_bulk_csv
+from seed_data import backfill_degree_counters, create_constraints_and_indexes
+
 WQS_URL = "https://query.wikidata.org/sparql"
 
 SPARQL_QUERY = """
@@ -44,58 +70,256 @@ def year_from_date(date_str: str | None) -> int | None:
     except Exception:
         return None
 
-def main():
+def next_graph_version(session) -> int:
+    """
+    Version stamped on everything written by this import run (current + 1).
+
+    The current version lives on a single (:GraphMeta {key: "graph"}) marker
+    node. Every node/relationship written by the run gets a `graph_version`
+    property, which lets exports pick up only what changed.
+    """
+    rec = session.run('MATCH (m:GraphMeta {key: "graph"}) RETURN m.version AS version').single()
+    current = rec["version"] if rec and rec["version"] else 0
+    return current + 1
+
+def publish_graph_version(session, version: int) -> None:
+    """Make `version` current, once the run is complete (readers key caches on it)."""
+    cypher = """
+    MERGE (m:GraphMeta {key: "graph"})
+    SET m.version = $version,
+        m.updated_at = datetime()
+    """
+    session.run(cypher, version=version)
+
+# One transaction per batch of rows. Degree counters are maintained in the
+# same transaction: a relationship MERGE that creates the edge increments
+# the counters of both ends (ON CREATE fires once even if a batch repeats a
+# row), so re-importing the same rows leaves them unchanged.
+#   Article.director_count / Article.genre_count, Author.film_count, Topic.film_count
+# Counters missing on an older graph are backfilled before the first write
+# (seed_data.backfill_degree_counters); scripts/verify_counters.py recomputes
+# them in bulk and reports drift.
+IMPORT_CYPHER = """
+UNWIND $rows AS row
+MERGE (f:Article {wikidata_id: row.film_id})
+  ON CREATE SET f.director_count = 0, f.genre_count = 0
+  SET f.title = row.film_title,
+      f.year = row.year,
+      f.year_key = coalesce(row.year, -1),
+      f.graph_version = $version
+MERGE (a:Author {wikidata_id: row.director_id})
+  ON CREATE SET a.film_count = 0
+  SET a.name = row.director_name,
+      a.graph_version = $version
+MERGE (a)-[d:DIRECTED]->(f)
+  ON CREATE SET a.film_count = coalesce(a.film_count, 0) + 1,
+                f.director_count = coalesce(f.director_count, 0) + 1
+  SET d.graph_version = $version
+WITH f, row
+CALL {
+  WITH f, row
+  WITH f, row.genre_name AS gname
+  WHERE gname IS NOT NULL
+  MERGE (t:Topic {name: gname})
+    ON CREATE SET t.film_count = 0
+    SET t.graph_version = $version
+  MERGE (f)-[ht:HAS_TOPIC]->(t)
+    ON CREATE SET t.film_count = coalesce(t.film_count, 0) + 1,
+                  f.genre_count = coalesce(f.genre_count, 0) + 1
+    SET ht.graph_version = $version
+  RETURN 1 AS ok
+}
+RETURN count(*) AS rows
+"""
+
+def to_params(row: dict) -> dict:
+    """SPARQL binding -> parameters of one IMPORT_CYPHER row."""
+    return {
+        "film_id": qid(row["film"]["value"]),
+        "film_title": row["filmLabel"]["value"],
+        "year": year_from_date(row.get("pubDate", {}).get("value")),
+        "director_id": qid(row["director"]["value"]),
+        "director_name": row["directorLabel"]["value"],
+        "genre_name": row.get("genreLabel", {}).get("value"),
+    }
+
+def write_batch(tx, rows: list[dict], version: int) -> int:
+    return tx.run(IMPORT_CYPHER, rows=rows, version=version).single()["rows"]
+
+def batches(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def save_replay(rows: Iterable[dict], path: str) -> Iterator[dict]:
+    """Pass `rows` through, writing them to a JSON-lines replay file."""
+    with open(path, "w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+            yield row
+
+def read_replay(path: str) -> Iterator[dict]:
+    """Import rows (to_params dicts) of a replay file, streamed."""
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+def get_driver():
     neo4j_uri = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
     neo4j_user = os.getenv("NEO4J_USER", "neo4j")
     neo4j_password = os.getenv("NEO4J_PASSWORD", "password")
+    return GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
 
-    rows = fetch_wikidata(SPARQL_QUERY)
+def drop_snapshots() -> int:
+    """
+    Delete the API snapshot files (app/snapshots.py, same SNAPSHOT_DIR), so no
+    worker warms its caches from the replaced database; returns the count.
+    """
+    directory = Path(os.getenv("SNAPSHOT_DIR", "var/snapshots"))
+    dropped = 0
+    for path in directory.glob("*.snap"):
+        path.unlink(missing_ok=True)
+        dropped += 1
+    return dropped
 
-    driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_user, neo4j_password))
+def finalize_bulk(out_dir: str) -> int:
+    """
+    After `neo4j-admin database import`: schema, publish the version, then drop
+    the snapshots taken from the previous database.
+    """
+    with open(os.path.join(out_dir, "manifest.json"), encoding="utf-8") as handle:
+        version = json.load(handle)["graph_version"]
+    driver = get_driver()
     with driver.session() as session:
-        # Contraintes / indexes (au moins 2 contraintes)
-        session.run("CREATE CONSTRAINT film_wid IF NOT EXISTS FOR (f:Article) REQUIRE f.wikidata_id IS UNIQUE")
-        session.run("CREATE CONSTRAINT dir_wid IF NOT EXISTS FOR (a:Author) REQUIRE a.wikidata_id IS UNIQUE")
-        session.run("CREATE CONSTRAINT topic_name_unique IF NOT EXISTS FOR (t:Topic) REQUIRE t.name IS UNIQUE")
-
-        cypher = """
-        MERGE (f:Article {wikidata_id: $film_id})
-          SET f.title = $film_title,
-              f.year = $year
-        MERGE (a:Author {wikidata_id: $director_id})
-          SET a.name = $director_name
-        MERGE (a)-[:DIRECTED]->(f)
-        WITH f
-        CALL {
-          WITH f
-          WITH f, $genre_name AS gname
-          WHERE gname IS NOT NULL
-          MERGE (t:Topic {name: gname})
-          MERGE (f)-[:HAS_TOPIC]->(t)
-          RETURN 1 AS ok
-        }
-        RETURN 1
-        """
+        create_constraints_and_indexes(session)
+        session.run("CALL db.awaitIndexes(3600)").consume()
+        publish_graph_version(session, version)
+    driver.close()
+    drop_snapshots()
+    return version
 
-        for row in rows:
-            film_uri = row["film"]["value"]
-            director_uri = row["director"]["value"]
-
-            genre_name = row.get("genreLabel", {}).get("value")
-            pub_date = row.get("pubDate", {}).get("value")
-
-            session.run(
-                cypher,
-                film_id=qid(film_uri),
-                film_title=row["filmLabel"]["value"],
-                year=year_from_date(pub_date),
-                director_id=qid(director_uri),
-                director_name=row["directorLabel"]["value"],
-                genre_name=genre_name,
-            )
+def prepare_schema(session) -> None:
+    """
+    Before any write: constraints / indexes (seed_data), then the counters an
+    older graph may lack (the import increments them).
+    """
+    create_constraints_and_indexes(session)
+    session.run("CALL db.awaitIndexes(300)").consume()
+    backfill_degree_counters(session)
+
+def import_rows(driver, rows: Iterable[dict], batch_size: int) -> tuple[int, int, int]:
+    """
+    Sequential import of `rows` (to_params dicts), one write transaction per
+    batch; returns (rows imported, transactions, graph version).
+    """
+    imported = transactions = 0
+    with driver.session() as session:
+        prepare_schema(session)
+        version = next_graph_version(session)
+        for batch in batches(rows, batch_size):
+            session.execute_write(write_batch, batch, version)
+            imported += len(batch)
+            transactions += 1
+        publish_graph_version(session, version)
+    return imported, transactions, version
+
+def import_pipelined(driver, partitions, endpoint: str, **options):
+    """
+    Pipelined import (scripts/import_pipeline.py) of `partitions`; returns
+    (PipelineStats, graph version).
+
+    Schema first, also on an empty database: writers MERGE the same Article /
+    Author concurrently (rows are routed to writers by genre), only the
+    uniqueness constraints keep them from creating duplicate nodes, DIRECTED
+    edges and double-counted counters.
+    """
+    # Imported here: import_pipeline imports this module.
+    from import_pipeline import neo4j_writer, run_pipeline
+
+    with driver.session() as session:
+        prepare_schema(session)
+        version = next_graph_version(session)
+    stats = run_pipeline(partitions, endpoint, neo4j_writer(driver, version), **options)
+    with driver.session() as session:
+        publish_graph_version(session, version)
+    return stats, version
+
+def run_pipeline_import(args, batch_size: int) -> None:
+    from import_pipeline import year_partitions
+
+    driver = get_driver()
+    stats, version = import_pipelined(
+        driver,
+        year_partitions(args.year_from, args.year_to, args.year_step),
+        os.getenv("WIKIDATA_SPARQL_URL", WQS_URL),
+        fetchers=args.fetchers,
+        writers=args.writers,
+        batch_size=batch_size,
+    )
+    driver.close()
+    print(json.dumps(stats.as_dict(), indent=2))
+    print(f"Imported {stats.rows} rows (graph version {version})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Import Wikidata films into Neo4j.")
+    parser.add_argument("--replay", help="Read the rows from a JSON-lines file instead of SPARQL")
+    parser.add_argument("--save", help="Also write the fetched rows to a JSON-lines file")
+    parser.add_argument("--bulk-csv", metavar="DIR", help="Write neo4j-admin CSV files to DIR")
+    parser.add_argument("--finalize", action="store_true",
+                        help="With --bulk-csv: apply the schema after neo4j-admin import")
+    parser.add_argument("--graph-version", type=int,
+                        help="Graph version of a bulk load (required with --bulk-csv): must be "
+                             "greater than the version currently served, or clients keep "
+                             "validating their old ETags against the new graph")
+    parser.add_argument("--chunk-size", type=int, default=100_000,
+                        help="Records held in memory per sort run (bulk mode)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Concurrent fetch -> transform -> write of every film")
+    parser.add_argument("--fetchers", type=int, default=4, help="Concurrent SPARQL queries")
+    parser.add_argument("--writers", type=int, default=4, help="Concurrent write transactions")
+    parser.add_argument("--year-from", type=int, default=1900, help="First partitioned year")
+    parser.add_argument("--year-to", type=int, default=2030, help="End of the partitioned years")
+    parser.add_argument("--year-step", type=int, default=5, help="Years per partition")
+    args = parser.parse_args()
+    batch_size = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+
+    if args.finalize:
+        if not args.bulk_csv:
+            parser.error("--finalize needs --bulk-csv DIR")
+        version = finalize_bulk(args.bulk_csv)
+        print(f"Bulk import finalized (graph version {version})")
+        return
+
+    if args.bulk_csv and args.graph_version is None:
+        parser.error("--bulk-csv needs --graph-version N (above the version currently served)")
+
+    if args.pipeline:
+        if args.replay or args.save or args.bulk_csv:
+            parser.error("--pipeline fetches and writes itself")
+        run_pipeline_import(args, batch_size)
+        return
+
+    if args.replay:
+        rows = read_replay(args.replay)
+    else:
+        rows = (to_params(row) for row in fetch_wikidata(SPARQL_QUERY))
+    if args.save:
+        rows = save_replay(rows, args.save)
+
+    if args.bulk_csv:
+        manifest = write_bulk_csv(rows, args.bulk_csv, args.graph_version, args.chunk_size)
+        print(json.dumps(manifest["counts"]))
+        print("Stop Neo4j, then run:")
+        print(f"  {manifest['command']}")
+        print("Start Neo4j, then run:")
+        print(f"  python scripts/import_wikidata.py --bulk-csv {args.bulk_csv} --finalize")
+        return
 
+    driver = get_driver()
+    imported, _transactions, version = import_rows(driver, rows, batch_size)
     driver.close()
-    print(f"Imported {len(rows)} rows from Wikidata")
+    print(f"Imported {imported} rows (graph version {version})")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,6 +4,8 @@ import argparse
 from dotenv import load_dotenv
 from neo4j import GraphDatabase, basic_auth
 
+from verify_counters import COUNTERS
+
 # -------------------------
 # Connection
 # -------------------------
@@ -49,6 +51,18 @@ def create_constraints_and_indexes(session):
         FOR (t:Topic)
         REQUIRE t.name IS UNIQUE
         """,
+        # Single graph version marker read by the API (ETags)
+        """
+        CREATE CONSTRAINT graph_meta_key_unique IF NOT EXISTS
+        FOR (m:GraphMeta)
+        REQUIRE m.key IS UNIQUE
+        """,
+        # Leases of the API background jobs (one node per job)
+        """
+        CREATE CONSTRAINT job_lock_name_unique IF NOT EXISTS
+        FOR (l:JobLock)
+        REQUIRE l.name IS UNIQUE
+        """,
 
         # Useful indexes (on properties not already covered by unique constraints)
         """
@@ -61,11 +75,41 @@ def create_constraints_and_indexes(session):
         FOR (a:Article)
         ON (a.year)
         """,
+        # Sort key of the genre graph pages (year, -1 when unknown): hub genres
+        # are paged by an ordered scan of this index
+        """
+        CREATE INDEX article_year_key_index IF NOT EXISTS
+        FOR (a:Article)
+        ON (a.year_key)
+        """,
         """
         CREATE INDEX author_name_index IF NOT EXISTS
         FOR (au:Author)
         ON (au.name)
         """,
+        # Degree counters maintained by the importer (ranking by popularity)
+        """
+        CREATE INDEX author_film_count_index IF NOT EXISTS
+        FOR (au:Author)
+        ON (au.film_count)
+        """,
+        """
+        CREATE INDEX topic_film_count_index IF NOT EXISTS
+        FOR (t:Topic)
+        ON (t.film_count)
+        """,
+        # Director centrality (written by the API director_centrality job)
+        """
+        CREATE INDEX author_pagerank_index IF NOT EXISTS
+        FOR (au:Author)
+        ON (au.pagerank)
+        """,
+        # Genre communities (written by the API genre_cooccurrence job)
+        """
+        CREATE INDEX topic_community_index IF NOT EXISTS
+        FOR (t:Topic)
+        ON (t.community)
+        """,
     ]
 
     for q in queries:
@@ -73,6 +117,44 @@ def create_constraints_and_indexes(session):
         if q_clean:
             session.run(q_clean)
 
+
+def backfill_year_key(session, batch_size: int = 10_000) -> None:
+    """Set Article.year_key on films imported before the importer wrote it."""
+    session.run(
+        """
+        MATCH (f:Article)
+        WHERE f.year_key IS NULL
+        CALL {
+            WITH f
+            SET f.year_key = coalesce(f.year, -1)
+        } IN TRANSACTIONS OF $batch_size ROWS
+        """,
+        batch_size=batch_size,
+    ).consume()
+
+
+def backfill_degree_counters(session, batch_size: int = 10_000) -> None:
+    """
+    Set the degree counters missing on nodes imported before the importer
+    maintained them (verify_counters.COUNTERS).
+
+    Must run before the first incremental import: the importer increments
+    coalesce(counter, 0), so a long-standing genre would otherwise restart at 1.
+    """
+    for label, prop, _key, pattern in COUNTERS:
+        session.run(
+            f"""
+            MATCH (n:{label})
+            WHERE n.{prop} IS NULL
+            CALL {{
+                WITH n
+                SET n.{prop} = COUNT {{ {pattern} }}
+            }} IN TRANSACTIONS OF $batch_size ROWS
+            """,
+            batch_size=batch_size,
+        ).consume()
+
+
 def build_genre_cooccurrence(session, top_k: int = 10, min_shared_films: int = 1):
     """
     Build derived relationships between genres (Topic) based on co-occurrence on the same film.
@@ -110,24 +192,51 @@ def build_genre_cooccurrence(session, top_k: int = 10, min_shared_films: int = 1
 
 
 
+# -------------------------
+# Graph version marker
+# -------------------------
+def bump_graph_version(session) -> int:
+    """
+    Increment the (:GraphMeta {key: "graph"}) version after the graph changed.
+
+    The API derives its ETags from this single property: bumping it
+    invalidates every cached response at once.
+    """
+    rec = session.run(
+        """
+        MERGE (m:GraphMeta {key: "graph"})
+        SET m.version = coalesce(m.version, 0) + 1,
+            m.updated_at = datetime()
+        RETURN m.version AS version
+        """
+    ).single()
+    return rec["version"]
+
+
 # -------------------------
 # Optional reset / cleanup
 # -------------------------
 def clear_database(session):
-    """DEV ONLY: delete everything."""
-    session.run("MATCH (n) DETACH DELETE n")
+    """
+    DEV ONLY: delete everything but the version marker.
+
+    The marker survives so versions never go backwards (an old ETag must not
+    match the rebuilt graph).
+    """
+    session.run("MATCH (n) WHERE NOT n:GraphMeta DETACH DELETE n")
 
 
 # -------------------------
 # Sanity checks / small utilities
 # -------------------------
 def get_counts(session):
+    # Single label / single type with unlabelled ends: answered from the count store.
     cypher = """
     CALL { MATCH (a:Article) RETURN count(a) AS articles }
     CALL { MATCH (au:Author) RETURN count(au) AS authors }
     CALL { MATCH (t:Topic) RETURN count(t) AS topics }
-    CALL { MATCH (:Author)-[r:DIRECTED]->(:Article) RETURN count(r) AS directed_rels }
-    CALL { MATCH (:Article)-[r:HAS_TOPIC]->(:Topic) RETURN count(r) AS topic_rels }
+    CALL { MATCH ()-[r:DIRECTED]->() RETURN count(r) AS directed_rels }
+    CALL { MATCH ()-[r:HAS_TOPIC]->() RETURN count(r) AS topic_rels }
     RETURN articles, authors, topics, directed_rels, topic_rels
     """
     return dict(session.run(cypher).single())
@@ -140,12 +249,15 @@ def seed_minimal_demo_data(session):
     """
     cypher = """
     MERGE (a:Author {wikidata_id: "DEMO_AUTHOR"})
-      ON CREATE SET a.name = "Demo Director"
+      ON CREATE SET a.name = "Demo Director", a.film_count = 0
     MERGE (f:Article {wikidata_id: "DEMO_FILM"})
-      ON CREATE SET f.title = "Demo Film", f.year = 2000
+      ON CREATE SET f.title = "Demo Film", f.year = 2000, f.director_count = 0, f.genre_count = 0
     MERGE (t:Topic {name: "Demo Genre"})
+      ON CREATE SET t.film_count = 0
     MERGE (a)-[:DIRECTED]->(f)
+      ON CREATE SET a.film_count = a.film_count + 1, f.director_count = f.director_count + 1
     MERGE (f)-[:HAS_TOPIC]->(t)
+      ON CREATE SET t.film_count = t.film_count + 1, f.genre_count = f.genre_count + 1
     """
     session.run(cypher)
 
@@ -177,6 +289,8 @@ def main():
 
         print("[Neo4j] Creating constraints and indexes...")
         create_constraints_and_indexes(session)
+        backfill_year_key(session)
+        backfill_degree_counters(session)
 
         counts = get_counts(session)
         print(f"[Neo4j] Current counts: {counts}")
@@ -192,6 +306,9 @@ def main():
             counts = get_counts(session)
             print(f"[Neo4j] Counts after demo seed: {counts}")
 
+        version = bump_graph_version(session)
+        print(f"[Neo4j] Graph version is now {version}")
+
     driver.close()
     print("[Neo4j] Seed finished.")
 
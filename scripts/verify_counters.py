@@ -0,0 +1,122 @@
+# scripts/verify_counters.py
+
+"""
+Verify (and optionally repair) the denormalized degree counters.
+
+The importer maintains, in the same transactions as the relationships:
+  Article.director_count   (:Author)-[:DIRECTED]->(article)
+  Article.genre_count      (article)-[:HAS_TOPIC]->(:Topic)
+  Author.film_count        (author)-[:DIRECTED]->(:Article)
+  Topic.film_count         (:Article)-[:HAS_TOPIC]->(topic)
+
+This script recomputes every counter from the node degrees, reports the
+nodes whose stored value drifted (or is missing, e.g. graphs imported before
+the counters existed) and, with --repair, rewrites them in batched
+transactions.
+
+Usage:
+    python scripts/verify_counters.py            # report, exit 1 on drift
+    python scripts/verify_counters.py --repair   # report and fix
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+from neo4j import GraphDatabase, basic_auth
+
+# (label, counter property, key property, degree pattern of n)
+COUNTERS = [
+    ("Article", "director_count", "wikidata_id", "(n)<-[:DIRECTED]-()"),
+    ("Article", "genre_count", "wikidata_id", "(n)-[:HAS_TOPIC]->()"),
+    ("Author", "film_count", "wikidata_id", "(n)-[:DIRECTED]->()"),
+    ("Topic", "film_count", "name", "(n)<-[:HAS_TOPIC]-()"),
+]
+
+SAMPLES = 5
+
+
+def get_driver():
+    """Create a Neo4j driver from environment variables."""
+    load_dotenv()
+    uri = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "password")
+    return GraphDatabase.driver(uri, auth=basic_auth(user, password))
+
+
+def _drift_cypher(label: str, prop: str, key: str, pattern: str) -> str:
+    return f"""
+    MATCH (n:{label})
+    WITH n, COUNT {{ {pattern} }} AS actual
+    WHERE n.{prop} IS NULL OR n.{prop} <> actual
+    RETURN count(n) AS drifted,
+           collect({{key: n.{key}, stored: n.{prop}, actual: actual}})[0..{SAMPLES}] AS samples
+    """
+
+
+def _repair_cypher(label: str, prop: str, pattern: str) -> str:
+    # CALL ... IN TRANSACTIONS: auto-commit, one transaction per batch.
+    return f"""
+    MATCH (n:{label})
+    WITH n, COUNT {{ {pattern} }} AS actual
+    WHERE n.{prop} IS NULL OR n.{prop} <> actual
+    CALL {{
+        WITH n, actual
+        SET n.{prop} = actual
+    }} IN TRANSACTIONS OF $batch_size ROWS
+    """
+
+
+def check_counters(session) -> list[dict]:
+    """One report per counter: {counter, checked, drifted, samples}."""
+    reports = []
+    for label, prop, key, pattern in COUNTERS:
+        checked = session.run(f"MATCH (n:{label}) RETURN count(n) AS n").single()["n"]
+        record = session.run(_drift_cypher(label, prop, key, pattern)).single()
+        reports.append(
+            {
+                "counter": f"{label}.{prop}",
+                "checked": checked,
+                "drifted": record["drifted"],
+                "samples": record["samples"],
+            }
+        )
+    return reports
+
+
+def repair_counters(session, batch_size: int = 10_000) -> None:
+    """Rewrite every drifted counter."""
+    for label, prop, _key, pattern in COUNTERS:
+        session.run(_repair_cypher(label, prop, pattern), batch_size=batch_size).consume()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify / repair the degree counters.")
+    parser.add_argument("--repair", action="store_true", help="Rewrite drifted counters")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="Nodes per transaction")
+    args = parser.parse_args()
+
+    driver = get_driver()
+    with driver.session() as session:
+        reports = check_counters(session)
+        print(json.dumps(reports, indent=2, default=str))
+        drifted = sum(report["drifted"] for report in reports)
+
+        if drifted and args.repair:
+            repair_counters(session, args.batch_size)
+            remaining = sum(report["drifted"] for report in check_counters(session))
+            print(f"[Counters] repaired {drifted - remaining} node counters, {remaining} left")
+            drifted = remaining
+    driver.close()
+
+    if drifted:
+        print(f"[Counters] {drifted} drifted counters (run with --repair)", file=sys.stderr)
+        sys.exit(1)
+    print("[Counters] all counters consistent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# tests/test_admission.py
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.admission import Bulkhead, _max_estimated_rows, cost_guard
+from app.metrics import metrics
+
+
+def test_bulkhead_queues_then_rejects_with_retry_after():
+    bulkhead = Bulkhead("test_bulkhead", max_concurrent=1, max_queue=1, queue_timeout=0.05)
+
+    async def scenario():
+        await bulkhead.acquire()                     # runs
+        queued = asyncio.ensure_future(bulkhead.acquire())
+        await asyncio.sleep(0)                       # waits in the queue
+
+        with pytest.raises(HTTPException) as full:   # queue is full
+            await bulkhead.acquire()
+        assert full.value.status_code == 503
+        assert full.value.headers["Retry-After"] == "1"
+
+        with pytest.raises(HTTPException):          # queued request times out
+            await queued
+
+        bulkhead.release()
+        await bulkhead.acquire()                     # slot is free again
+        bulkhead.release()
+
+    asyncio.run(scenario())
+
+    assert metrics.counter("admission.test_bulkhead.rejected_queue_full") == 1
+    assert metrics.counter("admission.test_bulkhead.rejected_timeout") == 1
+    assert metrics.counter("admission.test_bulkhead.admitted") == 2
+    assert metrics.snapshot()["timings"]["admission.test_bulkhead.queue_time"]["count"] == 1
+
+
+def test_max_estimated_rows_walks_the_plan_tree():
+    plan = {
+        "args": {"EstimatedRows": 10.0},
+        "children": [{"args": {"EstimatedRows": 5000.0}, "children": []}],
+    }
+    assert _max_estimated_rows(plan) == 5000.0
+
+
+class _ExplainSession:
+    """Answers EXPLAIN with a one-operator plan estimating `rows` rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.params = None
+
+    def run(self, cypher, params=None, **kwargs):
+        assert cypher.startswith("EXPLAIN ")
+        self.params = {**(params or {}), **kwargs}
+        return self
+
+    def consume(self):
+        return type("Summary", (), {"plan": {"args": {"EstimatedRows": self.rows}}})()
+
+
+def test_cost_guard_takes_any_query_parameter_name(monkeypatch):
+    # The topic graph query has a $name parameter.
+    params = {"name": "drama film", "route": "x", "cypher": "y", "limit": 2}
+    session = _ExplainSession(rows=10)
+
+    cost_guard("test_cost", session, "MATCH (t:Topic {name: $name}) RETURN t", params)
+    assert session.params is None  # disabled: no EXPLAIN
+
+    monkeypatch.setenv("ADMISSION_MAX_ESTIMATED_ROWS", "100")
+    cost_guard("test_cost", session, "MATCH (t:Topic {name: $name}) RETURN t", params)
+    assert session.params == params
+
+    session.rows = 1000
+    with pytest.raises(HTTPException) as rejected:
+        cost_guard("test_cost", session, "MATCH (t:Topic {name: $name}) RETURN t", params)
+    assert rejected.value.status_code == 503
+    assert metrics.counter("admission.test_cost.rejected_cost") == 1
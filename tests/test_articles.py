@@ -72,3 +72,33 @@ def test_related_films_with_valid_key_returns_200():
     film_id = _get_any_film_id()
     response = client.get(f"/api/articles/{film_id}/related", headers={"X-API-Key": api_key})
     assert response.status_code == 200
+
+
+def test_related_films_batch_reports_missing_ids_inline():
+    api_key = os.getenv("API_KEY")
+    assert api_key, "API_KEY must be set in the environment to run this test"
+    film_id = _get_any_film_id()
+
+    response = client.post(
+        "/api/articles/related:batch",
+        json={"film_ids": [film_id, "Q_DOES_NOT_EXIST"], "limit": 5},
+        headers={"X-API-Key": api_key},
+    )
+    assert response.status_code == 200
+
+    payload = response.json()
+    assert [r["film_id"] for r in payload["results"]] == [film_id, "Q_DOES_NOT_EXIST"]
+    assert payload["results"][0]["found"] is True
+    assert payload["results"][1] == {
+        "film_id": "Q_DOES_NOT_EXIST",
+        "related": [],
+        "found": False,
+    }
+    assert payload["missing"] == ["Q_DOES_NOT_EXIST"]
+
+    single = client.get(
+        f"/api/articles/{film_id}/related",
+        params={"limit": 5},
+        headers={"X-API-Key": api_key},
+    ).json()
+    assert payload["results"][0]["related"] == single["related"]
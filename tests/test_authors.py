@@ -2,6 +2,7 @@
 import os
 from neo4j import GraphDatabase
 from starlette.testclient import TestClient
+from app.jobs.timelines import rebuild_timelines
 from app.main import app
 
 client = TestClient(app)
@@ -54,3 +55,73 @@ def test_director_contributions_returns_data():
 def test_director_contributions_unknown_director_404():
     response = client.get("/api/authors/Q_DOES_NOT_EXIST/contributions")
     assert response.status_code == 404
+
+
+def test_director_contributions_cursor_pages_do_not_overlap():
+    director_id = _get_any_director_id()
+
+    seen = []
+    cursor = None
+    for _ in range(50):
+        params = {"limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/api/authors/{director_id}/contributions", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(f["wikidata_id"] for f in data["films"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) >= 1
+    assert len(seen) == len(set(seen))
+
+
+def test_director_contributions_invalid_cursor_400():
+    director_id = _get_any_director_id()
+    response = client.get(
+        f"/api/authors/{director_id}/contributions",
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+
+
+def test_similar_directors_contract():
+    director_id = _get_any_director_id()
+
+    response = client.get(f"/api/authors/{director_id}/similar", params={"limit": 5})
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["director"]["wikidata_id"] == director_id
+    assert len(data["similar"]) <= 5
+    scores = [item["score"] for item in data["similar"]]
+    assert scores == sorted(scores, reverse=True)
+    assert all(item["director"]["wikidata_id"] != director_id for item in data["similar"])
+
+
+def test_similar_directors_unknown_director_404():
+    response = client.get("/api/authors/Q_DOES_NOT_EXIST/similar")
+    assert response.status_code == 404
+
+
+def test_director_timeline_counts_every_film():
+    rebuild_timelines()
+    director_id = _get_any_director_id()
+    response = client.get(f"/api/authors/{director_id}/timeline")
+    assert response.status_code == 200
+
+    data = response.json()
+    films = client.get(
+        f"/api/authors/{director_id}/contributions", params={"limit": 200}
+    ).json()["films"]
+    assert sum(item["films"] for item in data["decades"]) + data["undated"] == len(films)
+    for film in films:
+        if film["year"] is not None:
+            assert film["year"] // 10 * 10 in [item["decade"] for item in data["decades"]]
+
+
+def test_director_timeline_unknown_director_404():
+    response = client.get("/api/authors/Q__does_not_exist__/timeline")
+    assert response.status_code == 404
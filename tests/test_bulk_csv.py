@@ -0,0 +1,69 @@
+# tests/test_bulk_csv.py
+
+import csv
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from bulk_csv import ExternalSorter, write_bulk_csv  # noqa: E402
+
+
+def _row(film, director, genre, year=2000):
+    return {
+        "film_id": film,
+        "film_title": f"Title, \"{film}\"",
+        "year": year,
+        "director_id": director,
+        "director_name": f"Name {director}",
+        "genre_name": genre,
+    }
+
+
+def _read(path):
+    with open(path, encoding="utf-8", newline="") as handle:
+        return list(csv.reader(handle))
+
+
+def test_external_sorter_spills_and_keeps_first_value(tmp_path):
+    with ExternalSorter(lambda r: (r[0],), chunk_size=3, tmp_dir=str(tmp_path)) as sorter:
+        for i in range(20):
+            sorter.add((f"k{i % 7}", i))
+        assert len(sorter.runs) == 6
+        unique = list(sorter.unique())
+    assert [key for key, _ in unique] == sorted(f"k{i}" for i in range(7))
+    assert all(value == int(key[1:]) for key, value in unique)
+    assert not list(tmp_path.iterdir())
+
+
+def test_bulk_csv_dedups_and_counts(tmp_path):
+    rows = [
+        _row("Q1", "Q10", "drama"),
+        _row("Q1", "Q10", "comedy"),
+        _row("Q1", "Q11", "drama"),
+        _row("Q2", "Q10", "drama", year=None),
+        _row("Q2", "Q10", None, year=None),
+        _row("Q3", "Q12", None),
+    ] * 3  # every row repeated, across sort runs
+    manifest = write_bulk_csv(rows, str(tmp_path), version=4, chunk_size=4)
+
+    assert manifest["counts"]["spilled_runs"] > 0
+    assert manifest["counts"] == {
+        **manifest["counts"],
+        "rows": 18, "Article": 3, "Author": 3, "Topic": 2, "DIRECTED": 4, "HAS_TOPIC": 3,
+    }
+    assert manifest["command"].startswith("neo4j-admin database import full")
+
+    articles = _read(tmp_path / "articles.csv")
+    assert articles[0][0] == "wikidata_id:ID(Article)"
+    assert articles[1:] == [
+        ["Q1", 'Title, "Q1"', "2000", "2000", "2", "2", "4", "Article"],
+        ["Q2", 'Title, "Q2"', "", "-1", "1", "1", "4", "Article"],
+        ["Q3", 'Title, "Q3"', "2000", "2000", "1", "0", "4", "Article"],
+    ]
+    authors = {row[0]: row[2] for row in _read(tmp_path / "authors.csv")[1:]}
+    assert authors == {"Q10": "2", "Q11": "1", "Q12": "1"}
+    topics = {row[0]: row[1] for row in _read(tmp_path / "topics.csv")[1:]}
+    assert topics == {"comedy": "1", "drama": "2"}
+    assert len(_read(tmp_path / "directed.csv")) == 5
+    assert not list(tmp_path.glob("bulk-run-*"))
@@ -0,0 +1,68 @@
+# tests/test_cache.py
+
+from app import cache
+from app.cache import ResponseCache, load_hot_keys
+from app.routers.llm import INTENTS
+from app.warmup import planned_queries
+
+
+class _Version:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def test_entries_are_only_served_for_their_graph_version(monkeypatch):
+    version = _Version(1)
+    monkeypatch.setattr(cache, "graph_version", version)
+    response_cache = ResponseCache(max_entries=10)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {"n": len(loads)}
+
+    params = {"film_id": "Q1", "limit": 10}
+    assert response_cache.get_or_load("/related", params, load) == {"n": 1}
+    assert response_cache.get_or_load("/related", params, load) == {"n": 1}
+
+    version.value = 2  # re-import: stale entry is never served
+    assert response_cache.get_or_load("/related", params, load) == {"n": 2}
+
+    version.value = None  # unversioned graph: no caching at all
+    response_cache.get_or_load("/related", params, load)
+    response_cache.get_or_load("/related", params, load)
+    assert len(loads) == 4
+
+
+def test_lru_eviction():
+    response_cache = ResponseCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        response_cache.put(key, 1, key)
+    assert response_cache.get("a", 1) == (False, None)
+    assert response_cache.get("c", 1) == (True, "c")
+    assert len(response_cache) == 2
+
+
+def test_hot_keys_round_trip(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache, "graph_version", _Version(1))
+    response_cache = ResponseCache(max_entries=10)
+    for film_id, hits in (("Q1", 3), ("Q2", 1), ("Q3", 2)):
+        for _ in range(hits):
+            response_cache.get_or_load("/related", {"film_id": film_id, "limit": 10}, dict)
+
+    path = tmp_path / "hot_keys.json"
+    assert response_cache.save_hot_keys(path, limit=2) == 2
+    assert load_hot_keys(path) == [
+        {"route": "/related", "params": {"film_id": "Q1", "limit": 10}},
+        {"route": "/related", "params": {"film_id": "Q3", "limit": 10}},
+    ]
+    assert load_hot_keys(tmp_path / "missing.json") == []
+
+
+def test_warmup_plans_every_router_query():
+    names = [name for name, _, _ in planned_queries()]
+    assert {"search", "authors", "related", "topic_graph_1", "topic_graph_2"} <= set(names)
+    assert {f"llm.{intent.name}" for intent in INTENTS} <= set(names)
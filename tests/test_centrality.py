@@ -0,0 +1,39 @@
+# tests/test_centrality.py
+
+import numpy as np
+
+from app.services.centrality import pagerank
+
+
+def _dense_pagerank(size, edges, damping=0.85, iterations=200):
+    """Reference implementation on the dense transition matrix."""
+    matrix = np.zeros((size, size))
+    for u, v, w in edges:
+        matrix[u, v] += w
+        matrix[v, u] += w
+    out = matrix.sum(axis=1)
+    transition = np.where(out[:, None] > 0, matrix / np.where(out == 0, 1, out)[:, None], 1 / size)
+    rank = np.full(size, 1 / size)
+    for _ in range(iterations):
+        rank = (1 - damping) / size + damping * rank @ transition
+    return rank
+
+
+def test_pagerank_matches_dense_reference():
+    # Two directors (0, 1), three films (2, 3, 4), two genres (5, 6), one isolated node (7)
+    edges = [(0, 2, 1.0), (0, 3, 1.0), (1, 4, 1.0)]
+    edges += [(2, 5, 0.5), (3, 5, 0.5), (4, 5, 0.5), (4, 6, 0.5)]
+    sources, targets, weights = (np.array(column) for column in zip(*edges))
+
+    ranks, iterations = pagerank(8, sources, targets, weights)
+
+    assert iterations < 200
+    assert abs(ranks.sum() - 1.0) < 1e-9
+    assert np.allclose(ranks, _dense_pagerank(8, edges), atol=1e-7)
+    # The director of two films outranks the director of one.
+    assert ranks[0] > ranks[1]
+
+
+def test_pagerank_of_empty_graph():
+    ranks, iterations = pagerank(0, np.array([]), np.array([]), np.array([]))
+    assert ranks.size == 0 and iterations == 0
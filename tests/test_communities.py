@@ -0,0 +1,47 @@
+# tests/test_communities.py
+
+import itertools
+
+from app.services.communities import louvain, modularity_contributions
+
+
+def _three_cliques():
+    groups = [[f"a{i}" for i in range(5)], [f"b{i}" for i in range(4)], [f"c{i}" for i in range(6)]]
+    edges = [(u, v, 3.0) for group in groups for u, v in itertools.combinations(group, 2)]
+    # Weak bridges between the cliques
+    edges += [("a0", "b0", 1.0), ("b1", "c0", 1.0), ("c1", "a2", 1.0)]
+    return groups, edges
+
+
+def test_louvain_finds_weakly_linked_cliques():
+    groups, edges = _three_cliques()
+
+    communities = louvain([n for group in groups for n in group] + ["lonely"], edges)
+
+    for group in groups:
+        assert len({communities[node] for node in group}) == 1
+    assert len(set(communities.values())) == 4
+    # Ids by size: the 6-clique first, the isolated genre last.
+    assert communities["c0"] == 0 and communities["lonely"] == 3
+
+
+def test_modularity_contributions_sum_to_modularity():
+    groups, edges = _three_cliques()
+    communities = louvain([n for group in groups for n in group], edges)
+
+    contributions = modularity_contributions(edges, communities)
+
+    # Q = sum_c [L_c / m - (d_c / 2m)^2]
+    m = sum(w for _, _, w in edges)
+    expected = 0.0
+    for c in set(communities.values()):
+        inside = sum(w for u, v, w in edges if communities[u] == communities[v] == c)
+        degree = sum(w for u, v, w in edges for n in (u, v) if communities[n] == c)
+        expected += inside / m - (degree / (2 * m)) ** 2
+    assert abs(sum(contributions.values()) - expected) < 1e-9
+    assert all(contributions[node] > 0 for node in contributions)
+
+
+def test_directed_duplicates_count_once():
+    edges = [("x", "y", 2.0), ("y", "x", 2.0), ("y", "z", 1.0)]
+    assert louvain(["x", "y", "z"], edges) == louvain(["x", "y", "z"], edges[:1] + edges[2:])
@@ -0,0 +1,84 @@
+# tests/test_etag.py
+
+from fastapi import Depends, FastAPI
+from starlette.testclient import TestClient
+
+from app import etag
+from app.etag import compute_etag, conditional_get, etag_matches
+from app.metrics import metrics
+from app.serialization import render
+from app.models.schemas import Genre
+
+
+class _Version:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def _client(monkeypatch, version):
+    monkeypatch.setattr(etag, "graph_version", version)
+    test_app = FastAPI()
+    cache_headers = conditional_get("test_etag")
+    calls = []
+
+    @test_app.get("/genres/{name}", dependencies=[Depends(cache_headers)])
+    def get_genre(name: str, headers: dict = Depends(cache_headers)):
+        calls.append(name)
+        return render({"name": name}, Genre, "test", headers=headers)
+
+    return TestClient(test_app), calls
+
+
+def test_if_none_match_is_answered_with_304_without_running_the_handler(monkeypatch):
+    client, calls = _client(monkeypatch, _Version(3))
+
+    first = client.get("/genres/drama", params={"b": 1, "a": 2})
+    assert first.status_code == 200
+    assert first.headers["etag"].startswith('W/"v3-')
+    assert first.headers["cache-control"] == "public, max-age=60"
+
+    # Same request, query parameters in another order: same tag.
+    second = client.get(
+        "/genres/drama?a=2&b=1", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == first.headers["etag"]
+    assert calls == ["drama"]
+    assert metrics.counter("http.etag.test_etag.not_modified") == 1
+
+
+def test_new_graph_version_invalidates_tags(monkeypatch):
+    version = _Version(3)
+    client, _ = _client(monkeypatch, version)
+    tag = client.get("/genres/drama").headers["etag"]
+
+    version.value = 4
+    response = client.get("/genres/drama", headers={"If-None-Match": tag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != tag
+
+
+def test_wildcard_if_none_match_runs_the_handler(monkeypatch):
+    client, calls = _client(monkeypatch, _Version(3))
+    response = client.get("/genres/drama", headers={"If-None-Match": "*"})
+    assert response.status_code == 200
+    assert calls == ["drama"]
+
+
+def test_unversioned_graph_sends_no_validators(monkeypatch):
+    client, _ = _client(monkeypatch, _Version(None))
+    response = client.get("/genres/drama", headers={"If-None-Match": "*"})
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+def test_etag_matching_is_weak_and_accepts_lists():
+    tag = compute_etag(7, "request")
+    assert etag_matches(f'"x", {tag.removeprefix("W/")}', tag)
+    assert not etag_matches("*", tag)
+    assert not etag_matches(compute_etag(8, "request"), tag)
+    assert not etag_matches(None, tag)
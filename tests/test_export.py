@@ -0,0 +1,47 @@
+# tests/test_export.py
+
+import gzip
+import json
+import tracemalloc
+
+from app.routers.export import ndjson_chunks
+
+
+def _synthetic_graph(n_films: int):
+    """Lazily generated export rows, the shape the topic export Cypher returns."""
+    for i in range(n_films):
+        yield {
+            "wikidata_id": f"Q{i}",
+            "title": f"Synthetic film {i}",
+            "year": 1900 + i % 120,
+            "directors": [f"Q{10_000_000 + i % 5000}"],
+            "genres": ["drama film", f"genre {i % 300}"],
+        }
+
+
+def _peak_memory_while_streaming(n_films: int, compress: bool) -> int:
+    tracemalloc.start()
+    try:
+        for _ in ndjson_chunks(_synthetic_graph(n_films), gzip=compress):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_ndjson_chunks_round_trip():
+    body = b"".join(ndjson_chunks(_synthetic_graph(1000)))
+    lines = body.decode("utf-8").splitlines()
+    assert len(lines) == 1000
+    assert json.loads(lines[0])["wikidata_id"] == "Q0"
+
+    compressed = b"".join(ndjson_chunks(_synthetic_graph(1000), gzip=True))
+    assert gzip.decompress(compressed) == body
+
+
+def test_ndjson_export_memory_is_flat_in_result_size():
+    for compress in (False, True):
+        small = _peak_memory_while_streaming(10_000, compress)
+        large = _peak_memory_while_streaming(100_000, compress)
+        # 10x more rows must not mean more memory: only one chunk is buffered.
+        assert large < small * 1.5 + 64 * 1024, (compress, small, large)
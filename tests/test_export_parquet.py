@@ -0,0 +1,28 @@
+# tests/test_export_parquet.py
+
+import sys
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from export_parquet import TableWriter, _schemas  # noqa: E402  pylint: disable=wrong-import-position
+
+
+def test_table_writer_writes_one_row_group_per_chunk(tmp_path):
+    schema = _schemas()["nodes_article"]
+    path = tmp_path / "nodes_article.parquet"
+
+    writer = TableWriter(path, schema, "parquet")
+    writer.write([{"wikidata_id": "Q1", "title": "A", "year": 1999, "graph_version": 1}])
+    writer.write([])
+    writer.write([{"wikidata_id": "Q2", "title": "B", "year": None, "graph_version": 2}])
+    writer.close()
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 2
+    assert writer.rows == 2
+
+    frame = parquet.read().to_pandas()
+    assert list(frame["wikidata_id"]) == ["Q1", "Q2"]
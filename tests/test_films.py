@@ -0,0 +1,47 @@
+# tests/test_films.py
+
+from starlette.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_films_year_range_is_sorted_and_bounded():
+    response = client.get("/api/films", params={"year_from": 1950, "year_to": 2020, "limit": 20})
+    assert response.status_code == 200
+
+    films = response.json()["films"]
+    keys = [(f["year"], f["wikidata_id"]) for f in films]
+    assert keys == sorted(keys)
+    assert all(1950 <= f["year"] <= 2020 for f in films)
+
+
+def test_films_cursor_pages_do_not_overlap():
+    first = client.get("/api/films", params={"limit": 3}).json()
+    if first["next_cursor"] is None:
+        return
+    second = client.get("/api/films", params={"limit": 3, "cursor": first["next_cursor"]}).json()
+
+    first_keys = [(f["year"], f["wikidata_id"]) for f in first["films"]]
+    second_keys = [(f["year"], f["wikidata_id"]) for f in second["films"]]
+    assert not set(first_keys) & set(second_keys)
+    assert not second_keys or max(first_keys) < min(second_keys)
+
+
+def test_films_genre_and_director_filters():
+    film = client.get("/api/films", params={"limit": 1}).json()["films"][0]
+    params = {"year_from": film["year"], "year_to": film["year"], "limit": 100}
+    if film["genres"]:
+        genre = film["genres"][0]["name"]
+        films = client.get("/api/films", params={**params, "genre": genre}).json()["films"]
+        assert film["wikidata_id"] in [f["wikidata_id"] for f in films]
+        assert all(genre in [g["name"] for g in f["genres"]] for f in films)
+    if film["directors"]:
+        director = film["directors"][0]["wikidata_id"]
+        films = client.get("/api/films", params={**params, "director": director}).json()["films"]
+        assert film["wikidata_id"] in [f["wikidata_id"] for f in films]
+
+
+def test_films_inverted_range_400():
+    response = client.get("/api/films", params={"year_from": 2000, "year_to": 1990})
+    assert response.status_code == 400
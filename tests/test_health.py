@@ -1,6 +1,7 @@
 # tests/test_health.py
 
 from fastapi.testclient import TestClient
+from app import main
 from app.main import app
 
 client = TestClient(app)
@@ -12,3 +13,15 @@ def test_health_ok():
     data = response.json()
     assert data["status"] == "ok"
     assert data["neo4j"] in ("up", "down")  # en pratique: "up"
+
+
+def test_ready_is_503_until_warmup_is_done(monkeypatch):
+    pending = type(main.warmup)()
+    monkeypatch.setattr(main, "warmup", pending)
+    assert client.get("/ready").status_code == 503
+
+    pending.steps["planned_queries"] = 7
+    pending.mark_ready()
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "warmup": {"planned_queries": 7}}
@@ -0,0 +1,225 @@
+# tests/test_import_pipeline.py
+
+import json
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from neo4j.exceptions import TransientError
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from import_pipeline import run_pipeline, year_partitions  # noqa: E402
+from import_wikidata import IMPORT_CYPHER, import_pipelined  # noqa: E402
+
+ENTITY = "http://www.wikidata.org/entity/"
+GENRES = ["drama", "comedy", "horror", "western", None]
+
+
+def _binding(i):
+    year = None if i % 7 == 0 else 1990 + i % 40
+    genre = GENRES[i % len(GENRES)]
+    binding = {
+        "film": {"value": f"{ENTITY}Q{i}"},
+        "filmLabel": {"value": f"Film {i}"},
+        "director": {"value": f"{ENTITY}Q{100000 + i % 13}"},
+        "directorLabel": {"value": f"Director {i % 13}"},
+    }
+    if year is not None:
+        binding["pubDate"] = {"value": f"{year}-01-01T00:00:00Z"}
+    if genre is not None:
+        binding["genreLabel"] = {"value": genre}
+    return binding
+
+
+# Q5 twice in a row: duplicates within a batch are dropped before writing.
+DATASET = [_binding(i) for i in range(1, 6)] + [_binding(i) for i in range(5, 301)]
+
+
+class StubSparql(BaseHTTPRequestHandler):
+    """Evaluates the partition filters / paging of the importer queries."""
+
+    fail_first = True
+    lock = threading.Lock()
+    requests = 0
+
+    def do_GET(self):  # noqa: N802
+        with StubSparql.lock:
+            StubSparql.requests += 1
+            fail = StubSparql.fail_first
+            StubSparql.fail_first = False
+        if fail:
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        query = parse_qs(urlparse(self.path).query)["query"][0]
+        low = re.search(r"YEAR\(\?pubDate\) >= (\d+)", query)
+        high = re.search(r"YEAR\(\?pubDate\) < (\d+)", query)
+        undated = "FILTER NOT EXISTS" in query
+
+        def year(binding):
+            return int(binding["pubDate"]["value"][:4]) if "pubDate" in binding else None
+
+        rows = [
+            b for b in DATASET
+            if (year(b) is None) == undated
+            and (undated or ((not low or year(b) >= int(low.group(1)))
+                             and (not high or year(b) < int(high.group(1)))))
+        ]
+        limit = int(re.search(r"LIMIT (\d+)", query).group(1))
+        offset = int(re.search(r"OFFSET (\d+)", query).group(1))
+        body = json.dumps({"results": {"bindings": rows[offset:offset + limit]}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/sparql-results+json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    StubSparql.fail_first = True
+    StubSparql.requests = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSparql)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/sparql"
+    server.shutdown()
+
+
+def test_pipeline_imports_every_row_once_partitioned_by_genre(endpoint):
+    written = []
+    lock = threading.Lock()
+    deadlocked = []
+
+    def write(writer, rows):
+        with lock:
+            if not deadlocked:
+                deadlocked.append(writer)
+                raise TransientError("deadlock detected")
+            written.append((writer, rows))
+
+    stats = run_pipeline(
+        year_partitions(2000, 2020, 10),
+        endpoint,
+        write,
+        fetchers=3,
+        writers=3,
+        batch_size=20,
+        page_size=25,
+        retry_backoff=0.01,
+    )
+
+    keys = [
+        (row["film_id"], row["director_id"], row["genre_name"])
+        for _, rows in written
+        for row in rows
+    ]
+    assert len(keys) == len(set(keys)) == 300
+    assert stats.rows == 300 and stats.duplicates == 1
+    assert stats.partitions == 5 and stats.http_retries == 1
+    assert stats.write_retries == 1 and stats.transactions == stats.batches + 1
+    assert all(len(rows) <= 20 for _, rows in written)
+
+    writers_of_genre = {}
+    for writer, rows in written:
+        for row in rows:
+            if row["genre_name"] is not None:
+                writers_of_genre.setdefault(row["genre_name"], set()).add(writer)
+    assert all(len(writers) == 1 for writers in writers_of_genre.values())
+    assert set(stats.stage_seconds) == {"fetch", "transform", "write"}
+
+
+def test_pipeline_stops_on_writer_error(endpoint):
+    def write(_writer, _rows):
+        raise ValueError("constraint violation")
+
+    with pytest.raises(ValueError):
+        run_pipeline(
+            year_partitions(2000, 2020, 10),
+            endpoint,
+            write,
+            fetchers=2,
+            writers=2,
+            batch_size=5,
+            page_size=10,
+            queue_size=1,
+            retry_backoff=0.01,
+        )
+
+
+class _Result:
+    def single(self):
+        return None
+
+    def consume(self):
+        return None
+
+
+class _Transaction:
+    def __init__(self, log):
+        self.log = log
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, cypher, **_params):
+        self.log.append(cypher)
+        return _Result()
+
+    def commit(self):
+        pass
+
+
+class _Session(_Transaction):
+    def begin_transaction(self):
+        return _Transaction(self.log)
+
+
+class _Driver:
+    """Records every statement, in order, across sessions and writer threads."""
+
+    def __init__(self):
+        self.log = []
+
+    def session(self):
+        return _Session(self.log)
+
+
+def _unique_constraint(label, prop):
+    return re.compile(
+        rf"CREATE CONSTRAINT .*FOR\s*\((\w+):{label}\)\s*REQUIRE\s+\1\.{prop}\s+IS UNIQUE",
+        re.DOTALL,
+    )
+
+
+def test_pipelined_import_creates_the_constraints_before_writing(endpoint):
+    driver = _Driver()
+    stats, version = import_pipelined(
+        driver,
+        year_partitions(2000, 2020, 10),
+        endpoint,
+        fetchers=2,
+        writers=3,
+        batch_size=20,
+        page_size=25,
+        retry_backoff=0.01,
+    )
+
+    assert stats.rows == 300 and version == 1
+    first_write = driver.log.index(IMPORT_CYPHER)
+    schema = driver.log[:first_write]
+    # Concurrent writers MERGE the same films / directors: without these the
+    # first load creates duplicates.
+    for label, prop in (("Article", "wikidata_id"), ("Author", "wikidata_id"), ("Topic", "name")):
+        assert any(_unique_constraint(label, prop).search(cypher) for cypher in schema), label
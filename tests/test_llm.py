@@ -0,0 +1,39 @@
+# tests/test_llm.py
+
+import pytest
+from fastapi import HTTPException
+
+from app.metrics import metrics
+from app.routers.llm import INTENTS, _nl_to_cypher
+
+
+def test_questions_compile_to_parameterized_templates():
+    intent_a, params_a = _nl_to_cypher("Films by director Q123", 5)
+    intent_b, params_b = _nl_to_cypher("films   by director q456", 10)
+
+    # Same query text for every director: one Neo4j plan per intent.
+    assert intent_a is intent_b
+    assert params_a == {"id": "Q123", "limit": 5}
+    assert params_b == {"id": "Q456", "limit": 10}
+    assert "Q123" not in intent_a.cypher and "$id" in intent_a.cypher
+
+
+def test_translation_cache_hits_on_repeated_questions():
+    _nl_to_cypher("top genres please", 5)
+    hits = metrics.snapshot()["gauges"]["llm.translation_cache.hits"]
+    intent, params = _nl_to_cypher("Top   genres PLEASE", 7)
+
+    assert intent.name == "top_genres"
+    assert params == {"limit": 7}
+    assert metrics.snapshot()["gauges"]["llm.translation_cache.hits"] == hits + 1
+
+
+def test_unsupported_or_incomplete_questions_are_rejected():
+    with pytest.raises(HTTPException):
+        _nl_to_cypher("what is the meaning of life", 5)
+    with pytest.raises(HTTPException):
+        _nl_to_cypher("related films of that one", 5)
+
+
+def test_intent_registry_covers_the_documented_questions():
+    assert {intent.name for intent in INTENTS} == {"films_by_director", "related_films", "top_genres"}
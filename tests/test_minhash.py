@@ -0,0 +1,59 @@
+# tests/test_minhash.py
+
+import random
+
+from app.jobs.similar_directors import build_similar_directors, director_profile
+from app.services.minhash import MinHasher, evaluate, jaccard, multiset_tokens
+
+GENRES = ["drama", "comedy", "horror", "western", "thriller", "musical", "war", "noir"]
+
+
+def _synthetic_profiles(count, seed=3):
+    """Directors drawn from a few genre "schools", with some shared films."""
+    rng = random.Random(seed)
+    profiles = {}
+    for i in range(count):
+        school = GENRES[i % 4 : i % 4 + 3]
+        genres = [rng.choice(school) for _ in range(rng.randint(3, 12))]
+        films = [f"Q{rng.randint(0, count * 4)}" for _ in range(len(genres))]
+        profiles[f"D{i}"] = director_profile(films, genres)
+    return profiles
+
+
+def test_multiset_tokens_keep_multiplicity():
+    assert multiset_tokens(["drama", "drama", "war"], "g") == ["g:drama#1", "g:drama#2", "g:war#1"]
+
+
+def test_signature_agreement_estimates_jaccard():
+    hasher = MinHasher(bands=32, rows=8)
+    a = {f"t{i}" for i in range(100)}
+    b = {f"t{i}" for i in range(50, 150)}
+
+    estimate = (hasher.signature(a) == hasher.signature(b)).mean()
+    assert abs(estimate - jaccard(a, b)) < 0.08
+    # Seeded: signatures are stable across processes and runs.
+    assert (MinHasher(bands=32, rows=8).signature(a) == hasher.signature(a)).all()
+
+
+def test_lsh_top_k_matches_exact_jaccard_on_a_sample():
+    profiles = _synthetic_profiles(400)
+
+    neighbours, index = build_similar_directors(profiles, bands=32, rows=2, top_k=5, min_score=0.2)
+    report = evaluate(profiles, neighbours, k=5, sample_size=100, min_score=0.2)
+
+    assert len(index) == 400
+    assert report["recall_at_k"] >= 0.9
+    assert report["mean_abs_error"] == 0  # candidates are scored exactly
+    for director_id, top in neighbours.items():
+        assert len(top) <= 5 and all(other != director_id for other, _ in top)
+        assert [score for _, score in top] == sorted((score for _, score in top), reverse=True)
+
+
+def test_more_bands_raise_recall():
+    profiles = _synthetic_profiles(300)
+
+    def recall(bands, rows):
+        neighbours, _ = build_similar_directors(profiles, bands, rows, top_k=5, min_score=0.2)
+        return evaluate(profiles, neighbours, k=5, sample_size=100, min_score=0.2)["recall_at_k"]
+
+    assert recall(bands=2, rows=8) < recall(bands=16, rows=2)
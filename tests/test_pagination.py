@@ -0,0 +1,24 @@
+# tests/test_pagination.py
+
+import pytest
+from fastapi import HTTPException
+
+from app.pagination import MISSING_YEAR, decode_cursor, encode_cursor, year_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(1999, "Q42")
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == [1999, "Q42"]
+    assert decode_cursor(None, 2) is None
+
+
+def test_year_cursor_sorts_missing_years_last():
+    assert decode_cursor(year_cursor({"wikidata_id": "Q1", "year": None}), 2) == [MISSING_YEAR, "Q1"]
+
+
+@pytest.mark.parametrize("cursor", ["%%%", encode_cursor("Q1"), encode_cursor(1, 2, 3)])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, 2)
+    assert exc.value.status_code == 400
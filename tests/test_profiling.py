@@ -0,0 +1,92 @@
+# tests/test_profiling.py
+
+import threading
+import time
+
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from app.main import app
+from app.profiling import ProfilerMiddleware, SamplingProfiler, request_profiler
+
+
+def _busy_loop(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+    return n
+
+
+def _profiled_app(profiler: SamplingProfiler) -> FastAPI:
+    demo = FastAPI()
+    demo.add_middleware(ProfilerMiddleware, profiler=profiler)
+
+    @demo.get("/busy/{item_id}")
+    def busy(item_id: str):
+        return {"id": item_id, "n": _busy_loop(0.05)}
+
+    return demo
+
+
+def test_profiler_aggregates_samples_per_route_template():
+    profiler = SamplingProfiler(sample_rate=1.0, interval_ms=1)
+    client = TestClient(_profiled_app(profiler))
+
+    for item_id in ("a", "b"):
+        assert client.get(f"/busy/{item_id}").status_code == 200
+
+    stats = profiler.stats()
+    assert stats["routes"]["/busy/{item_id}"]["requests"] == 2
+    assert stats["routes"]["/busy/{item_id}"]["samples"] > 0
+    assert stats["overhead_ratio"] >= 0.0
+
+    collapsed = profiler.collapsed("/busy/{item_id}")
+    assert "test_profiling:_busy_loop" in collapsed
+    stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+    assert stack and int(count) > 0
+
+
+def _background_work(stop: threading.Event) -> None:
+    while not stop.is_set():
+        _busy_loop(0.01)
+
+
+def test_profiler_only_samples_the_profiled_request():
+    profiler = SamplingProfiler(sample_rate=1.0, interval_ms=1)
+    client = TestClient(_profiled_app(profiler))
+    stop = threading.Event()
+    other = threading.Thread(target=_background_work, args=(stop,))
+    other.start()
+    try:
+        assert client.get("/busy/a").status_code == 200
+    finally:
+        stop.set()
+        other.join()
+
+    collapsed = profiler.collapsed("/busy/{item_id}")
+    assert "test_profiling:_busy_loop" in collapsed
+    assert "_background_work" not in collapsed
+
+
+def test_profiler_disabled_by_default_rate():
+    profiler = SamplingProfiler(sample_rate=0.0)
+    client = TestClient(_profiled_app(profiler))
+
+    assert client.get("/busy/x").status_code == 200
+    assert profiler.stats()["routes"] == {}
+
+
+def test_admin_profiles_requires_api_key(monkeypatch):
+    monkeypatch.setenv("API_KEY", "secret")
+    client = TestClient(app)
+
+    assert client.get("/api/admin/profiles").status_code == 401
+
+    response = client.get("/api/admin/profiles", headers={"X-API-Key": "secret"})
+    assert response.status_code == 200
+    assert response.json()["sample_rate"] == request_profiler.sample_rate
+
+    response = client.get("/api/admin/profiles/collapsed", headers={"X-API-Key": "secret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
@@ -0,0 +1,129 @@
+# tests/test_scheduler.py
+
+import asyncio
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from app import scheduler as scheduler_module
+from app.database.neo4j import get_driver
+from app.metrics import metrics
+from app.scheduler import Job, Neo4jLease, Scheduler
+
+
+class _Version:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class _Lease:
+    """In-memory lease: `held` names are owned by another worker."""
+
+    def __init__(self, held=(), last_version=None):
+        self.held = set(held)
+        self.last_version = last_version
+        self.released = []
+
+    def acquire(self, name, seconds):
+        return None if name in self.held else {"last_version": self.last_version}
+
+    def release(self, name, version=None):
+        self.released.append((name, version))
+
+
+def _run_ticks(scheduler, ticks):
+    async def scenario():
+        for _ in range(ticks):
+            await asyncio.gather(*await scheduler.tick())
+        await scheduler.stop()
+
+    asyncio.run(scenario())
+
+
+def test_graph_change_jobs_run_once_per_version(monkeypatch):
+    version = _Version(1)
+    monkeypatch.setattr(scheduler_module, "graph_version", version)
+    calls = []
+    lease = _Lease()
+    scheduler = Scheduler(lease=lease)
+    scheduler.register(Job("test_on_change", lambda: calls.append(1), on_graph_change=True))
+
+    _run_ticks(scheduler, 2)
+    assert len(calls) == 1
+    assert lease.released == [("test_on_change", 1)]
+
+    version.value = 2
+    _run_ticks(scheduler, 1)
+    assert len(calls) == 2
+    status = scheduler.job("test_on_change").status()
+    assert status["last_status"] == "ok" and status["last_graph_version"] == 2
+    assert metrics.snapshot()["timings"]["scheduler.test_on_change"]["count"] == 2
+
+
+def test_version_already_processed_by_another_worker_is_not_rebuilt(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "graph_version", _Version(5))
+    calls = []
+    scheduler = Scheduler(lease=_Lease(last_version=5))
+    scheduler.register(Job("test_up_to_date", lambda: calls.append(1), on_graph_change=True))
+
+    _run_ticks(scheduler, 1)
+    assert calls == []
+    assert scheduler.job("test_up_to_date").last_status == "up_to_date"
+
+
+def test_locked_and_failing_jobs_are_reported(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "graph_version", _Version(None))
+    scheduler = Scheduler(lease=_Lease(held={"test_locked"}))
+    scheduler.register(Job("test_locked", lambda: None, interval=60))
+
+    def boom():
+        raise RuntimeError("boom")
+
+    scheduler.register(Job("test_failing", boom, interval=60))
+
+    _run_ticks(scheduler, 2)  # second tick: not due yet (interval)
+    assert scheduler.job("test_locked").last_status == "skipped_locked"
+    assert metrics.counter("scheduler.test_locked.skipped_locked") == 1
+    failing = scheduler.job("test_failing").status()
+    assert failing["last_status"] == "error" and "boom" in failing["last_error"]
+    assert metrics.counter("scheduler.test_failing.errors") == 1
+
+    scheduler.request_run("test_failing")
+    _run_ticks(scheduler, 1)
+    assert metrics.counter("scheduler.test_failing.errors") == 2
+
+
+def test_heavy_jobs_run_in_another_process(monkeypatch):
+    monkeypatch.setattr(scheduler_module, "graph_version", _Version(None))
+    scheduler = Scheduler(lease=_Lease())
+    scheduler.register(Job("test_heavy", os.getpid, interval=60, heavy=True))
+
+    _run_ticks(scheduler, 1)
+    job = scheduler.job("test_heavy")
+    assert job.last_status == "ok"
+    assert job.last_result != os.getpid()
+
+
+def test_concurrent_workers_never_share_a_lease():
+    workers = 8
+    leases = [Neo4jLease() for _ in range(workers)]
+    names = [f"test_lease_{uuid.uuid4().hex[:8]}_{i}" for i in range(10)]
+
+    try:
+        for name in names:
+            barrier = threading.Barrier(workers)
+
+            def acquire(lease, name=name, barrier=barrier):
+                barrier.wait()
+                return lease.acquire(name, 60)
+
+            with ThreadPoolExecutor(workers) as pool:
+                granted = [state for state in pool.map(acquire, leases) if state is not None]
+            assert len(granted) == 1, name
+    finally:
+        with get_driver().session() as session:
+            session.run("MATCH (l:JobLock) WHERE l.name IN $names DELETE l", names=names).consume()
@@ -38,4 +38,17 @@ def test_search_returns_results():
     # Vérifie le contrat minimum du dataset Wikidata
     first = data["results"][0]
     assert "wikidata_id" in first and first["wikidata_id"]
-    assert "title" in first and first["title"]
\ No newline at end of file
+    assert "title" in first and first["title"]
+
+
+def test_search_next_cursor_returns_next_page():
+    q = _get_any_title_fragment()
+    first = client.get("/api/search", params={"q": q, "limit": 1}).json()
+    assert "next_cursor" in first
+
+    if first["next_cursor"]:
+        second = client.get(
+            "/api/search",
+            params={"q": q, "limit": 1, "cursor": first["next_cursor"]},
+        ).json()
+        assert second["results"][0]["wikidata_id"] != first["results"][0]["wikidata_id"]
@@ -0,0 +1,29 @@
+# tests/test_serialization.py
+
+import json
+
+from app.models.schemas import GenreGraphResponse
+from app.serialization import FastJSONResponse, render
+
+PAYLOAD = {
+    "topic": {"name": "drama film"},
+    "related_topics": [{"genre": {"name": "comedy film"}, "score": 3.0}],
+    "films": [{"wikidata_id": "Q1", "title": "Film", "year": None}],
+    "directors": [{"wikidata_id": "Q2", "name": "Director"}],
+    "next_cursor": None,
+    "estimated": False,
+    "sampled_films": None,
+}
+
+
+def test_fast_and_validated_paths_render_the_same_json(monkeypatch):
+    monkeypatch.setenv("FAST_JSON_ROUTES", "*")
+    fast = render(PAYLOAD, GenreGraphResponse, "topics")
+    assert isinstance(fast, FastJSONResponse)
+
+    monkeypatch.setenv("FAST_JSON_ROUTES", "search")
+    validated = render(PAYLOAD, GenreGraphResponse, "topics")
+    assert not isinstance(validated, FastJSONResponse)
+
+    assert json.loads(fast.body) == json.loads(validated.body)
+    assert fast.headers["content-type"] == "application/json"
@@ -0,0 +1,97 @@
+# tests/test_singleflight.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.metrics import metrics
+from app.singleflight import SingleFlight, flight_key
+
+
+def test_flight_key_is_normalized():
+    assert flight_key("/r", b=1, a=2) == flight_key("/r", a=2, b=1)
+
+
+def test_concurrent_sync_calls_share_one_execution():
+    flight = SingleFlight("test_sync")
+    executions = []
+    gate = threading.Event()
+
+    def expensive():
+        executions.append(1)
+        gate.wait(2)
+        return {"value": 42}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flight.do, ("k",), expensive) for _ in range(8)]
+        time.sleep(0.2)
+        gate.set()
+        results = [f.result() for f in futures]
+
+    assert len(executions) == 1
+    assert all(r == {"value": 42} for r in results)
+    assert metrics.counter("singleflight.test_sync.coalesced") == 7
+
+    # Nothing is cached once the call is done.
+    flight.do(("k",), lambda: executions.append(1))
+    assert len(executions) == 2
+
+
+def test_sync_errors_propagate_to_every_waiter():
+    flight = SingleFlight("test_sync_error")
+    gate = threading.Event()
+
+    def failing():
+        gate.wait(2)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, ("k",), failing) for _ in range(4)]
+        time.sleep(0.2)
+        gate.set()
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result()
+
+
+def test_concurrent_async_calls_share_one_execution():
+    flight = SingleFlight("test_async")
+    executions = []
+
+    async def expensive():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(*(flight.do_async(("k",), expensive) for _ in range(10)))
+
+    assert asyncio.run(run()) == ["result"] * 10
+    assert len(executions) == 1
+    assert metrics.counter("singleflight.test_async.coalesced") == 9
+
+
+def test_cancelled_async_leader_does_not_cancel_followers():
+    flight = SingleFlight("test_async_cancel")
+    executions = []
+
+    async def expensive():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do_async(("k",), expensive))
+        await asyncio.sleep(0)  # the leader starts the execution
+        follower = asyncio.ensure_future(flight.do_async(("k",), expensive))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == "result"
+    assert len(executions) == 1
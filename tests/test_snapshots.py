@@ -0,0 +1,71 @@
+# tests/test_snapshots.py
+
+from array import array
+
+from app.metrics import metrics
+from app.snapshots import (
+    Snapshottable,
+    open_snapshot,
+    pickled,
+    register,
+    restore_all,
+    save_all,
+    snapshot_path,
+    write_snapshot,
+)
+
+
+def test_round_trip_with_raw_and_pickled_sections(tmp_path):
+    ids = array("I", range(1000))
+    write_snapshot(
+        "test_round_trip",
+        4,
+        {"ids": ids.tobytes(), "table": pickled({("Q1", 10): [1, 2, 3]})},
+        tmp_path,
+    )
+
+    with open_snapshot("test_round_trip", 4, tmp_path) as snapshot:
+        assert snapshot.sections == ["ids", "table"]
+        with snapshot.section("ids") as view, view.cast("I") as mapped:
+            assert mapped[999] == 999 and len(mapped) == 1000
+        assert snapshot.load("table") == {("Q1", 10): [1, 2, 3]}
+
+
+def test_stale_missing_and_corrupt_snapshots_are_ignored(tmp_path):
+    write_snapshot("test_stale", 1, {"a": b"x"}, tmp_path)
+    assert open_snapshot("test_stale", 2, tmp_path) is None
+    assert metrics.counter("snapshots.test_stale.stale") == 1
+
+    assert open_snapshot("test_missing", 1, tmp_path) is None
+    assert metrics.counter("snapshots.test_missing.missing") == 1
+
+    snapshot_path("test_corrupt", tmp_path).write_bytes(b"not a snapshot")
+    assert open_snapshot("test_corrupt", 1, tmp_path) is None
+    assert metrics.counter("snapshots.test_corrupt.errors") == 1
+
+
+def test_registered_structures_are_saved_and_restored(tmp_path):
+    state = {"built_for": 7, "data": [1, 2, 3]}
+    restored = {}
+    calls = []
+
+    def restore(snapshot):
+        calls.append(snapshot.graph_version)
+        restored.update(snapshot.load("state"))
+
+    register(
+        Snapshottable(
+            "test_registered",
+            dump=lambda version: {"state": pickled(state)},
+            restore=restore,
+        )
+    )
+
+    assert "test_registered" in save_all(7, tmp_path)
+    assert "test_registered" not in restore_all(8, tmp_path)
+    assert "test_registered" in restore_all(7, tmp_path)
+    assert restored == state
+
+    # Already restored for this version (e.g. in the gunicorn master): not reloaded.
+    assert "test_registered" in restore_all(7, tmp_path)
+    assert calls == [7]
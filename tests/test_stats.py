@@ -0,0 +1,30 @@
+# tests/test_stats.py
+
+from starlette.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_stats_totals_and_distributions_agree():
+    response = client.get("/api/stats")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["nodes"]["total"] >= data["nodes"]["Article"] + data["nodes"]["Author"]
+    assert data["relationships"]["total"] >= data["relationships"]["DIRECTED"]
+
+    # Histograms cover every node of the label and every relationship of the type.
+    per_director = data["distributions"]["films_per_director"]
+    assert sum(b["count"] for b in per_director) == data["nodes"]["Author"]
+    assert sum(b["degree"] * b["count"] for b in per_director) == data["relationships"]["DIRECTED"]
+
+    films = [g["films"] for g in data["top_genres"]]
+    assert films == sorted(films, reverse=True)
+
+
+def test_stats_distributions_are_reused_between_calls():
+    first = client.get("/api/stats").json()
+    second = client.get("/api/stats").json()
+    assert first["distributions"] == second["distributions"]
+    assert first["top_directors"] == second["top_directors"]
@@ -3,7 +3,9 @@
 import os
 from neo4j import GraphDatabase
 from starlette.testclient import TestClient
+from app.jobs.timelines import rebuild_timelines
 from app.main import app
+from app.routers.topics import _topic_graph_payload
 
 client = TestClient(app)
 
@@ -38,3 +40,77 @@ def test_topics_graph_returns_data():
         f0 = data["films"][0]
         assert "wikidata_id" in f0 and f0["wikidata_id"]
         assert "title" in f0 and f0["title"]
+
+
+def test_topics_graph_hub_plan_pages_like_exact_plan(monkeypatch):
+    uri = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
+    user = os.getenv("NEO4J_USER", "neo4j")
+    password = os.getenv("NEO4J_PASSWORD", "password")
+
+    driver = GraphDatabase.driver(uri, auth=(user, password))
+    with driver.session() as session:
+        rec = session.run(
+            "MATCH (t:Topic) WHERE t.film_count > 2 RETURN t.name AS name LIMIT 1"
+        ).single()
+        assert rec is not None
+        exact = _topic_graph_payload(session, rec["name"], 1, 2, None)
+
+        # Every genre above 1 film becomes a hub, sampled on a single film.
+        monkeypatch.setenv("TOPIC_HUB_THRESHOLD", "0")
+        monkeypatch.setenv("TOPIC_HUB_SAMPLE", "1")
+        hub = _topic_graph_payload(session, rec["name"], 1, 2, None)
+        hub_next = _topic_graph_payload(session, rec["name"], 1, 2, hub["next_cursor"])
+        exact_next = _topic_graph_payload(session, rec["name"], 1, 2, exact["next_cursor"])
+    driver.close()
+
+    assert not exact["estimated"] and hub["estimated"] and hub["sampled_films"] == 1
+    assert hub["films"] == exact["films"] and hub["next_cursor"] == exact["next_cursor"]
+    assert hub_next["films"] == exact_next["films"]
+    assert all(item["score"] >= 1 for item in hub["related_topics"])
+
+
+def test_topic_clusters_contract():
+    response = client.get("/api/topics/clusters", params={"min_size": 1, "limit": 5})
+    assert response.status_code == 200
+
+    clusters = response.json()["clusters"]
+    assert len(clusters) <= 5
+    for cluster in clusters:
+        assert cluster["size"] >= len(cluster["genres"]) >= 1
+
+
+def test_topic_cluster_unknown_topic_404():
+    response = client.get("/api/topics/__does_not_exist__/cluster")
+    assert response.status_code == 404
+
+
+def test_topic_top_directors_contract():
+    topic = _get_any_genre_name()
+    response = client.get(f"/api/topics/{topic}/top-directors", params={"limit": 5})
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["topic"]["name"] == topic
+    ranks = [item["pagerank"] for item in data["directors"]]
+    assert ranks == sorted(ranks, reverse=True) and len(ranks) <= 5
+    assert all(item["genre_films"] >= 1 for item in data["directors"])
+
+
+def test_topic_timeline_counts_every_film():
+    rebuild_timelines()
+    topic = _get_any_genre_name()
+    response = client.get(f"/api/topics/{topic}/timeline")
+    assert response.status_code == 200
+
+    data = response.json()
+    decades = [item["decade"] for item in data["decades"]]
+    assert decades == sorted(decades) and all(d % 10 == 0 for d in decades)
+    total = sum(item["films"] for item in data["decades"]) + data["undated"]
+    graph = client.get(f"/api/topics/{topic}/graph", params={"limit": 100}).json()
+    if graph["next_cursor"] is None:
+        assert total == len(graph["films"])
+
+
+def test_topic_timeline_unknown_topic_404():
+    response = client.get("/api/topics/__does_not_exist__/timeline")
+    assert response.status_code == 404
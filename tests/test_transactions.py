@@ -0,0 +1,79 @@
+# tests/test_transactions.py
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from neo4j.exceptions import Neo4jError
+
+from app.database import transactions
+from app.database.transactions import QueryContext, run_read, tx_timeout
+from app.metrics import metrics
+
+
+class _FailingSession:
+    """Session whose managed read transaction fails with a Neo4j error code."""
+
+    def __init__(self, code: str):
+        self.code = code
+        self.work = None
+
+    def execute_read(self, work):
+        self.work = work
+        raise Neo4jError._hydrate_neo4j(code=self.code, message="failed")
+
+
+def test_tx_timeout_per_route_env_overrides_default(monkeypatch):
+    monkeypatch.delenv("NEO4J_TX_TIMEOUT", raising=False)
+    assert tx_timeout("related") == transactions.ROUTE_TIMEOUTS["related"]
+
+    monkeypatch.setenv("NEO4J_TX_TIMEOUT", "3")
+    monkeypatch.setenv("NEO4J_TX_TIMEOUT_TOPIC_GRAPH", "1.5")
+    assert tx_timeout("related") == 3.0
+    assert tx_timeout("topic_graph") == 1.5
+
+
+def test_run_read_sets_timeout_and_metadata_and_maps_timeouts_to_504():
+    session = _FailingSession("Neo.ClientError.Transaction.TransactionTimedOutClientConfiguration")
+    ctx = QueryContext("test_timeout", timeout=2.0)
+
+    with pytest.raises(HTTPException) as exc:
+        run_read(session, "RETURN 1", ctx)
+
+    assert exc.value.status_code == 504
+    assert session.work.timeout == 2.0
+    assert session.work.metadata == {"route": "test_timeout", "request_id": ctx.request_id}
+    assert metrics.counter("neo4j.tx.test_timeout.timeouts") == 1
+
+
+def test_terminated_query_of_a_disconnected_client_is_reported_as_cancelled():
+    session = _FailingSession("Neo.TransientError.Transaction.Terminated")
+    ctx = QueryContext("test_cancel")
+    ctx.disconnected = True
+    ctx.cancellable = lambda: False  # shared execution: the query still runs
+
+    with pytest.raises(HTTPException) as exc:
+        run_read(session, "RETURN 1", ctx)
+
+    assert exc.value.status_code == transactions.CLIENT_CLOSED_REQUEST
+    assert metrics.counter("neo4j.tx.test_cancel.cancelled") == 1
+    assert metrics.counter("neo4j.tx.test_cancel.timeouts") == 0
+
+
+def test_disconnect_watcher_terminates_the_request_transactions(monkeypatch):
+    terminated = []
+    monkeypatch.setattr(transactions, "terminate_transactions", terminated.append)
+    monkeypatch.setattr(transactions, "DISCONNECT_POLL_SECONDS", 0)
+
+    class _Request:
+        polls = 0
+
+        async def is_disconnected(self):
+            self.polls += 1
+            return self.polls > 2
+
+    ctx = QueryContext("test_disconnect")
+    asyncio.run(transactions._watch_disconnect(_Request(), ctx))
+
+    assert ctx.disconnected
+    assert terminated == [ctx.request_id]
@@ -0,0 +1,66 @@
+# tests/test_verify_counters.py
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+# pylint: disable-next=wrong-import-position
+from seed_data import backfill_degree_counters  # noqa: E402
+# pylint: disable-next=wrong-import-position
+from verify_counters import check_counters, get_driver  # noqa: E402
+
+
+def test_imported_counters_match_degrees():
+    driver = get_driver()
+    with driver.session() as session:
+        reports = check_counters(session)
+    driver.close()
+
+    assert {report["counter"] for report in reports} == {
+        "Article.director_count",
+        "Article.genre_count",
+        "Author.film_count",
+        "Topic.film_count",
+    }
+    assert all(report["drifted"] == 0 for report in reports), reports
+
+
+def test_backfill_sets_counters_missing_on_an_older_graph():
+    driver = get_driver()
+    with driver.session() as session:
+        # Shape of a graph imported before the counters existed.
+        session.run(
+            """
+            MERGE (a:Author {wikidata_id: "TEST_BACKFILL_AUTHOR"})
+            MERGE (t:Topic {name: "test backfill genre"})
+            WITH a, t
+            UNWIND ["TEST_BACKFILL_F1", "TEST_BACKFILL_F2"] AS id
+            MERGE (f:Article {wikidata_id: id})
+            MERGE (a)-[:DIRECTED]->(f)
+            MERGE (f)-[:HAS_TOPIC]->(t)
+            REMOVE a.film_count, t.film_count, f.director_count, f.genre_count
+            """
+        ).consume()
+        try:
+            backfill_degree_counters(session)
+            record = session.run(
+                """
+                MATCH (a:Author {wikidata_id: "TEST_BACKFILL_AUTHOR"}),
+                      (t:Topic {name: "test backfill genre"}),
+                      (f:Article {wikidata_id: "TEST_BACKFILL_F1"})
+                RETURN a.film_count AS author, t.film_count AS topic,
+                       f.director_count AS directors, f.genre_count AS genres
+                """
+            ).single()
+        finally:
+            session.run(
+                """
+                MATCH (n)
+                WHERE n.wikidata_id STARTS WITH "TEST_BACKFILL_" OR n.name = "test backfill genre"
+                DETACH DELETE n
+                """
+            ).consume()
+    driver.close()
+
+    assert record.data() == {"author": 2, "topic": 2, "directors": 1, "genres": 1}